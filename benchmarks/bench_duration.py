@@ -0,0 +1,78 @@
+"""
+Microbenchmark do parser de durações
+
+Compara o antigo ReminderModal.parse_time (um re.search por unidade, com
+padrões montados a cada chamada) com BotUtils.parse_duration, com e sem
+o cache LRU.
+
+Uso: python benchmarks/bench_duration.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import BotUtils, _parse_duration  # noqa: E402
+
+SAMPLES = ["1h", "30m", "2d", "1h30m", "1d2h30m", "45s", "7d", "2h15m10s"]
+NUMBER = 20000
+
+
+def legacy_parse_time(time_str):
+    """Implementação anterior, mantida aqui só para comparação"""
+    import re
+
+    patterns = {
+        'd': 86400,
+        'h': 3600,
+        'm': 60,
+        's': 1
+    }
+
+    total_seconds = 0
+    time_str = time_str.lower().strip()
+
+    for unit, multiplier in patterns.items():
+        match = re.search(rf'(\d+){unit}', time_str)
+        if match:
+            total_seconds += int(match.group(1)) * multiplier
+
+    return total_seconds if total_seconds > 0 else None
+
+
+def run_legacy():
+    for sample in SAMPLES:
+        legacy_parse_time(sample)
+
+
+def run_uncached():
+    _parse_duration.cache_clear()
+    for sample in SAMPLES:
+        BotUtils.parse_duration(sample)
+
+
+def run_cached():
+    for sample in SAMPLES:
+        BotUtils.parse_duration(sample)
+
+
+def main():
+    for sample in SAMPLES:
+        assert legacy_parse_time(sample) == BotUtils.parse_duration(sample), sample
+
+    results = {
+        "legacy parse_time": timeit.timeit(run_legacy, number=NUMBER),
+        "parse_duration (sem cache)": timeit.timeit(run_uncached, number=NUMBER),
+        "parse_duration (cache LRU)": timeit.timeit(run_cached, number=NUMBER)
+    }
+
+    calls = NUMBER * len(SAMPLES)
+    baseline = results["legacy parse_time"]
+    for name, elapsed in results.items():
+        print(f"{name:<28} {elapsed / calls * 1e6:8.3f} µs/chamada  ({baseline / elapsed:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark dos templates de embed
+
+Compara, para o embed do /help, montar do zero a cada chamada,
+Embed.copy() e EmbedTemplate.render(): tempo e memória alocada por
+resposta (medida com tracemalloc).
+
+Uso: python benchmarks/bench_embeds.py
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import disnake  # noqa: E402
+
+from cogs.info_cog import InfoCog  # noqa: E402
+
+NUMBER = 5000
+
+
+def allocated_per_call(func, number=NUMBER):
+    """Bytes alocados em média por chamada (pico durante o lote)"""
+    func()
+    tracemalloc.start()
+    keep = [func() for _ in range(number)]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return peak / number
+
+
+def build_from_scratch():
+    """O que o /help fazia antes: montar todos os campos a cada chamada"""
+    embed = InfoCog.build_help_template().embed
+    embed.timestamp = disnake.utils.utcnow()
+    return embed
+
+
+def main():
+    template = InfoCog.build_help_template()
+    prebuilt = template.render()
+
+    cases = {
+        "montar do zero": build_from_scratch,
+        "Embed.copy()": prebuilt.copy,
+        "EmbedTemplate.render()": template.render
+    }
+
+    for name, func in cases.items():
+        assert func().to_dict()["fields"] == prebuilt.to_dict()["fields"], name
+
+    baseline_time = timeit.timeit(cases["montar do zero"], number=NUMBER)
+    baseline_bytes = allocated_per_call(cases["montar do zero"])
+
+    for name, func in cases.items():
+        elapsed = timeit.timeit(func, number=NUMBER)
+        allocated = allocated_per_call(func)
+        print(
+            f"{name:<24} {elapsed / NUMBER * 1e6:8.2f} µs/resposta ({baseline_time / elapsed:4.1f}x)  "
+            f"{allocated:8.0f} B/resposta ({allocated / baseline_bytes:5.1%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,24 +3,105 @@ Cog de informações do bot e servidor
 """
 
 import disnake
-import platform
-import psutil
 from datetime import datetime
 from disnake.ext import commands
 from utils import EmbedUtils, BotUtils
 from config import BotConfig
+from services.guild_stats import GuildStatsIndex
 
 class InfoCog(commands.Cog):
     """Comandos de informações do bot e servidor"""
     
     def __init__(self, bot):
         self.bot = bot
+        
+        # Embeds estáticos montados uma única vez
+        self.help_template = self.build_help_template()
+        
+        # Contadores de membros por servidor, mantidos pelos eventos abaixo
+        self.guild_stats = GuildStatsIndex()
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self.guild_stats.member_join(member)
+    
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.guild_stats.member_remove(member)
+    
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        self.guild_stats.member_update(before, after)
+    
+    @commands.Cog.listener()
+    async def on_presence_update(self, before, after):
+        self.guild_stats.member_update(before, after)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.guild_stats.forget(guild)
+    
+    @commands.Cog.listener()
+    async def on_member_cache_evict(self, guild):
+        # Sem a lista de membros o índice não acompanha mais os eventos
+        self.guild_stats.forget(guild)
+    
+    @staticmethod
+    def build_help_template():
+        """Monta o embed do /help"""
+        
+        # Comandos de informação
+        info_commands = [
+            "`/ping` - Verifica latência e status",
+            "`/uptime` - Tempo de atividade do bot",
+            "`/status` - Informações do sistema",
+            "`/info` - Informações do bot",
+            "`/serverinfo` - Informações do servidor",
+            "`/userinfo` - Informações de usuário",
+            "`/avatar` - Avatar de usuário"
+        ]
+        
+        # Comandos de moderação
+        mod_commands = [
+            "`/kick` - Expulsar usuário",
+            "`/ban` - Banir usuário",
+            "`/unban` - Desbanir usuário",
+            "`/timeout` - Colocar usuário em timeout",
+            "`/clear` - Limpar mensagens",
+            "`/warn` - Avisar usuário",
+            "`/warnings` - Histórico de avisos",
+            "`/slowmode` - Controlar modo lento",
+            "`/mass ban|kick|timeout` - Ações em massa"
+        ]
+        
+        # Comandos utilitários
+        utility_commands = [
+            "`/say` - Falar através do bot",
+            "`/embed` - Criar embed personalizado",
+            "`/poll` - Criar enquete",
+            "`/remind` - Criar lembrete",
+            "`/coinflip` - Cara ou coroa",
+            "`/dice` - Rolar dados",
+            "`/8ball` - Bola 8 mágica"
+        ]
+        
+        return EmbedUtils.create_template(
+            title="📚 Central de Ajuda",
+            description="Lista de todos os comandos disponíveis",
+            fields=[
+                ("📊 Informações", "\n".join(info_commands), False),
+                ("🔨 Moderação", "\n".join(mod_commands), False),
+                ("🛠️ Utilitários", "\n".join(utility_commands), False),
+                ("❓ Precisa de ajuda?", "Entre em contato com a equipe de suporte do servidor!", False)
+            ],
+            footer="Use /help <comando> para mais informações sobre um comando específico"
+        )
     
     @commands.slash_command(
         name="info",
         description="Mostra informações detalhadas do bot"
     )
-    async def bot_info(self, inter):
+    async def info_command(self, inter):
         """Comando para mostrar informações do bot"""
         
         embed = EmbedUtils.create_embed(
@@ -50,13 +131,13 @@ class InfoCog(commands.Cog):
         # Estatísticas
         embed.add_field(
             name="🌐 Servidores",
-            value=len(self.bot.guilds),
+            value=self.bot.cluster_stats.total("guilds"),
             inline=True
         )
         
         embed.add_field(
             name="👥 Usuários",
-            value=len(self.bot.users),
+            value=self.bot.cluster_stats.total("members"),
             inline=True
         )
         
@@ -81,15 +162,16 @@ class InfoCog(commands.Cog):
         
         embed.add_field(
             name="💾 RAM",
-            value=f"{psutil.virtual_memory().percent}%",
+            value=f"{self.bot.system_monitor.snapshot.memory_percent}%",
             inline=True
         )
         
         # Tecnologias
+        platform_info = self.bot.system_monitor.platform_info
         tech_info = (
-            f"**Python:** {platform.python_version()}\n"
-            f"**Disnake:** {disnake.__version__}\n"
-            f"**Sistema:** {platform.system()} {platform.release()}"
+            f"**Python:** {platform_info['Python']}\n"
+            f"**Disnake:** {platform_info['Disnake']}\n"
+            f"**Sistema:** {platform_info['OS']} {platform_info['Version']}"
         )
         
         embed.add_field(
@@ -118,6 +200,8 @@ class InfoCog(commands.Cog):
         """Comando para mostrar informações do servidor"""
         
         guild = inter.guild
+        # O índice de estatísticas é montado a partir da lista completa de membros
+        await self.bot.member_cache.ensure_members(guild)
         
         embed = EmbedUtils.create_embed(
             title="🏠 Informações do Servidor",
@@ -161,14 +245,25 @@ class InfoCog(commands.Cog):
             inline=True
         )
         
-        # Estatísticas
+        # Estatísticas (contadores incrementais, O(1) por consulta)
+        stats = self.guild_stats.get(guild)
         total_members = guild.member_count
-        online_members = len([m for m in guild.members if m.status != disnake.Status.offline])
-        bot_count = len([m for m in guild.members if m.bot])
+        
+        members_text = (
+            f"**Total:** {total_members}\n"
+            f"**Humanos:** {total_members - stats.bots}\n"
+            f"**Bots:** {stats.bots}\n"
+            f"**Online:** {stats.online}\n"
+            f"🟢 {stats.status_count(disnake.Status.online)} "
+            f"🟡 {stats.status_count(disnake.Status.idle)} "
+            f"🔴 {stats.status_count(disnake.Status.dnd)}"
+        )
+        if stats.pending:
+            members_text += f"\n**Em triagem:** {stats.pending}"
         
         embed.add_field(
             name="👥 Membros",
-            value=f"**Total:** {total_members}\n**Online:** {online_members}\n**Bots:** {bot_count}",
+            value=members_text,
             inline=True
         )
         
@@ -357,69 +452,7 @@ class InfoCog(commands.Cog):
     async def help_command(self, inter):
         """Comando de ajuda personalizado"""
         
-        embed = EmbedUtils.create_embed(
-            title="📚 Central de Ajuda",
-            description="Lista de todos os comandos disponíveis"
-        )
-        
-        # Comandos de informação
-        info_commands = [
-            "`/ping` - Verifica latência e status",
-            "`/uptime` - Tempo de atividade do bot",
-            "`/status` - Informações do sistema",
-            "`/info` - Informações do bot",
-            "`/serverinfo` - Informações do servidor",
-            "`/userinfo` - Informações de usuário",
-            "`/avatar` - Avatar de usuário"
-        ]
-        
-        embed.add_field(
-            name="📊 Informações",
-            value="\n".join(info_commands),
-            inline=False
-        )
-        
-        # Comandos de moderação
-        mod_commands = [
-            "`/kick` - Expulsar usuário",
-            "`/ban` - Banir usuário",
-            "`/unban` - Desbanir usuário",
-            "`/timeout` - Colocar usuário em timeout",
-            "`/clear` - Limpar mensagens",
-            "`/warn` - Avisar usuário",
-            "`/slowmode` - Controlar modo lento"
-        ]
-        
-        embed.add_field(
-            name="🔨 Moderação",
-            value="\n".join(mod_commands),
-            inline=False
-        )
-        
-        # Comandos utilitários
-        utility_commands = [
-            "`/say` - Falar através do bot",
-            "`/embed` - Criar embed personalizado",
-            "`/poll` - Criar enquete",
-            "`/remind` - Criar lembrete",
-            "`/coinflip` - Cara ou coroa",
-            "`/dice` - Rolar dados",
-            "`/8ball` - Bola 8 mágica"
-        ]
-        
-        embed.add_field(
-            name="🛠️ Utilitários",
-            value="\n".join(utility_commands),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="❓ Precisa de ajuda?",
-            value="Entre em contato com a equipe de suporte do servidor!",
-            inline=False
-        )
-        
-        embed.set_footer(text="Use /help <comando> para mais informações sobre um comando específico")
+        embed = self.help_template.render()
         
         await inter.response.send_message(embed=embed, ephemeral=True)
 
@@ -4,16 +4,41 @@ Cog de comandos de moderação
 
 import disnake
 import asyncio
+import re
 from datetime import datetime, timedelta
+from typing import Optional
 from disnake.ext import commands
 from utils import EmbedUtils, BotUtils
 from config import BotConfig
+from services.ban_index import BanIndex
+from services.batch_actions import BatchProgress, BatchRunner, filter_protected, parse_user_ids, resolve_members
+from services.purge import PurgeEngine, PurgeFilter, PurgeProgress
+from services.warning_ledger import WarningPage, parse_warnings_custom_id, warnings_custom_id
 
 class ModerationCog(commands.Cog):
     """Comandos de moderação do servidor"""
     
+    # Usados fora de listeners: /clear filtra pelo conteúdo das mensagens
+    # e os comandos em massa percorrem a lista de membros
+    required_intents = ("message_content", "members")
+    
     def __init__(self, bot):
         self.bot = bot
+        self.ban_index = BanIndex()
+        self.batch_runner = BatchRunner()
+        self.purge_engine = PurgeEngine()
+    
+    @commands.Cog.listener()
+    async def on_member_ban(self, guild, user):
+        self.ban_index.add(guild.id, user.id, user.display_name)
+    
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild, user):
+        self.ban_index.discard(guild.id, user.id)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.ban_index.forget(guild.id)
     
     @commands.slash_command(
         name="kick",
@@ -53,21 +78,20 @@ class ModerationCog(commands.Cog):
             await inter.response.send_message(embed=embed, ephemeral=True)
             return
         
-        # Tentar enviar DM antes de expulsar
-        try:
-            dm_embed = EmbedUtils.warning_embed(
-                title="Você foi expulso!",
-                description=f"Você foi expulso do servidor **{inter.guild.name}**"
-            )
-            dm_embed.add_field(name="Motivo", value=reason, inline=False)
-            dm_embed.add_field(name="Moderador", value=inter.author.mention, inline=False)
-            await user.send(embed=dm_embed)
-        except:
-            pass
+        # Depois da ação o bot pode não ter mais servidor em comum com o
+        # usuário: a DM vai antes, com espera limitada para não travar a ação
+        dm_embed = EmbedUtils.warning_embed(
+            title="Você foi expulso!",
+            description=f"Você foi expulso do servidor **{inter.guild.name}**"
+        )
+        dm_embed.add_field(name="Motivo", value=reason, inline=False)
+        dm_embed.add_field(name="Moderador", value=inter.author.mention, inline=False)
+        await self._notify_before_removal(user, dm_embed)
         
         # Expulsar usuário
         try:
             await user.kick(reason=f"Expulso por {inter.author} - {reason}")
+            self.bot.mod_log.record(inter.guild.id, "kick", inter.author.id, user.id, reason)
             
             embed = EmbedUtils.success_embed(
                 title="Usuário expulso",
@@ -124,21 +148,23 @@ class ModerationCog(commands.Cog):
             await inter.response.send_message(embed=embed, ephemeral=True)
             return
         
-        # Tentar enviar DM antes de banir
-        try:
-            dm_embed = EmbedUtils.error_embed(
-                title="Você foi banido!",
-                description=f"Você foi banido do servidor **{inter.guild.name}**"
-            )
-            dm_embed.add_field(name="Motivo", value=reason, inline=False)
-            dm_embed.add_field(name="Moderador", value=inter.author.mention, inline=False)
-            await user.send(embed=dm_embed)
-        except:
-            pass
+        # Depois da ação o bot pode não ter mais servidor em comum com o
+        # usuário: a DM vai antes, com espera limitada para não travar a ação
+        dm_embed = EmbedUtils.error_embed(
+            title="Você foi banido!",
+            description=f"Você foi banido do servidor **{inter.guild.name}**"
+        )
+        dm_embed.add_field(name="Motivo", value=reason, inline=False)
+        dm_embed.add_field(name="Moderador", value=inter.author.mention, inline=False)
+        await self._notify_before_removal(user, dm_embed)
         
         # Banir usuário
         try:
             await user.ban(reason=f"Banido por {inter.author} - {reason}", delete_message_days=delete_days)
+            self.bot.mod_log.record(
+                inter.guild.id, "ban", inter.author.id, user.id, reason,
+                details=f"Mensagens deletadas: {delete_days} dias" if delete_days else ""
+            )
             
             embed = EmbedUtils.success_embed(
                 title="Usuário banido",
@@ -181,16 +207,10 @@ class ModerationCog(commands.Cog):
             await inter.response.send_message(embed=embed, ephemeral=True)
             return
         
-        # Verificar se o usuário está banido
-        banned_users = [ban_entry async for ban_entry in inter.guild.bans()]
-        banned_user = None
-        
-        for ban_entry in banned_users:
-            if ban_entry.user.id == user_id:
-                banned_user = ban_entry.user
-                break
+        # Verificar se o usuário está banido (índice O(1) ou busca só desta entrada)
+        banned_name = await self.ban_index.lookup(inter.guild, user_id)
         
-        if not banned_user:
+        if not banned_name:
             embed = EmbedUtils.error_embed(
                 title="Erro",
                 description="Usuário não encontrado na lista de banidos!"
@@ -200,17 +220,27 @@ class ModerationCog(commands.Cog):
         
         # Desbanir usuário
         try:
-            await inter.guild.unban(banned_user, reason=f"Desbanido por {inter.author} - {reason}")
+            await inter.guild.unban(disnake.Object(user_id), reason=f"Desbanido por {inter.author} - {reason}")
+            self.ban_index.discard(inter.guild.id, user_id)
+            self.bot.mod_log.record(inter.guild.id, "unban", inter.author.id, user_id, reason)
             
             embed = EmbedUtils.success_embed(
                 title="Usuário desbanido",
-                description=f"**{banned_user.display_name}** foi desbanido do servidor"
+                description=f"**{banned_name}** foi desbanido do servidor"
             )
             embed.add_field(name="Motivo", value=reason, inline=False)
             embed.add_field(name="Moderador", value=inter.author.mention, inline=False)
             
             await inter.response.send_message(embed=embed)
             
+        except disnake.NotFound:
+            self.ban_index.discard(inter.guild.id, user_id)
+            embed = EmbedUtils.error_embed(
+                title="Erro",
+                description="Usuário não encontrado na lista de banidos!"
+            )
+            await inter.response.send_message(embed=embed, ephemeral=True)
+            
         except disnake.Forbidden:
             embed = EmbedUtils.error_embed(
                 title="Erro",
@@ -218,6 +248,21 @@ class ModerationCog(commands.Cog):
             )
             await inter.response.send_message(embed=embed, ephemeral=True)
     
+    async def _notify_before_removal(self, user: disnake.Member, embed: disnake.Embed):
+        """Envia a DM de kick/ban e espera até DM_PRE_ACTION_TIMEOUT pela entrega"""
+        future = self.bot.dm_outbox.send(user.id, embed, removal=True)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), BotConfig.DM_PRE_ACTION_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+    
+    @staticmethod
+    async def _apply_timeout(member: disnake.Member, seconds: int, audit_reason: str) -> datetime:
+        """Aplica o timeout e retorna até quando ele vale"""
+        timeout_until = datetime.utcnow() + timedelta(seconds=seconds)
+        await member.timeout(until=timeout_until, reason=audit_reason)
+        return timeout_until
+    
     @commands.slash_command(
         name="timeout",
         description="Coloca um usuário em timeout"
@@ -227,11 +272,21 @@ class ModerationCog(commands.Cog):
         self,
         inter,
         user: disnake.Member = commands.Param(description="Usuário para colocar em timeout"),
-        duration: int = commands.Param(description="Duração em minutos (max 2880)", min_value=1, max_value=2880),
+        duration: str = commands.Param(description="Duração (ex: 30m, 1h30m, 2d; número puro = minutos; max 2d)"),
         reason: str = commands.Param(description="Motivo do timeout", default="Não especificado")
     ):
         """Comando para colocar usuários em timeout"""
         
+        seconds = BotUtils.parse_duration(duration, default_unit=60)
+        
+        if not seconds or seconds > 2880 * 60:
+            embed = EmbedUtils.error_embed(
+                title="Duração inválida",
+                description="Use formatos como: 30m, 1h30m, 2d ou PT1H (máximo de 2 dias)."
+            )
+            await inter.response.send_message(embed=embed, ephemeral=True)
+            return
+        
         # Verificações de segurança
         if user == inter.author:
             embed = EmbedUtils.error_embed(
@@ -249,18 +304,19 @@ class ModerationCog(commands.Cog):
             await inter.response.send_message(embed=embed, ephemeral=True)
             return
         
-        # Calcular tempo de timeout
-        timeout_until = datetime.utcnow() + timedelta(minutes=duration)
-        
         # Aplicar timeout
         try:
-            await user.timeout(until=timeout_until, reason=f"Timeout por {inter.author} - {reason}")
+            timeout_until = await self._apply_timeout(user, seconds, f"Timeout por {inter.author} - {reason}")
+            self.bot.mod_log.record(
+                inter.guild.id, "timeout", inter.author.id, user.id, reason,
+                details=f"Duração: {BotUtils.format_uptime(seconds)}"
+            )
             
             embed = EmbedUtils.warning_embed(
                 title="Usuário em timeout",
                 description=f"**{user.display_name}** foi colocado em timeout"
             )
-            embed.add_field(name="Duração", value=f"{duration} minutos", inline=False)
+            embed.add_field(name="Duração", value=BotUtils.format_uptime(seconds), inline=False)
             embed.add_field(name="Até", value=f"<t:{int(timeout_until.timestamp())}:F>", inline=False)
             embed.add_field(name="Motivo", value=reason, inline=False)
             embed.add_field(name="Moderador", value=inter.author.mention, inline=False)
@@ -298,6 +354,7 @@ class ModerationCog(commands.Cog):
         # Remover timeout
         try:
             await user.timeout(until=None, reason=f"Timeout removido por {inter.author} - {reason}")
+            self.bot.mod_log.record(inter.guild.id, "untimeout", inter.author.id, user.id, reason)
             
             embed = EmbedUtils.success_embed(
                 title="Timeout removido",
@@ -323,44 +380,96 @@ class ModerationCog(commands.Cog):
     async def clear(
         self,
         inter,
-        amount: int = commands.Param(description="Quantidade de mensagens para limpar (max 100)", min_value=1, max_value=100),
-        user: disnake.Member = commands.Param(description="Limpar apenas mensagens de um usuário específico", default=None)
+        amount: int = commands.Param(description=f"Quantidade de mensagens para limpar (max {BotConfig.PURGE_MAX_AMOUNT})", min_value=1, max_value=BotConfig.PURGE_MAX_AMOUNT),
+        user: disnake.User = commands.Param(description="Limpar apenas mensagens de um usuário específico", default=None),
+        pattern: str = commands.Param(description="Limpar apenas mensagens que casam com este regex", default=None),
+        attachments: bool = commands.Param(description="Limpar apenas mensagens com anexos", default=False),
+        bots: bool = commands.Param(description="Limpar apenas mensagens de bots", default=False),
+        within: str = commands.Param(description="Limpar apenas mensagens desta janela (ex: 30m, 2h, 1d)", default=None)
     ):
         """Comando para limpar mensagens"""
         
+        try:
+            compiled = PurgeFilter.compile_pattern(pattern) if pattern else None
+        except re.error as e:
+            embed = EmbedUtils.error_embed(title="Regex inválido", description=f"`{e}`")
+            await inter.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        after = None
+        if within:
+            seconds = BotUtils.parse_duration(within, default_unit=60)
+            if not seconds:
+                embed = EmbedUtils.error_embed(
+                    title="Janela inválida",
+                    description="Use formatos como: 30m, 2h, 1d."
+                )
+                await inter.response.send_message(embed=embed, ephemeral=True)
+                return
+            after = inter.created_at - timedelta(seconds=min(seconds, BotConfig.MAX_WINDOW_SECONDS))
+        
+        purge_filter = PurgeFilter(
+            user_id=user.id if user else None,
+            pattern=compiled,
+            attachments=attachments,
+            bots=bots,
+            after=after
+        )
+        
         await inter.response.defer()
         
-        def check(message):
-            if user:
-                return message.author == user
-            return True
+        async def on_progress(progress: PurgeProgress):
+            await inter.edit_original_message(embed=self._purge_embed(inter, progress, user))
         
         try:
-            deleted = await inter.channel.purge(limit=amount, check=check)
-            
-            embed = EmbedUtils.success_embed(
-                title="Mensagens limpas",
-                description=f"**{len(deleted)}** mensagens foram deletadas"
+            # before=created_at: a própria resposta do comando nunca entra na limpeza
+            progress = await self.purge_engine.run(
+                inter.channel,
+                amount,
+                purge_filter,
+                before=inter.created_at,
+                on_progress=on_progress
             )
-            
-            if user:
-                embed.add_field(name="Usuário", value=user.mention, inline=False)
-            
-            embed.add_field(name="Canal", value=inter.channel.mention, inline=False)
-            embed.add_field(name="Moderador", value=inter.author.mention, inline=False)
-            
-            # Enviar mensagem temporária
-            msg = await inter.followup.send(embed=embed)
-            
-            # Deletar após 5 segundos
-            await BotUtils.safe_delete_message(msg, 5)
-            
         except disnake.Forbidden:
             embed = EmbedUtils.error_embed(
                 title="Erro",
                 description="Não tenho permissão para deletar mensagens!"
             )
-            await inter.followup.send(embed=embed)
+            await inter.edit_original_message(embed=embed)
+            return
+        
+        self.bot.mod_log.record(
+            inter.guild.id, "clear", inter.author.id, user.id if user else None,
+            channel_id=inter.channel.id, details=f"{progress.deleted} mensagens deletadas"
+        )
+        
+        # Apagar a confirmação após 5 segundos sem prender o comando
+        await inter.delete_original_message(delay=5)
+    
+    @staticmethod
+    def _purge_embed(inter, progress: PurgeProgress, user: Optional[disnake.User]) -> disnake.Embed:
+        if progress.finished:
+            embed = EmbedUtils.success_embed(
+                title="Mensagens limpas",
+                description=f"**{progress.deleted}** mensagens foram deletadas"
+            )
+        else:
+            embed = EmbedUtils.warning_embed(
+                title="Limpando mensagens...",
+                description=f"**{progress.deleted}/{progress.limit}** mensagens deletadas"
+            )
+        
+        embed.add_field(name="Analisadas", value=str(progress.scanned), inline=True)
+        if progress.failed:
+            embed.add_field(name="Falhas", value=str(progress.failed), inline=True)
+        embed.add_field(name="Tempo", value=f"{progress.elapsed:.1f}s", inline=True)
+        
+        if user:
+            embed.add_field(name="Usuário", value=user.mention, inline=False)
+        
+        embed.add_field(name="Canal", value=inter.channel.mention, inline=False)
+        embed.add_field(name="Moderador", value=inter.author.mention, inline=False)
+        return embed
     
     @commands.slash_command(
         name="warn",
@@ -375,18 +484,26 @@ class ModerationCog(commands.Cog):
     ):
         """Comando para avisar usuários"""
         
-        # Tentar enviar DM
-        try:
-            dm_embed = EmbedUtils.warning_embed(
-                title="Você recebeu um aviso!",
-                description=f"Você recebeu um aviso no servidor **{inter.guild.name}**"
+        # Mesmas verificações do /timeout, já que o escalonamento aplica um
+        if user == inter.author:
+            embed = EmbedUtils.error_embed(
+                title="Erro",
+                description="Você não pode avisar a si mesmo!"
+            )
+            await inter.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        if user.top_role >= inter.author.top_role:
+            embed = EmbedUtils.error_embed(
+                title="Erro",
+                description="Você não pode avisar alguém com cargo igual ou superior ao seu!"
             )
-            dm_embed.add_field(name="Motivo", value=reason, inline=False)
-            dm_embed.add_field(name="Moderador", value=inter.author.mention, inline=False)
-            await user.send(embed=dm_embed)
-            dm_sent = True
-        except:
-            dm_sent = False
+            await inter.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Registrado em memória; a gravação em disco é feita em lote
+        result = await self.bot.warnings.add(inter.guild.id, user.id, inter.author.id, reason)
+        self.bot.mod_log.record(inter.guild.id, "warn", inter.author.id, user.id, reason)
         
         embed = EmbedUtils.warning_embed(
             title="Usuário avisado",
@@ -394,9 +511,102 @@ class ModerationCog(commands.Cog):
         )
         embed.add_field(name="Motivo", value=reason, inline=False)
         embed.add_field(name="Moderador", value=inter.author.mention, inline=False)
-        embed.add_field(name="DM enviada", value="Sim" if dm_sent else "Não", inline=False)
+        if self.bot.dm_outbox.dms_closed(user.id):
+            notice = "DMs fechadas, aviso mencionado no canal"
+        else:
+            notice = "Na fila de envio por DM"
+        embed.add_field(name="Notificação", value=notice, inline=False)
+        embed.add_field(name="Avisos recentes", value=str(result.count_in_window), inline=False)
+        
+        # Escalonamento automático, pelo mesmo caminho do /timeout
+        if result.rule is not None:
+            seconds = result.rule["timeout"]
+            audit_reason = f"{result.rule['count']} avisos em {BotUtils.format_uptime(result.rule['window'])} - {reason}"
+            try:
+                timeout_until = await self._apply_timeout(user, seconds, audit_reason)
+                self.bot.mod_log.record(
+                    inter.guild.id, "timeout", inter.author.id, user.id, audit_reason,
+                    details=f"Escalonamento automático, duração: {BotUtils.format_uptime(seconds)}"
+                )
+                escalation = f"Timeout de {BotUtils.format_uptime(seconds)} (até <t:{int(timeout_until.timestamp())}:t>)"
+            except disnake.HTTPException:
+                escalation = "Não foi possível aplicar o timeout automático"
+            embed.add_field(name="⚠️ Escalonamento", value=escalation, inline=False)
         
         await inter.response.send_message(embed=embed)
+        
+        # O membro é notificado depois da resposta; sem DM, por menção no canal
+        dm_embed = EmbedUtils.warning_embed(
+            title="Você recebeu um aviso!",
+            description=f"Você recebeu um aviso no servidor **{inter.guild.name}**"
+        )
+        dm_embed.add_field(name="Motivo", value=reason, inline=False)
+        dm_embed.add_field(name="Moderador", value=inter.author.mention, inline=False)
+        self.bot.dm_outbox.send(user.id, dm_embed, fallback_channel_id=inter.channel.id)
+    
+    @staticmethod
+    def _warnings_message(user: disnake.abc.User, page: WarningPage, guild: disnake.Guild):
+        """Embed e botão de próxima página de uma página de avisos"""
+        embed = EmbedUtils.create_embed(
+            title=f"📋 Avisos de {user.display_name}",
+            description=f"Total: **{page.total}**" if page.records else "Nenhum aviso registrado."
+        )
+        for record in page.records:
+            moderator = guild.get_member(record.moderator_id)
+            moderator_text = moderator.mention if moderator else f"<@{record.moderator_id}>"
+            embed.add_field(
+                name=f"#{record.id}",
+                value=f"{record.reason}\nPor {moderator_text} em <t:{int(record.created_at)}:f>",
+                inline=False
+            )
+        
+        components = []
+        if page.next_before is not None:
+            components.append(disnake.ui.Button(
+                label="Mais antigos",
+                emoji="➡️",
+                style=disnake.ButtonStyle.secondary,
+                custom_id=warnings_custom_id(user.id, page.next_before)
+            ))
+        return embed, components
+    
+    @commands.slash_command(
+        name="warnings",
+        description="Lista os avisos de um usuário"
+    )
+    @commands.has_permissions(moderate_members=True)
+    async def warnings(
+        self,
+        inter,
+        user: disnake.User = commands.Param(description="Usuário")
+    ):
+        """Lista os avisos do usuário, do mais recente para o mais antigo"""
+        
+        page = await self.bot.warnings.page(inter.guild.id, user.id)
+        embed, components = self._warnings_message(user, page, inter.guild)
+        await inter.response.send_message(embed=embed, components=components, ephemeral=True)
+    
+    @commands.Cog.listener("on_button_click")
+    async def on_warnings_page(self, inter: disnake.MessageInteraction):
+        """Carrega a próxima página de `warnings:<usuário>:<cursor>`"""
+        
+        parsed = parse_warnings_custom_id(inter.component.custom_id)
+        if parsed is None or inter.guild is None:
+            return
+        
+        if not inter.author.guild_permissions.moderate_members:
+            embed = EmbedUtils.error_embed(
+                title="Sem permissão",
+                description="Você precisa da permissão de moderar membros."
+            )
+            await inter.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        user_id, before = parsed
+        page = await self.bot.warnings.page(inter.guild.id, user_id, before=before)
+        user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+        embed, components = self._warnings_message(user, page, inter.guild)
+        await inter.response.edit_message(embed=embed, components=components)
     
     @commands.slash_command(
         name="slowmode",
@@ -406,12 +616,26 @@ class ModerationCog(commands.Cog):
     async def slowmode(
         self,
         inter,
-        seconds: int = commands.Param(description="Segundos de slowmode (0 para desativar)", min_value=0, max_value=21600)
+        duration: str = commands.Param(description="Duração (ex: 30s, 5m, 1h; número puro = segundos; 0 desativa; max 6h)")
     ):
         """Comando para definir slowmode"""
         
+        seconds = BotUtils.parse_duration(duration, default_unit=1)
+        
+        if seconds is None or seconds > 21600:
+            embed = EmbedUtils.error_embed(
+                title="Duração inválida",
+                description="Use formatos como: 30s, 5m, 1h ou 0 para desativar (máximo de 6 horas)."
+            )
+            await inter.response.send_message(embed=embed, ephemeral=True)
+            return
+        
         try:
             await inter.channel.edit(slowmode_delay=seconds)
+            self.bot.mod_log.record(
+                inter.guild.id, "slowmode", inter.author.id, channel_id=inter.channel.id,
+                details=f"Modo lento: {BotUtils.format_uptime(seconds)}" if seconds else "Modo lento desativado"
+            )
             
             if seconds == 0:
                 embed = EmbedUtils.success_embed(
@@ -421,7 +645,7 @@ class ModerationCog(commands.Cog):
             else:
                 embed = EmbedUtils.success_embed(
                     title="Slowmode ativado",
-                    description=f"Modo lento definido para **{seconds}** segundos"
+                    description=f"Modo lento definido para **{BotUtils.format_uptime(seconds)}**"
                 )
             
             embed.add_field(name="Canal", value=inter.channel.mention, inline=False)
@@ -435,6 +659,199 @@ class ModerationCog(commands.Cog):
                 description="Não tenho permissão para editar este canal!"
             )
             await inter.response.send_message(embed=embed, ephemeral=True)
+    
+    @commands.slash_command(
+        name="mass",
+        description="Ações de moderação em massa"
+    )
+    async def mass(self, inter):
+        """Grupo de comandos de moderação em massa"""
+        pass
+    
+    async def _collect_targets(
+        self,
+        inter,
+        ids: Optional[str],
+        role: Optional[disnake.Role],
+        joined_within: Optional[str],
+        members_only: bool
+    ):
+        """Monta a lista de alvos a partir dos IDs e dos filtros de membro
+        
+        Retorna (alvos, ignorados, erro). Cargo e janela de entrada se
+        combinam (membros com o cargo E que entraram na janela).
+        """
+        if not ids and role is None and not joined_within:
+            return [], 0, "Informe IDs, um cargo ou uma janela de entrada."
+        
+        joined_after = None
+        if joined_within:
+            seconds = BotUtils.parse_duration(joined_within, default_unit=60)
+            if not seconds:
+                return [], 0, "Janela de entrada inválida. Use formatos como: 10m, 1h, 2d."
+            joined_after = disnake.utils.utcnow() - timedelta(seconds=min(seconds, BotConfig.MAX_WINDOW_SECONDS))
+        
+        if role is not None or joined_after is not None:
+            # Filtros por membro dependem da lista completa do servidor
+            await self.bot.member_cache.ensure_members(inter.guild)
+        
+        targets = parse_user_ids(ids)
+        if len(targets) > BotConfig.MASS_ACTION_LIMIT:
+            return [], 0, f"Limite de {BotConfig.MASS_ACTION_LIMIT} alvos por comando excedido ({len(targets)})."
+        
+        # IDs fora do cache são buscados na API: sem isso um membro não
+        # cacheado passaria como "fora do servidor" e sem checagem de cargo
+        try:
+            members = await resolve_members(inter.guild, targets)
+        except (asyncio.TimeoutError, disnake.HTTPException):
+            return [], 0, "Não foi possível verificar os membros alvo. Tente novamente."
+        if members_only:
+            targets = [user_id for user_id in targets if user_id in members]
+        
+        if role is not None or joined_after is not None:
+            candidates = role.members if role is not None else inter.guild.members
+            for member in candidates:
+                if joined_after is None or (member.joined_at and member.joined_at >= joined_after):
+                    targets.append(member.id)
+                    members[member.id] = member
+        
+        targets, skipped = filter_protected(inter.guild, inter.author, targets, members)
+        if not targets:
+            return [], skipped, "Nenhum alvo válido encontrado."
+        if len(targets) > BotConfig.MASS_ACTION_LIMIT:
+            return [], skipped, f"Limite de {BotConfig.MASS_ACTION_LIMIT} alvos por comando excedido ({len(targets)})."
+        return targets, skipped, None
+    
+    @staticmethod
+    def _progress_embed(title: str, progress: BatchProgress, skipped: int) -> disnake.Embed:
+        if progress.finished:
+            embed = EmbedUtils.success_embed(
+                title=title,
+                description=f"Concluído: **{progress.done}/{progress.total}** alvos processados"
+            )
+        else:
+            embed = EmbedUtils.warning_embed(
+                title=title,
+                description=f"Em andamento: **{progress.done}/{progress.total}** alvos processados"
+            )
+        embed.add_field(name="✅ Sucesso", value=str(progress.succeeded), inline=True)
+        embed.add_field(name="❌ Falhas", value=str(progress.failed), inline=True)
+        embed.add_field(name="⏭️ Ignorados", value=str(skipped), inline=True)
+        embed.add_field(name="⏱️ Tempo", value=f"{progress.elapsed:.1f}s", inline=True)
+        if progress.errors:
+            errors = "\n".join(f"{name}: {count}" for name, count in progress.errors.items())
+            embed.add_field(name="Erros", value=errors, inline=False)
+        return embed
+    
+    async def _run_batch(self, inter, title: str, targets, skipped: int, action, route: str):
+        """Executa o lote atualizando um único embed de progresso (a interação já foi adiada)"""
+        async def on_progress(progress: BatchProgress):
+            await inter.edit_original_message(embed=self._progress_embed(title, progress, skipped))
+        
+        await self.batch_runner.run(targets, action, route=f"{route}:{inter.guild.id}", on_progress=on_progress)
+    
+    @mass.sub_command(
+        name="ban",
+        description="Bane vários usuários por ID, cargo ou data de entrada"
+    )
+    @commands.has_permissions(ban_members=True)
+    async def mass_ban(
+        self,
+        inter,
+        ids: str = commands.Param(description="IDs ou menções separados por espaço/vírgula", default=None),
+        role: disnake.Role = commands.Param(description="Banir membros com este cargo", default=None),
+        joined_within: str = commands.Param(description="Banir quem entrou nesta janela (ex: 10m, 1h)", default=None),
+        reason: str = commands.Param(description="Motivo do banimento", default="Não especificado"),
+        delete_days: int = commands.Param(description="Dias de mensagens para deletar (0-7)", default=0, min_value=0, max_value=7)
+    ):
+        """Banimento em massa; aceita também usuários que não estão no servidor"""
+        
+        # A busca dos alvos pode levar segundos (chunk e consultas à API):
+        # adiar antes para não perder o prazo de 3s da interação
+        await inter.response.defer()
+        targets, skipped, error = await self._collect_targets(inter, ids, role, joined_within, members_only=False)
+        if error:
+            embed = EmbedUtils.error_embed(title="Erro", description=error)
+            await inter.edit_original_message(embed=embed)
+            return
+        
+        audit_reason = f"Ban em massa por {inter.author} - {reason}"
+        
+        async def action(user_id: int):
+            await inter.guild.ban(disnake.Object(user_id), reason=audit_reason, delete_message_days=delete_days)
+            self.bot.mod_log.record(inter.guild.id, "ban", inter.author.id, user_id, reason, details="Em massa")
+        
+        await self._run_batch(inter, "Banimento em massa", targets, skipped, action, route="ban")
+    
+    @mass.sub_command(
+        name="kick",
+        description="Expulsa vários membros por ID, cargo ou data de entrada"
+    )
+    @commands.has_permissions(kick_members=True)
+    async def mass_kick(
+        self,
+        inter,
+        ids: str = commands.Param(description="IDs ou menções separados por espaço/vírgula", default=None),
+        role: disnake.Role = commands.Param(description="Expulsar membros com este cargo", default=None),
+        joined_within: str = commands.Param(description="Expulsar quem entrou nesta janela (ex: 10m, 1h)", default=None),
+        reason: str = commands.Param(description="Motivo da expulsão", default="Não especificado")
+    ):
+        """Expulsão em massa"""
+        
+        await inter.response.defer()
+        targets, skipped, error = await self._collect_targets(inter, ids, role, joined_within, members_only=True)
+        if error:
+            embed = EmbedUtils.error_embed(title="Erro", description=error)
+            await inter.edit_original_message(embed=embed)
+            return
+        
+        audit_reason = f"Kick em massa por {inter.author} - {reason}"
+        
+        async def action(user_id: int):
+            await inter.guild.kick(disnake.Object(user_id), reason=audit_reason)
+            self.bot.mod_log.record(inter.guild.id, "kick", inter.author.id, user_id, reason, details="Em massa")
+        
+        await self._run_batch(inter, "Expulsão em massa", targets, skipped, action, route="kick")
+    
+    @mass.sub_command(
+        name="timeout",
+        description="Coloca vários membros em timeout por ID, cargo ou data de entrada"
+    )
+    @commands.has_permissions(moderate_members=True)
+    async def mass_timeout(
+        self,
+        inter,
+        duration: str = commands.Param(description="Duração (ex: 30m, 1h30m, 2d; número puro = minutos; max 2d)"),
+        ids: str = commands.Param(description="IDs ou menções separados por espaço/vírgula", default=None),
+        role: disnake.Role = commands.Param(description="Membros com este cargo", default=None),
+        joined_within: str = commands.Param(description="Membros que entraram nesta janela (ex: 10m, 1h)", default=None),
+        reason: str = commands.Param(description="Motivo do timeout", default="Não especificado")
+    ):
+        """Timeout em massa"""
+        
+        seconds = BotUtils.parse_duration(duration, default_unit=60)
+        if not seconds or seconds > 2880 * 60:
+            embed = EmbedUtils.error_embed(
+                title="Duração inválida",
+                description="Use formatos como: 30m, 1h30m, 2d ou PT1H (máximo de 2 dias)."
+            )
+            await inter.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        await inter.response.defer()
+        targets, skipped, error = await self._collect_targets(inter, ids, role, joined_within, members_only=True)
+        if error:
+            embed = EmbedUtils.error_embed(title="Erro", description=error)
+            await inter.edit_original_message(embed=embed)
+            return
+        
+        audit_reason = f"Timeout em massa por {inter.author} - {reason}"
+        
+        async def action(user_id: int):
+            await inter.guild.timeout(disnake.Object(user_id), duration=seconds, reason=audit_reason)
+            self.bot.mod_log.record(inter.guild.id, "timeout", inter.author.id, user_id, reason, details=f"Em massa, duração: {BotUtils.format_uptime(seconds)}")
+        
+        await self._run_batch(inter, "Timeout em massa", targets, skipped, action, route="timeout")
 
 def setup(bot):
     bot.add_cog(ModerationCog(bot))
@@ -2,12 +2,9 @@
 Cog de comandos de ping e informações básicas
 """
 
-import disnake
-import psutil
-import platform
-from datetime import datetime
 from disnake.ext import commands
 from utils import EmbedUtils, BotUtils
+from services.cache_policy import cache_footprint
 
 class PingCog(commands.Cog):
     """Comandos relacionados a ping e informações do bot"""
@@ -25,10 +22,10 @@ class PingCog(commands.Cog):
         # Calcular latência
         latency_ms = round(self.bot.latency * 1000)
         
-        # Obter informações do sistema
-        cpu_usage = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        memory_usage = f"{memory.percent}%"
+        # Obter informações do sistema (snapshot em cache, sem bloquear o loop)
+        system = self.bot.system_monitor.snapshot
+        cpu_usage = system.cpu_percent
+        memory_usage = f"{system.memory_percent}%"
         
         # Criar embed com informações detalhadas
         embed = EmbedUtils.create_embed(
@@ -64,13 +61,13 @@ class PingCog(commands.Cog):
         
         embed.add_field(
             name="🌐 Servidores",
-            value=f"`{len(self.bot.guilds)}`",
+            value=f"`{self.bot.cluster_stats.total('guilds')}`",
             inline=True
         )
         
         embed.add_field(
             name="👥 Usuários",
-            value=f"`{len(self.bot.users)}`",
+            value=f"`{self.bot.cluster_stats.total('members')}`",
             inline=True
         )
         
@@ -114,8 +111,8 @@ class PingCog(commands.Cog):
         embed.add_field(
             name="📈 Estatísticas",
             value=(
-                f"**Servidores:** {len(self.bot.guilds)}\n"
-                f"**Usuários:** {len(self.bot.users)}\n"
+                f"**Servidores:** {self.bot.cluster_stats.total('guilds')}\n"
+                f"**Usuários:** {self.bot.cluster_stats.total('members')}\n"
                 f"**Comandos:** {len(self.bot.slash_commands)}"
             ),
             inline=False
@@ -131,18 +128,10 @@ class PingCog(commands.Cog):
         """Comando para mostrar status detalhado do sistema"""
         
         # Informações do sistema
-        system_info = {
-            "OS": platform.system(),
-            "Version": platform.release(),
-            "Architecture": platform.machine(),
-            "Python": platform.python_version(),
-            "Disnake": disnake.__version__
-        }
-        
-        # Informações de hardware
-        cpu_count = psutil.cpu_count()
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+        system_info = self.bot.system_monitor.platform_info
+        
+        # Informações de hardware (snapshot em cache)
+        system = self.bot.system_monitor.snapshot
         
         embed = EmbedUtils.create_embed(
             title="📊 Status do Sistema",
@@ -159,10 +148,11 @@ class PingCog(commands.Cog):
         
         # Hardware
         hardware_text = (
-            f"**CPU Cores:** {cpu_count}\n"
-            f"**RAM Total:** {memory.total // (1024**3)} GB\n"
-            f"**RAM Usada:** {memory.used // (1024**3)} GB ({memory.percent}%)\n"
-            f"**Disco Usado:** {disk.used // (1024**3)} GB ({disk.percent}%)"
+            f"**CPU Cores:** {system.cpu_count}\n"
+            f"**CPU:** {system.cpu_percent}%\n"
+            f"**RAM Total:** {system.memory_total // (1024**3)} GB\n"
+            f"**RAM Usada:** {system.memory_used // (1024**3)} GB ({system.memory_percent}%)\n"
+            f"**Disco Usado:** {system.disk_used // (1024**3)} GB ({system.disk_percent}%)"
         )
         embed.add_field(
             name="⚙️ Hardware",
@@ -174,8 +164,8 @@ class PingCog(commands.Cog):
         bot_text = (
             f"**Latência:** {round(self.bot.latency * 1000)}ms\n"
             f"**Uptime:** {self.bot.get_uptime()}\n"
-            f"**Servidores:** {len(self.bot.guilds)}\n"
-            f"**Usuários:** {len(self.bot.users)}"
+            f"**Servidores:** {self.bot.cluster_stats.total('guilds')}\n"
+            f"**Usuários:** {self.bot.cluster_stats.total('members')}"
         )
         embed.add_field(
             name="🤖 Bot",
@@ -183,6 +173,23 @@ class PingCog(commands.Cog):
             inline=False
         )
         
+        # Memória: RSS do processo e estimativa de cada cache do disnake
+        memory_lines = [f"**RSS do processo:** {BotUtils.format_bytes(system.process_rss)}"]
+        for cache in cache_footprint(self.bot):
+            memory_lines.append(f"**{cache.name}:** {cache.count} (~{BotUtils.format_bytes(cache.size)})")
+        
+        member_cache = self.bot.member_cache
+        if member_cache.max_guilds > 0:
+            memory_lines.append(
+                f"**Listas de membros:** {member_cache.tracked}/{member_cache.max_guilds} servidores "
+                f"({member_cache.evictions} descartadas)"
+            )
+        embed.add_field(
+            name="🧠 Memória",
+            value="\n".join(memory_lines),
+            inline=False
+        )
+        
         await inter.response.send_message(embed=embed, ephemeral=True)
 
 def setup(bot):
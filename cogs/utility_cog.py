@@ -3,71 +3,13 @@ Cog de comandos utilitários
 """
 
 import disnake
-import asyncio
 import random
-from datetime import datetime, timedelta
-from disnake.ext import commands, tasks
+from datetime import datetime
+from disnake.ext import commands
 from utils import EmbedUtils, BotUtils
 from config import BotConfig
-
-class PollView(disnake.ui.View):
-    """View para enquetes"""
-    
-    def __init__(self, options):
-        super().__init__(timeout=300)  # 5 minutos
-        self.options = options
-        self.votes = {i: [] for i in range(len(options))}
-        
-        # Criar botões dinamicamente
-        for i, option in enumerate(options):
-            button = disnake.ui.Button(
-                label=f"{i+1}. {option}",
-                style=disnake.ButtonStyle.primary,
-                custom_id=f"poll_{i}"
-            )
-            button.callback = self.create_vote_callback(i)
-            self.add_item(button)
-    
-    def create_vote_callback(self, option_index):
-        async def vote_callback(inter):
-            user_id = inter.user.id
-            
-            # Remover voto anterior se existir
-            for votes_list in self.votes.values():
-                if user_id in votes_list:
-                    votes_list.remove(user_id)
-            
-            # Adicionar novo voto
-            self.votes[option_index].append(user_id)
-            
-            # Atualizar embed
-            embed = EmbedUtils.create_embed(
-                title="📊 Enquete",
-                description="Clique em uma opção para votar!"
-            )
-            
-            total_votes = sum(len(votes) for votes in self.votes.values())
-            
-            for i, option in enumerate(self.options):
-                vote_count = len(self.votes[i])
-                percentage = (vote_count / total_votes * 100) if total_votes > 0 else 0
-                
-                # Criar barra de progresso
-                bar_length = 10
-                filled_length = int(bar_length * percentage / 100)
-                bar = "█" * filled_length + "░" * (bar_length - filled_length)
-                
-                embed.add_field(
-                    name=f"{i+1}. {option}",
-                    value=f"`{bar}` {vote_count} votos ({percentage:.1f}%)",
-                    inline=False
-                )
-            
-            embed.set_footer(text=f"Total de votos: {total_votes}")
-            
-            await inter.response.edit_message(embed=embed, view=self)
-        
-        return vote_callback
+from services.polls import parse_poll_custom_id, poll_custom_id
+from services.shortener import validate_url
 
 class ReminderModal(disnake.ui.Modal):
     """Modal para criar lembretes"""
@@ -95,9 +37,9 @@ class ReminderModal(disnake.ui.Modal):
         reminder_text = inter.text_values["reminder_input"]
         
         # Converter tempo para segundos
-        seconds = self.parse_time(time_str)
+        seconds = BotUtils.parse_duration(time_str)
         
-        if seconds is None:
+        if not seconds:
             embed = EmbedUtils.error_embed(
                 title="Formato inválido",
                 description="Use formatos como: 1h, 30m, 2d, 1h30m, etc."
@@ -113,62 +55,22 @@ class ReminderModal(disnake.ui.Modal):
             await inter.response.send_message(embed=embed, ephemeral=True)
             return
         
-        # Criar lembrete
-        reminder_time = datetime.utcnow() + timedelta(seconds=seconds)
+        # Criar lembrete (persistido em disco e entregue pelo agendador do bot)
+        reminder = await inter.bot.reminders.schedule(
+            user_id=inter.user.id,
+            channel_id=inter.channel_id,
+            content=reminder_text,
+            delay=seconds
+        )
         
         embed = EmbedUtils.success_embed(
             title="Lembrete criado",
             description=f"Você será lembrado em **{time_str}**"
         )
         embed.add_field(name="Lembrete", value=reminder_text, inline=False)
-        embed.add_field(name="Quando", value=f"<t:{int(reminder_time.timestamp())}:F>", inline=False)
+        embed.add_field(name="Quando", value=f"<t:{int(reminder.due_at)}:F>", inline=False)
         
         await inter.response.send_message(embed=embed, ephemeral=True)
-        
-        # Aguardar e enviar lembrete
-        await asyncio.sleep(seconds)
-        
-        reminder_embed = EmbedUtils.create_embed(
-            title="🔔 Lembrete",
-            description=reminder_text,
-            color=BotConfig.WARNING_COLOR
-        )
-        reminder_embed.add_field(
-            name="Criado em",
-            value=f"<t:{int((reminder_time - timedelta(seconds=seconds)).timestamp())}:F>",
-            inline=False
-        )
-        
-        try:
-            await inter.user.send(embed=reminder_embed)
-        except:
-            # Se não conseguir enviar DM, tentar no canal
-            try:
-                await inter.channel.send(f"{inter.user.mention}", embed=reminder_embed)
-            except:
-                pass
-    
-    def parse_time(self, time_str):
-        """Converte string de tempo para segundos"""
-        import re
-        
-        # Padrões de tempo
-        patterns = {
-            'd': 86400,  # dias
-            'h': 3600,   # horas
-            'm': 60,     # minutos
-            's': 1       # segundos
-        }
-        
-        total_seconds = 0
-        time_str = time_str.lower().strip()
-        
-        for unit, multiplier in patterns.items():
-            match = re.search(rf'(\d+){unit}', time_str)
-            if match:
-                total_seconds += int(match.group(1)) * multiplier
-        
-        return total_seconds if total_seconds > 0 else None
 
 class UtilityCog(commands.Cog):
     """Comandos utilitários diversos"""
@@ -176,6 +78,79 @@ class UtilityCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
     
+    @commands.Cog.listener()
+    async def on_message(self, message: disnake.Message):
+        """Remove o AFK de quem fala e avisa quando alguém menciona um membro AFK"""
+        
+        # Caminho rápido: servidor sem ninguém AFK custa uma consulta ao dicionário
+        if message.guild is None:
+            return
+        afk = self.bot.afk.guild(message.guild.id)
+        if afk is None or message.author.bot:
+            return
+        
+        afk_manager = self.bot.afk
+        author_id = message.author.id
+        if author_id in afk:
+            entry = await afk_manager.clear(message.guild.id, author_id)
+            if entry is not None:
+                embed = EmbedUtils.create_embed(
+                    title="👋 Bem-vindo de volta!",
+                    description=f"{message.author.mention}, seu status AFK foi removido (AFK desde <t:{int(entry.since)}:R>)."
+                )
+                await message.channel.send(
+                    embed=embed,
+                    delete_after=10,
+                    allowed_mentions=disnake.AllowedMentions.none()
+                )
+            afk = afk_manager.guild(message.guild.id)
+            if afk is None:
+                return
+        
+        # Custo proporcional às menções da mensagem, não aos membros AFK
+        notices = []
+        for user in message.mentions:
+            entry = afk.get(user.id)
+            if entry is not None and afk_manager.should_notify(message.channel.id, user.id):
+                notices.append(f"💤 **{user.display_name}** está AFK: {entry.reason} (<t:{int(entry.since)}:R>)")
+        
+        if notices:
+            await message.reply(
+                "\n".join(notices),
+                delete_after=15,
+                mention_author=False,
+                allowed_mentions=disnake.AllowedMentions.none()
+            )
+    
+    @commands.Cog.listener("on_button_click")
+    async def on_poll_vote(self, inter: disnake.MessageInteraction):
+        """Roteia cliques `poll:<id>:<opção>` para o estado da enquete"""
+        
+        parsed = parse_poll_custom_id(inter.component.custom_id)
+        if parsed is None:
+            return
+        
+        poll_id, option = parsed
+        polls = self.bot.polls
+        state = await polls.get(poll_id)
+        
+        if state is None or not 0 <= option < len(state.options):
+            embed = EmbedUtils.error_embed(
+                title="Enquete indisponível",
+                description="Esta enquete não existe mais."
+            )
+            await inter.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Registrar voto (O(1), troca de voto inclusa)
+        changed = polls.vote(poll_id, state, inter.user.id, option)
+        
+        # Confirmar o clique na hora; o embed é atualizado em lote
+        await inter.response.defer()
+        
+        if changed:
+            polls.renderer.request(inter.message, state)
+    
     @commands.slash_command(
         name="say",
         description="Faz o bot falar algo"
@@ -281,26 +256,27 @@ class UtilityCog(commands.Cog):
             if opt:
                 options.append(opt)
         
-        # Criar embed
-        embed = EmbedUtils.create_embed(
-            title="📊 Enquete",
-            description=f"**{question}**\n\nClique em uma opção para votar!"
+        # Registrar enquete persistente
+        poll_id, state = await self.bot.polls.create(
+            guild_id=inter.guild_id,
+            channel_id=inter.channel_id,
+            question=question,
+            options=options,
+            author_name=inter.author.display_name
         )
+        embed = state.build_embed()
         
-        # Adicionar opções
-        for i, option in enumerate(options):
-            embed.add_field(
-                name=f"{i+1}. {option}",
-                value="`░░░░░░░░░░` 0 votos (0.0%)",
-                inline=False
+        # Botões com custom_id estável, roteados pelo listener on_poll_vote
+        buttons = [
+            disnake.ui.Button(
+                label=f"{i+1}. {option}",
+                style=disnake.ButtonStyle.primary,
+                custom_id=poll_custom_id(poll_id, i)
             )
+            for i, option in enumerate(options)
+        ]
         
-        embed.set_footer(text=f"Enquete criada por {inter.author.display_name} • Total de votos: 0")
-        
-        # Criar view
-        view = PollView(options)
-        
-        await inter.response.send_message(embed=embed, view=view)
+        await inter.response.send_message(embed=embed, components=buttons)
     
     @commands.slash_command(
         name="remind",
@@ -437,12 +413,20 @@ class UtilityCog(commands.Cog):
     ):
         """Comando para definir status AFK"""
         
-        # Aqui você pode implementar um sistema de AFK com banco de dados
-        # Por enquanto, apenas uma mensagem
+        if inter.guild is None:
+            embed = EmbedUtils.error_embed(
+                title="Erro",
+                description="O status AFK só pode ser usado em servidores."
+            )
+            await inter.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Persistido e removido automaticamente na próxima mensagem do membro
+        await self.bot.afk.set(inter.guild.id, inter.author.id, reason)
         
         embed = EmbedUtils.success_embed(
             title="AFK Ativado",
-            description=f"Você está AFK: **{reason}**"
+            description=f"Você está AFK: **{reason}**\nSeu status será removido quando você enviar uma mensagem."
         )
         
         await inter.response.send_message(embed=embed, ephemeral=True)
@@ -458,25 +442,26 @@ class UtilityCog(commands.Cog):
     ):
         """Comando para encurtar URLs"""
         
-        # Validação básica de URL
-        if not url.startswith(('http://', 'https://')):
+        # Validação de esquema, domínio e tamanho
+        error = validate_url(url)
+        if error:
             embed = EmbedUtils.error_embed(
                 title="URL inválida",
-                description="A URL deve começar com http:// ou https://"
+                description=error
             )
             await inter.response.send_message(embed=embed, ephemeral=True)
             return
         
-        # Aqui você pode implementar um serviço de encurtamento
-        # Por enquanto, apenas uma resposta de exemplo
+        # A mesma URL sempre recebe o mesmo código
+        code = await self.bot.shortener.shorten(url, created_by=inter.author.id)
         
         embed = EmbedUtils.create_embed(
             title="🔗 URL Encurtada",
-            description="Serviço de encurtamento ainda não implementado"
+            description=self.bot.shortener.short_url(code)
         )
         
-        embed.add_field(name="URL Original", value=url, inline=False)
-        embed.add_field(name="Status", value="Em desenvolvimento", inline=False)
+        embed.add_field(name="URL Original", value=url[:1024], inline=False)
+        embed.add_field(name="Código", value=f"`{code}`", inline=False)
         
         await inter.response.send_message(embed=embed, ephemeral=True)
 
@@ -24,6 +24,16 @@ class BotConfig:
     INTENTS.message_content = True
     INTENTS.voice_states = True
     INTENTS.reactions = True
+    # "optimized" desliga os intents que nenhum listener ou cog usa
+    INTENTS_PROFILE: str = os.getenv("INTENTS_PROFILE", "full").lower()
+    GATEWAY_REPORT_INTERVAL: float = float(os.getenv("GATEWAY_REPORT_INTERVAL", "3600"))  # Segundos; 0 desativa
+    
+    # Política de cache (limita a memória em instalações grandes)
+    MEMBER_CACHE: str = os.getenv("MEMBER_CACHE", "all")  # all, none ou flags separadas por vírgula (voice,joined)
+    MESSAGE_CACHE_SIZE: int = int(os.getenv("MESSAGE_CACHE_SIZE", "1000"))  # Mensagens em memória; 0 desativa
+    MEMBER_CACHE_MAX_GUILDS: int = int(os.getenv("MEMBER_CACHE_MAX_GUILDS", "0"))  # Listas de membros mantidas; 0 = sem limite
+    MEMBER_CHUNK_TIMEOUT: float = 2.0  # Espera máxima (segundos) pelo chunk de membros dentro de um comando
+    MEMBER_CACHE_SWEEP_INTERVAL: float = 600.0  # Segundos entre limpezas de servidores inativos
     
     # Configurações de embed padrão
     EMBED_COLOR: int = 0x5865F2  # Cor padrão do Discord
@@ -32,15 +42,107 @@ class BotConfig:
     WARNING_COLOR: int = 0xFFFF00  # Amarelo
     
     # Configurações de status
+    # "name" aceita {guilds}, {members}, {shards} e {commands}; "hours": (início, fim) restringe a entrada a um horário
     STATUS_ACTIVITIES: list = [
         {"type": disnake.ActivityType.watching, "name": "por interações!"},
         {"type": disnake.ActivityType.listening, "name": "comandos /help"},
-        {"type": disnake.ActivityType.playing, "name": "com Python e Disnake"}
+        {"type": disnake.ActivityType.playing, "name": "com Python e Disnake"},
+        {"type": disnake.ActivityType.watching, "name": "{guilds} servidores"}
     ]
+    STATUS_INTERVAL: float = float(os.getenv("STATUS_INTERVAL", "300"))  # Segundos entre trocas de atividade
+    STATUS_ROTATION: str = os.getenv("STATUS_ROTATION", "sequential").lower()  # sequential ou random
+    PRESENCE_SHARD_DELAY: float = 1.0  # Segundos entre os envios para cada shard
     
     # Configurações de log
-    LOG_CHANNEL: str = "bot-logs"
-    LOG_LEVEL: str = "INFO"
+    LOG_CHANNEL: str = "bot-logs"  # Canal que recebe as ações de moderação
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FILE: str = os.getenv("LOG_FILE", os.path.join("logs", "bot.log"))
+    LOG_JSON: bool = os.getenv("LOG_JSON", "False").lower() == "true"  # Linhas JSON compactas no arquivo
+    LOG_MAX_BYTES: int = int(os.getenv("LOG_MAX_BYTES", str(5 * 1024 * 1024)))  # Rotação por tamanho
+    LOG_ROTATE_WHEN: str = os.getenv("LOG_ROTATE_WHEN", "")  # Rotação por tempo (ex: midnight); substitui a por tamanho
+    LOG_BACKUP_COUNT: int = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    
+    # Modo cluster: processos e shards (0 = um processo por CPU / recomendado pelo Discord)
+    CLUSTER_COUNT: int = int(os.getenv("CLUSTERS", "1"))
+    SHARD_COUNT: int = int(os.getenv("SHARD_COUNT", "0"))
+    CLUSTER_RESTART_BACKOFF_MAX: float = 60.0  # Espera máxima (segundos) antes de reiniciar um cluster
+    
+    # Dependências pesadas (psutil, aiohttp.web...) só são carregadas no primeiro uso
+    LAZY_IMPORTS: bool = os.getenv("LAZY_IMPORTS", "True").lower() == "true"
+    
+    # Diretório de dados persistentes (bancos SQLite)
+    DATA_DIR: str = os.getenv("DATA_DIR", "data")
+    
+    # Hashes e IDs dos comandos sincronizados com o Discord
+    COMMAND_STATE_PATH: str = os.path.join(DATA_DIR, "commands.json")
+    
+    # Configurações de lembretes
+    REMINDER_DB_PATH: str = os.path.join(DATA_DIR, "reminders.db")
+    REMINDER_HORIZON: float = 300.0  # Segundos de lembretes mantidos em memória
+    REMINDER_BATCH_SIZE: int = 50  # Lembretes entregues por lote
+    REMINDER_PRELOAD_LIMIT: int = 1000  # Máximo de lembretes carregados por leitura
+    
+    # Configurações de enquetes
+    POLL_RENDER_INTERVAL: float = float(os.getenv("POLL_RENDER_INTERVAL", "2"))  # Máx. 1 edição por janela
+    POLL_DB_PATH: str = os.path.join(DATA_DIR, "polls.db")
+    POLL_CACHE_SIZE: int = 500  # Enquetes mantidas em memória
+    POLL_FLUSH_INTERVAL: float = 5.0  # Segundos entre gravações de votos
+    
+    # Configurações de avisos (/warn)
+    WARN_DB_PATH: str = os.path.join(DATA_DIR, "warnings.db")
+    WARN_FLUSH_INTERVAL: float = 2.0  # Segundos entre gravações de avisos
+    WARN_PAGE_SIZE: int = 10  # Avisos por página em /warnings
+    # Escalonamento: `count` avisos em `window` segundos aplicam timeout de `timeout` segundos (max 2 dias)
+    WARN_ESCALATION: list = [
+        {"count": 3, "window": 86400, "timeout": 3600},
+        {"count": 5, "window": 7 * 86400, "timeout": 86400}
+    ]
+    
+    # Registro de moderação: ações gravadas em lote e publicadas em LOG_CHANNEL
+    MODLOG_DB_PATH: str = os.path.join(DATA_DIR, "mod_events.db")
+    MODLOG_FLUSH_INTERVAL: float = float(os.getenv("MODLOG_FLUSH_INTERVAL", "5"))  # Segundos entre publicações no canal
+    
+    # Configurações de AFK
+    AFK_DB_PATH: str = os.path.join(DATA_DIR, "afk.db")
+    AFK_NOTICE_COOLDOWN: float = 60.0  # Segundos entre avisos sobre o mesmo membro no mesmo canal
+    
+    # Fila de DMs (avisos de moderação e lembretes)
+    DM_WORKERS: int = int(os.getenv("DM_WORKERS", "4"))  # Envios de DM simultâneos
+    DM_CLOSED_TTL: float = 6 * 3600.0  # Segundos que um usuário com DMs fechadas fica sem novas tentativas
+    DM_PRE_ACTION_TIMEOUT: float = 1.5  # Espera máxima pela DM antes de um kick/ban
+    
+    # Encurtador de URLs (/shorturl); porta 0 desativa o servidor de redirecionamento
+    SHORTURL_DB_PATH: str = os.path.join(DATA_DIR, "short_urls.db")
+    SHORTURL_HOST: str = os.getenv("SHORTURL_HOST", "127.0.0.1")
+    SHORTURL_PORT: int = int(os.getenv("SHORTURL_PORT", "8080"))
+    SHORTURL_BASE_URL: str = os.getenv("SHORTURL_BASE_URL", f"http://localhost:{SHORTURL_PORT}")
+    SHORTURL_CACHE_SIZE: int = 10000  # Códigos mantidos em memória
+    SHORTURL_MAX_LENGTH: int = 2048  # Tamanho máximo da URL original
+    
+    # Configurações de monitoramento do sistema
+    SYSTEM_SAMPLE_INTERVAL: float = float(os.getenv("SYSTEM_SAMPLE_INTERVAL", "5"))
+    
+    # Janelas de tempo (/clear within, /mass joined_within): valores maiores
+    # são reduzidos a este, que já cobre todo o histórico do Discord
+    MAX_WINDOW_SECONDS: int = 20 * 365 * 86400
+    
+    # Configurações de limpeza de mensagens (/clear)
+    PURGE_MAX_AMOUNT: int = 50000  # Máximo de mensagens apagadas por comando
+    PURGE_SCAN_LIMIT: int = 200000  # Máximo de mensagens lidas do histórico por comando
+    PURGE_OLD_DELETE_RATE: float = 2.0  # Exclusões por segundo de mensagens com mais de 14 dias
+    PURGE_PROGRESS_INTERVAL: float = 3.0  # Segundos entre atualizações do progresso
+    PURGE_PATTERN_MAX_LENGTH: int = 200  # Tamanho máximo do regex de /clear
+    PURGE_PATTERN_MAX_REPEATS: int = 3  # Quantificadores (*, +, {n,m}) permitidos no regex de /clear
+    
+    # Endpoint local de métricas (formato Prometheus); porta 0 desativa
+    METRICS_HOST: str = os.getenv("METRICS_HOST", "127.0.0.1")
+    METRICS_PORT: int = int(os.getenv("METRICS_PORT", "9464"))
+    
+    # Configurações de moderação em massa
+    MASS_ACTION_CONCURRENCY: int = int(os.getenv("MASS_ACTION_CONCURRENCY", "8"))  # Requisições simultâneas
+    MASS_ACTION_RATE: float = float(os.getenv("MASS_ACTION_RATE", "25"))  # Ações por segundo por servidor
+    MASS_ACTION_PROGRESS_INTERVAL: float = 2.0  # Segundos entre atualizações do embed de progresso
+    MASS_ACTION_LIMIT: int = 1000  # Máximo de alvos por comando
     
     @classmethod
     def validate(cls) -> bool:
@@ -50,6 +152,17 @@ class BotConfig:
             return False
         return True
     
+    @classmethod
+    def member_cache_flags(cls) -> disnake.MemberCacheFlags:
+        """Converte MEMBER_CACHE em flags do cache de membros"""
+        value = cls.MEMBER_CACHE.strip().lower()
+        if value == "all":
+            return disnake.MemberCacheFlags.all()
+        if value == "none":
+            return disnake.MemberCacheFlags.none()
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        return disnake.MemberCacheFlags(**{name: True for name in names})
+    
     @classmethod
     def get_embed_defaults(cls) -> Dict[str, Any]:
         """Retorna configurações padrão para embeds"""
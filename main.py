@@ -7,36 +7,138 @@ import disnake
 import os
 import asyncio
 import logging
-import random
 from datetime import datetime
+from typing import List, Optional
 from disnake.ext import commands, tasks
 from config import BotConfig
 from utils import EmbedUtils, BotUtils
+from services.system_monitor import SystemMonitor
+from services.reminders import ReminderScheduler, ReminderStore
+from services.polls import PollManager, PollStore
+from services.afk import AFKManager, AFKStore
+from services.warning_ledger import WarningLedger, WarningStore
+from services.dm_outbox import DMOutbox
+from services.mod_log import ModerationLog, ModLogStore
+from services.shortener import ShortURLServer, ShortURLStore, URLShortener
+from services.log_pipeline import setup_logging
+from services.metrics import CommandMetrics, MetricsServer
+from services.startup import StartupProfiler
+from services.command_sync import CommandSync
+from services.cluster import ClusterLauncher, ClusterStats, cluster_path
+from services.bot_stats import ShardStatsTracker
+from services.cache_policy import MemberCachePolicy
+from services.presence import PresenceManager
+from services.intents import GatewayEventMeter, analyze_intents, apply_optimized
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
-class BotBase(commands.InteractionBot):
+class BotBase(commands.AutoShardedInteractionBot):
     """Classe principal do bot com funcionalidades otimizadas"""
     
-    def __init__(self):
-        super().__init__(
-            intents=BotConfig.INTENTS,
-            command_prefix=BotConfig.COMMAND_PREFIX,
-            description=BotConfig.DESCRIPTION,
-            help_command=None,
-            sync_commands=True
-        )
+    def __init__(
+        self,
+        shard_ids: Optional[List[int]] = None,
+        shard_count: Optional[int] = None,
+        cluster_stats: Optional[ClusterStats] = None
+    ):
+        startup = StartupProfiler()
+        with startup.phase("cliente"):
+            super().__init__(
+                intents=BotConfig.INTENTS,
+                shard_ids=shard_ids,
+                shard_count=shard_count,
+                # Política de cache: com limite de listas de membros, o chunk é feito sob demanda
+                member_cache_flags=BotConfig.member_cache_flags(),
+                max_messages=BotConfig.MESSAGE_CACHE_SIZE or None,
+                chunk_guilds_at_startup=BotConfig.MEMBER_CACHE_MAX_GUILDS <= 0,
+                # A atividade inicial vai no IDENTIFY, sem um change_presence a mais
+                activity=PresenceManager.initial_activity(),
+                # A sincronização é feita por CommandSync, só com o que mudou
+                command_sync_flags=commands.CommandSyncFlags.none()
+            )
+        self.startup = startup
         
         # Atributos do bot
         self.start_time = datetime.utcnow()
         self.config = BotConfig
+        # Contadores globais: compartilhados entre processos no modo cluster
+        self.cluster_stats = cluster_stats or ClusterStats.local()
+        self.shard_stats = ShardStatsTracker(self.cluster_stats)
+        
+        # Embeds estáticos montados uma única vez
+        self.welcome_template = EmbedUtils.create_template(
+            title="Obrigado por me adicionar!",
+            description=(
+                "Olá pessoal do **{guild_name}**! 👋\n\n"
+                "Eu sou um bot moderno feito com Python e Disnake.\n"
+                "Use `/help` para ver todos os meus comandos!\n\n"
+                "📝 **Comandos principais:**\n"
+                "`/ping` - Verificar latência\n"
+                "`/ticket` - Sistema de tickets\n"
+                "`/info` - Informações do bot\n"
+            ),
+            color=BotConfig.SUCCESS_COLOR
+        )
+        
+        with self.startup.phase("serviços"):
+            self.system_monitor = SystemMonitor()
+            # Cada cluster despacha apenas os lembretes criados nele
+            reminder_db = cluster_path(BotConfig.REMINDER_DB_PATH, self.cluster_stats.cluster_id)
+            self.dm_outbox = DMOutbox(self)
+            self.reminders = ReminderScheduler(self, ReminderStore(reminder_db))
+            self.polls = PollManager(PollStore(BotConfig.POLL_DB_PATH))
+            self.afk = AFKManager(AFKStore(BotConfig.AFK_DB_PATH))
+            self.warnings = WarningLedger(WarningStore(BotConfig.WARN_DB_PATH))
+            self.mod_log = ModerationLog(self, ModLogStore(BotConfig.MODLOG_DB_PATH))
+            self.shortener = URLShortener(ShortURLStore(BotConfig.SHORTURL_DB_PATH))
+            self.shortener_server = ShortURLServer(self, self.shortener)
+            
+            # Instrumentação de todos os comandos slash e chamadas REST
+            self.metrics = CommandMetrics()
+            self.metrics.install(self)
+            # Uma porta por cluster: METRICS_PORT, METRICS_PORT + 1, ...
+            self.metrics_server = MetricsServer(
+                self, self.metrics, port=BotConfig.METRICS_PORT + self.cluster_stats.cluster_id
+            )
+            self.command_sync = CommandSync(self)
+            self.member_cache = MemberCachePolicy(self)
+            self.presence = PresenceManager(self)
+            self.gateway_meter = GatewayEventMeter()
+            self.gateway_meter.install(self)
         
         # Carregar extensões
-        self.load_extensions()
+        with self.startup.phase("extensões"):
+            self.load_extensions()
+        
+        # Intents deduzidos dos listeners registrados até aqui (cogs e serviços)
+        self.member_cache.install()
+        self.intent_analysis = analyze_intents(self)
+        for line in self.intent_analysis.report():
+            logger.info(line)
+        if BotConfig.INTENTS_PROFILE == "optimized":
+            intents = apply_optimized(self, self.intent_analysis)
+            logger.info("Perfil de intents otimizado: %s", ", ".join(name for name, value in intents if value))
         
         # Iniciar tasks
-        self.status_task.start()
+        self.presence.install()
+        self.system_monitor.start()
+        self.dm_outbox.start()
+        self.reminders.start()
+        self.polls.start()
+        self.afk.start()
+        self.warnings.start()
+        self.mod_log.start()
+        if BotConfig.GATEWAY_REPORT_INTERVAL > 0:
+            self.gateway_report_task.change_interval(seconds=BotConfig.GATEWAY_REPORT_INTERVAL)
+            self.gateway_report_task.start()
+        # Os comandos são globais e a porta do encurtador é uma só: ficam com o cluster 0
+        if self.cluster_stats.cluster_id == 0:
+            self.command_sync.start()
+            if BotConfig.SHORTURL_PORT:
+                self.shortener_server.start()
+        if BotConfig.METRICS_PORT:
+            self.metrics_server.start()
     
     def load_extensions(self):
         """Carrega todas as extensões (cogs)"""
@@ -51,39 +153,31 @@ class BotBase(commands.InteractionBot):
         failed_extensions = []
         
         for extension in initial_extensions:
-            try:
-                self.load_extension(extension)
-                loaded_extensions.append(extension)
-                logger.info(f"✅ Extensão carregada: {extension}")
-            except Exception as e:
-                failed_extensions.append(extension)
-                logger.error(f"❌ Falha ao carregar extensão {extension}: {e}")
+            timing = self.startup.load_extension(self, extension)
+            if timing.error is None:
+                loaded_extensions.append(timing)
+                logger.info("✅ Extensão carregada: %s (%.1f ms)", extension, timing.total * 1000)
+            else:
+                failed_extensions.append(timing)
+                logger.error("❌ Falha ao carregar extensão %s: %s", extension, timing.error)
         
         print(f"\n🔧 Extensões carregadas: {len(loaded_extensions)}")
-        for ext in loaded_extensions:
-            print(f"  ✅ {ext}")
+        for timing in loaded_extensions:
+            print(f"  ✅ {timing.name} ({timing.total * 1000:.1f} ms)")
         
         if failed_extensions:
             print(f"\n❌ Extensões que falharam: {len(failed_extensions)}")
-            for ext in failed_extensions:
-                print(f"  ❌ {ext}")
-    
-    @tasks.loop(minutes=5)
-    async def status_task(self):
-        """Alterna o status do bot"""
-        if not self.is_ready():
-            return
-        
-        activity_config = random.choice(BotConfig.STATUS_ACTIVITIES)
-        activity = disnake.Activity(
-            type=activity_config["type"],
-            name=activity_config["name"]
-        )
-        await self.change_presence(activity=activity)
+            for timing in failed_extensions:
+                print(f"  ❌ {timing.name}")
+    
+    @tasks.loop(seconds=3600)
+    async def gateway_report_task(self):
+        """Registra a taxa de eventos do gateway e o ganho estimado sem os intents desnecessários"""
+        for line in self.gateway_meter.report(disabled=self.intent_analysis.unused):
+            logger.info(line)
     
-    @status_task.before_loop
-    async def before_status_task(self):
-        """Espera o bot estar pronto antes de iniciar a task"""
+    @gateway_report_task.before_loop
+    async def before_gateway_report_task(self):
         await self.wait_until_ready()
     
     async def on_ready(self):
@@ -92,41 +186,31 @@ class BotBase(commands.InteractionBot):
         print(f"🤖 Bot conectado com sucesso!")
         print(f"📝 Nome: {self.user.name}")
         print(f"🆔 ID: {self.user.id}")
-        print(f"🌐 Servidores: {len(self.guilds)}")
-        print(f"👥 Usuários: {len(self.users)}")
+        print(f"🌐 Servidores: {self.cluster_stats.value('guilds')}")
+        print(f"👥 Usuários: {self.cluster_stats.value('members')}")
         print(f"📊 Latência: {round(self.latency * 1000)}ms")
         print(f"🐍 Versão do Disnake: {disnake.__version__}")
         print(f"⏰ Iniciado em: {self.start_time.strftime('%d/%m/%Y %H:%M:%S')}")
         print("=" * 50)
         
-        # Definir status inicial
-        activity = disnake.Activity(
-            type=disnake.ActivityType.watching,
-            name="por interações!"
-        )
-        await self.change_presence(activity=activity)
+        logger.info("Bot %s está online!", self.user.name)
         
-        logger.info(f"Bot {self.user.name} está online!")
+        # on_ready se repete em reconexões; o perfil só vale para a primeira
+        if "até on_ready" not in self.startup.phases:
+            self.startup.mark("até on_ready")
+            if self.command_sync.result is not None:
+                self.startup.phases["sincronização de comandos"] = self.command_sync.result.elapsed
+            for line in self.startup.report():
+                logger.info(line)
     
     async def on_guild_join(self, guild):
         """Evento executado quando o bot entra em um servidor"""
-        logger.info(f"Bot adicionado ao servidor: {guild.name} (ID: {guild.id})")
+        logger.info("Bot adicionado ao servidor: %s (ID: %s)", guild.name, guild.id)
+        self.shard_stats.guild_join(guild)
         
         # Enviar mensagem de boas-vindas para o canal geral
         if guild.system_channel:
-            embed = EmbedUtils.create_embed(
-                title="Obrigado por me adicionar!",
-                description=(
-                    f"Olá pessoal do **{guild.name}**! 👋\n\n"
-                    "Eu sou um bot moderno feito com Python e Disnake.\n"
-                    "Use `/help` para ver todos os meus comandos!\n\n"
-                    "📝 **Comandos principais:**\n"
-                    "`/ping` - Verificar latência\n"
-                    "`/ticket` - Sistema de tickets\n"
-                    "`/info` - Informações do bot\n"
-                ),
-                color=BotConfig.SUCCESS_COLOR
-            )
+            embed = self.welcome_template.render(guild_name=guild.name)
             
             try:
                 await guild.system_channel.send(embed=embed)
@@ -135,10 +219,27 @@ class BotBase(commands.InteractionBot):
     
     async def on_guild_remove(self, guild):
         """Evento executado quando o bot sai de um servidor"""
-        logger.info(f"Bot removido do servidor: {guild.name} (ID: {guild.id})")
+        logger.info("Bot removido do servidor: %s (ID: %s)", guild.name, guild.id)
+        self.shard_stats.guild_remove(guild)
+    
+    async def on_shard_ready(self, shard_id):
+        """Evento executado quando um shard termina de receber seus servidores"""
+        self.shard_stats.shard_ready(self, shard_id)
+    
+    async def on_member_join(self, member):
+        """Evento executado quando um membro entra em um servidor"""
+        self.shard_stats.member_join(member)
+    
+    async def on_raw_member_remove(self, payload):
+        """Evento executado quando um membro sai de um servidor (mesmo fora do cache)"""
+        guild = self.get_guild(payload.guild_id)
+        if guild is not None:
+            self.shard_stats.member_remove(guild)
     
-    async def on_application_command_error(self, inter, error):
+    async def on_slash_command_error(self, inter, error):
         """Trata erros de comandos slash"""
+        self.metrics.record_error(inter, error)
+        
         if isinstance(error, commands.CommandOnCooldown):
             embed = EmbedUtils.error_embed(
                 title="Comando em cooldown",
@@ -161,7 +262,8 @@ class BotBase(commands.InteractionBot):
             await inter.response.send_message(embed=embed, ephemeral=True)
         
         else:
-            logger.error(f"Erro não tratado: {error}")
+            # O traceback é formatado na thread de logs, não no event loop
+            logger.error("Erro não tratado em /%s: %s", inter.application_command.qualified_name, error, exc_info=error)
             embed = EmbedUtils.error_embed(
                 title="Erro inesperado",
                 description="Ocorreu um erro inesperado. Tente novamente."
@@ -172,6 +274,23 @@ class BotBase(commands.InteractionBot):
             except:
                 pass
     
+    async def close(self):
+        """Encerra os serviços em segundo plano antes de desconectar"""
+        self.system_monitor.stop()
+        self.member_cache.stop()
+        self.presence.stop()
+        await self.reminders.stop()
+        # Depois dos lembretes, que ainda podem enfileirar DMs
+        await self.dm_outbox.stop()
+        await self.polls.stop()
+        await self.afk.stop()
+        await self.warnings.stop()
+        await self.mod_log.stop()
+        await self.shortener_server.stop()
+        await self.shortener.close()
+        await self.metrics_server.stop()
+        await super().close()
+    
     def get_uptime(self):
         """Retorna o tempo de atividade do bot"""
         delta = datetime.utcnow() - self.start_time
@@ -180,13 +299,20 @@ class BotBase(commands.InteractionBot):
 # Inicializar o bot
 def main():
     """Função principal"""
+    setup_logging()
+    
     # Validar configurações
     if not BotConfig.validate():
         print("❌ Configurações inválidas! Verifique o arquivo .env")
         return
     
+    # Modo cluster: o launcher só supervisiona, o bot roda nos processos filhos
+    if BotConfig.CLUSTER_COUNT != 1:
+        ClusterLauncher().run()
+        return
+    
     # Criar instância do bot
-    bot = BotBase()
+    bot = BotBase(shard_count=BotConfig.SHARD_COUNT or None)
     
     # Executar o bot
     try:
@@ -194,7 +320,7 @@ def main():
     except disnake.LoginFailure:
         logger.error("❌ Token inválido!")
     except Exception as e:
-        logger.error(f"❌ Erro ao iniciar o bot: {e}")
+        logger.error("❌ Erro ao iniciar o bot: %s", e)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+Status AFK persistente com verificação de menções em O(1)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from config import BotConfig
+from services.storage import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+
+class AFKEntry(NamedTuple):
+    """Status AFK de um membro"""
+
+    reason: str
+    since: float
+
+
+class AFKStore(SQLiteStore):
+    """Armazena os status AFK em disco"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS afk (
+            guild_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            since REAL NOT NULL,
+            PRIMARY KEY (guild_id, user_id)
+        );
+    """
+
+    async def set(self, guild_id: int, user_id: int, entry: AFKEntry) -> None:
+        await self.execute(
+            "INSERT OR REPLACE INTO afk (guild_id, user_id, reason, since) VALUES (?, ?, ?, ?)",
+            (guild_id, user_id, entry.reason, entry.since)
+        )
+
+    async def delete(self, guild_id: int, user_id: int) -> None:
+        await self.execute("DELETE FROM afk WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
+
+    async def load_all(self) -> List[Tuple[int, int, str, float]]:
+        return await self.fetchall("SELECT guild_id, user_id, reason, since FROM afk")
+
+
+class AFKManager:
+    """Mantém em memória, por servidor, os membros AFK
+
+    Servidores sem ninguém AFK não têm entrada no dicionário, então a
+    maioria das mensagens é descartada com uma única consulta; nas demais o
+    custo é proporcional ao número de menções da mensagem, não ao número
+    de membros AFK. Avisos sobre o mesmo membro no mesmo canal respeitam
+    um intervalo mínimo para não inundar o chat.
+    """
+
+    def __init__(self, store: AFKStore, notice_cooldown: float = BotConfig.AFK_NOTICE_COOLDOWN):
+        self.store = store
+        self.notice_cooldown = notice_cooldown
+        self._guilds: Dict[int, Dict[int, AFKEntry]] = {}
+        self._notices: Dict[Tuple[int, int], float] = {}
+        self._load_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Carrega os status salvos em segundo plano"""
+        if self._load_task is None:
+            self._load_task = asyncio.ensure_future(self._load())
+
+    async def _load(self):
+        try:
+            rows = await self.store.load_all()
+        except Exception as e:
+            logger.error("Falha ao carregar status AFK: %s", e)
+            return
+        for guild_id, user_id, reason, since in rows:
+            # Um /afk feito durante a carga prevalece sobre o valor salvo
+            self._guilds.setdefault(guild_id, {}).setdefault(user_id, AFKEntry(reason, since))
+        logger.info("Status AFK carregados: %s", len(rows))
+
+    async def stop(self):
+        if self._load_task is not None:
+            self._load_task.cancel()
+        await self.store.close()
+
+    def guild(self, guild_id: int) -> Optional[Dict[int, AFKEntry]]:
+        """Membros AFK do servidor, ou None se não houver nenhum (caminho rápido)"""
+        return self._guilds.get(guild_id)
+
+    async def set(self, guild_id: int, user_id: int, reason: str) -> AFKEntry:
+        entry = AFKEntry(reason, time.time())
+        self._guilds.setdefault(guild_id, {})[user_id] = entry
+        await self.store.set(guild_id, user_id, entry)
+        return entry
+
+    async def clear(self, guild_id: int, user_id: int) -> Optional[AFKEntry]:
+        """Remove o status AFK e retorna o que havia"""
+        members = self._guilds.get(guild_id)
+        if members is None:
+            return None
+        entry = members.pop(user_id, None)
+        if entry is None:
+            return None
+        if not members:
+            del self._guilds[guild_id]
+        await self.store.delete(guild_id, user_id)
+        return entry
+
+    def should_notify(self, channel_id: int, user_id: int) -> bool:
+        """Indica se um aviso sobre o membro pode ser enviado no canal agora"""
+        now = time.monotonic()
+        key = (channel_id, user_id)
+        last = self._notices.get(key)
+        if last is not None and now - last < self.notice_cooldown:
+            return False
+        if len(self._notices) >= 1024:
+            self._notices = {
+                notice: sent for notice, sent in self._notices.items() if now - sent < self.notice_cooldown
+            }
+        self._notices[key] = now
+        return True
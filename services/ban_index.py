@@ -0,0 +1,106 @@
+"""
+Índice de banimentos por servidor
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import disnake
+
+logger = logging.getLogger(__name__)
+
+
+class BanIndex:
+    """Responde em O(1) se um usuário está banido em um servidor
+
+    Cada servidor é carregado em segundo plano na primeira consulta e depois
+    mantido pelos eventos on_member_ban/on_member_unban. Enquanto não está
+    carregado, `lookup` usa o atalho de buscar apenas a entrada do usuário.
+    Usuários ausentes do índice são sempre confirmados na API.
+    """
+
+    def __init__(self):
+        self._bans: Dict[int, Dict[int, str]] = {}
+        self._loading: Dict[int, asyncio.Task] = {}
+        # Eventos recebidos durante o carregamento, aplicados ao final
+        self._pending_events: Dict[int, List[Tuple[int, Optional[str]]]] = {}
+
+    def is_loaded(self, guild_id: int) -> bool:
+        return guild_id in self._bans
+
+    def get(self, guild_id: int, user_id: int) -> Tuple[bool, Optional[str]]:
+        """Retorna (carregado, nome do usuário banido ou None)"""
+        bans = self._bans.get(guild_id)
+        if bans is None:
+            return False, None
+        return True, bans.get(user_id)
+
+    def add(self, guild_id: int, user_id: int, name: str):
+        bans = self._bans.get(guild_id)
+        if bans is not None:
+            bans[user_id] = name
+        elif guild_id in self._pending_events:
+            self._pending_events[guild_id].append((user_id, name))
+
+    def discard(self, guild_id: int, user_id: int):
+        bans = self._bans.get(guild_id)
+        if bans is not None:
+            bans.pop(user_id, None)
+        elif guild_id in self._pending_events:
+            self._pending_events[guild_id].append((user_id, None))
+
+    def forget(self, guild_id: int):
+        self._bans.pop(guild_id, None)
+        self._pending_events.pop(guild_id, None)
+        task = self._loading.pop(guild_id, None)
+        if task is not None:
+            task.cancel()
+
+    def ensure_loaded(self, guild: disnake.Guild):
+        """Agenda o carregamento da lista de banidos do servidor"""
+        if guild.id in self._bans or guild.id in self._loading:
+            return
+        self._pending_events[guild.id] = []
+        self._loading[guild.id] = asyncio.ensure_future(self._load(guild))
+
+    async def _load(self, guild: disnake.Guild):
+        bans: Dict[int, str] = {}
+        try:
+            async for entry in guild.bans(limit=None):
+                bans[entry.user.id] = entry.user.display_name
+        except disnake.HTTPException as e:
+            logger.warning("Falha ao carregar banimentos de %s: %s", guild.id, e)
+            self._pending_events.pop(guild.id, None)
+            return
+        finally:
+            self._loading.pop(guild.id, None)
+
+        for user_id, name in self._pending_events.pop(guild.id, []):
+            if name is None:
+                bans.pop(user_id, None)
+            else:
+                bans[user_id] = name
+        self._bans[guild.id] = bans
+
+    async def lookup(self, guild: disnake.Guild, user_id: int) -> Optional[str]:
+        """Retorna o nome do usuário se ele estiver banido, senão None
+
+        Um acerto no índice é respondido direto (se estiver desatualizado, o
+        unban recebe NotFound e o remove); uma ausência é confirmada na API,
+        já que um ban feito durante uma desconexão não gera evento.
+        """
+        loaded, name = self.get(guild.id, user_id)
+        if name is not None:
+            return name
+
+        if not loaded:
+            # Atalho: buscar só a entrada deste usuário e aquecer o índice
+            self.ensure_loaded(guild)
+        try:
+            entry = await guild.fetch_ban(disnake.Object(user_id))
+        except disnake.NotFound:
+            return None
+        name = entry.user.display_name
+        self.add(guild.id, user_id, name)
+        return name
@@ -0,0 +1,201 @@
+"""
+Execução de ações de moderação em massa
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import disnake
+
+from config import BotConfig
+
+logger = logging.getLogger(__name__)
+
+# IDs soltos, menções de usuário (<@123>, <@!123>) ou listas separadas por vírgula
+_SNOWFLAKE = re.compile(r"\d{15,20}")
+
+
+def parse_user_ids(text: Optional[str]) -> List[int]:
+    """Extrai IDs únicos de usuário de um texto, preservando a ordem"""
+    if not text:
+        return []
+    return list(dict.fromkeys(int(match) for match in _SNOWFLAKE.findall(text)))
+
+
+class TokenBucket:
+    """Limita o ritmo de chamadas de uma rota da API"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class BatchProgress:
+    """Andamento de um lote"""
+
+    __slots__ = ("total", "done", "succeeded", "failed", "started_at", "errors")
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
+        self.errors: Dict[str, int] = {}
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def finished(self) -> bool:
+        return self.done >= self.total
+
+
+class BatchRunner:
+    """Executa ações em paralelo, com concorrência limitada e um bucket por rota
+
+    Os buckets são compartilhados entre lotes simultâneos, então dois
+    moderadores banindo no mesmo servidor dividem o mesmo ritmo.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = BotConfig.MASS_ACTION_CONCURRENCY,
+        rate: float = BotConfig.MASS_ACTION_RATE,
+        progress_interval: float = BotConfig.MASS_ACTION_PROGRESS_INTERVAL
+    ):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.progress_interval = progress_interval
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, route: str) -> TokenBucket:
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            bucket = self._buckets[route] = TokenBucket(self.rate, self.rate)
+        return bucket
+
+    async def run(
+        self,
+        targets: Iterable[int],
+        action: Callable[[int], Awaitable[None]],
+        route: str,
+        on_progress: Optional[Callable[[BatchProgress], Awaitable[None]]] = None
+    ) -> BatchProgress:
+        """Aplica `action` a cada alvo e reporta o andamento periodicamente"""
+        targets = list(targets)
+        progress = BatchProgress(len(targets))
+        queue: "asyncio.Queue[int]" = asyncio.Queue()
+        for target in targets:
+            queue.put_nowait(target)
+
+        bucket = self.bucket(route)
+
+        async def worker():
+            while True:
+                try:
+                    target = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                await bucket.acquire()
+                try:
+                    await action(target)
+                    progress.succeeded += 1
+                except Exception as e:
+                    progress.failed += 1
+                    key = type(e).__name__
+                    progress.errors[key] = progress.errors.get(key, 0) + 1
+                    if not isinstance(e, disnake.HTTPException):
+                        logger.error("Erro em ação em massa (%s) para %s: %s", route, target, e)
+                finally:
+                    progress.done += 1
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.concurrency, len(targets)))]
+        reporter = asyncio.ensure_future(self._report(progress, on_progress)) if on_progress else None
+
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            if reporter is not None:
+                reporter.cancel()
+
+        if on_progress is not None:
+            await on_progress(progress)
+        return progress
+
+    async def _report(self, progress: BatchProgress, on_progress: Callable[[BatchProgress], Awaitable[None]]):
+        while not progress.finished:
+            await asyncio.sleep(self.progress_interval)
+            try:
+                await on_progress(progress)
+            except disnake.HTTPException as e:
+                logger.warning("Falha ao atualizar progresso: %s", e)
+
+
+async def resolve_members(guild: disnake.Guild, user_ids: Iterable[int]) -> Dict[int, disnake.Member]:
+    """Busca os membros entre os IDs, indo à API para os que não estão em cache
+
+    O cache de membros pode ser parcial (MEMBER_CACHE ou expiração), então
+    a ausência nele não prova que o usuário saiu do servidor.
+    """
+    members = await guild.get_or_fetch_members(list(dict.fromkeys(user_ids)))
+    return {member.id: member for member in members}
+
+
+def filter_protected(
+    guild: disnake.Guild,
+    moderator: disnake.Member,
+    user_ids: Iterable[int],
+    members: Dict[int, disnake.Member]
+) -> Tuple[List[int], int]:
+    """Remove alvos que o moderador ou o bot não podem punir
+
+    `members` são os alvos que estão no servidor (ver `resolve_members`).
+    Retorna (alvos permitidos, quantidade ignorada). Usuários que não estão
+    no servidor (apenas para banimento por ID) não têm cargo a comparar.
+    """
+    allowed: List[int] = []
+    skipped = 0
+    seen: Set[int] = set()
+    me = guild.me
+    is_owner = moderator.id == guild.owner_id
+
+    for user_id in user_ids:
+        if user_id in seen:
+            continue
+        seen.add(user_id)
+
+        if user_id in (moderator.id, me.id, guild.owner_id):
+            skipped += 1
+            continue
+
+        member = members.get(user_id)
+        if member is not None:
+            if member.top_role >= me.top_role or (not is_owner and member.top_role >= moderator.top_role):
+                skipped += 1
+                continue
+
+        allowed.append(user_id)
+
+    return allowed, skipped
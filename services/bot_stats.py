@@ -0,0 +1,66 @@
+"""
+Contadores incrementais de servidores e membros por shard
+"""
+
+from typing import Dict, List
+
+import disnake
+
+from services.cluster import STAT_FIELDS, ClusterStats
+
+
+class ShardStatsTracker:
+    """Mantém os totais de cada shard e os publica nos contadores do cluster
+
+    Cada shard é recontado uma única vez quando fica pronto (uma passada
+    pelos servidores dele, sem tocar no cache de usuários); depois disso os
+    eventos de entrada e saída de servidores e membros ajustam os contadores
+    em O(1). O total de membros vem de `guild.member_count`, então usuários
+    em vários servidores são contados uma vez por servidor.
+    """
+
+    def __init__(self, cluster_stats: ClusterStats):
+        self.cluster_stats = cluster_stats
+        self._shards: Dict[int, List[int]] = {}
+
+    def _shard(self, shard_id: int) -> List[int]:
+        counters = self._shards.get(shard_id)
+        if counters is None:
+            counters = self._shards[shard_id] = [0] * len(STAT_FIELDS)
+        return counters
+
+    def _add(self, shard_id: int, guilds: int, members: int):
+        counters = self._shard(shard_id)
+        counters[0] += guilds
+        counters[1] += members
+        self.cluster_stats.add("guilds", guilds)
+        self.cluster_stats.add("members", members)
+
+    def shard_ready(self, bot: disnake.Client, shard_id: int):
+        """Reconta os servidores de um shard após um IDENTIFY"""
+        guilds = 0
+        members = 0
+        for guild in bot.guilds:
+            if guild.shard_id == shard_id:
+                guilds += 1
+                members += guild.member_count or 0
+
+        old_guilds, old_members = self._shard(shard_id)
+        self._add(shard_id, guilds - old_guilds, members - old_members)
+
+    def guild_join(self, guild: disnake.Guild):
+        self._add(guild.shard_id, 1, guild.member_count or 0)
+
+    def guild_remove(self, guild: disnake.Guild):
+        self._add(guild.shard_id, -1, -(guild.member_count or 0))
+
+    def member_join(self, member: disnake.Member):
+        self._add(member.guild.shard_id, 0, 1)
+
+    def member_remove(self, guild: disnake.Guild):
+        # Recebe o servidor: a saída chega por on_raw_member_remove, sem o membro em cache
+        self._add(guild.shard_id, 0, -1)
+
+    def shard(self, shard_id: int) -> Dict[str, int]:
+        """Totais de um shard deste processo"""
+        return dict(zip(STAT_FIELDS, self._shard(shard_id)))
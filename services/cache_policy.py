@@ -0,0 +1,195 @@
+"""
+Política de cache de membros e estimativa de memória dos caches
+"""
+
+import asyncio
+import logging
+import sys
+from collections import OrderedDict
+from itertools import chain, islice
+from typing import Dict, Iterable, List, NamedTuple
+
+import disnake
+from disnake.ext import tasks
+
+from config import BotConfig
+
+logger = logging.getLogger(__name__)
+
+# Objetos medidos por cache; o total é extrapolado a partir da média
+FOOTPRINT_SAMPLE_SIZE = 64
+
+
+class CacheFootprint(NamedTuple):
+    """Tamanho aproximado de um cache"""
+
+    name: str
+    count: int
+    size: int
+
+
+def _approx_size(obj) -> int:
+    """Tamanho do objeto mais o dos atributos simples que ele guarda
+
+    Objetos referenciados (usuários de membros, canais de mensagens...) não
+    entram na conta, porque pertencem a outros caches.
+    """
+    size = sys.getsizeof(obj)
+    names: Iterable[str] = chain.from_iterable(getattr(cls, "__slots__", ()) for cls in type(obj).__mro__)
+    values = [getattr(obj, name, None) for name in names]
+    if hasattr(obj, "__dict__"):
+        values.extend(vars(obj).values())
+    for value in values:
+        if isinstance(value, (str, bytes, int, float, tuple, list, dict, set, frozenset)):
+            size += sys.getsizeof(value)
+    return size
+
+
+def _estimate(name: str, count: int, objects: Iterable) -> CacheFootprint:
+    # `objects` é consumido só até a amostra: nunca copiar o cache inteiro
+    sample = list(islice(objects, FOOTPRINT_SAMPLE_SIZE))
+    if not sample:
+        return CacheFootprint(name, count, 0)
+    average = sum(_approx_size(obj) for obj in sample) / len(sample)
+    return CacheFootprint(name, count, int(average * count))
+
+
+def cache_footprint(bot: disnake.Client) -> List[CacheFootprint]:
+    """Estima a memória ocupada por cada cache do disnake, por amostragem"""
+    state = bot._connection
+    guilds = bot.guilds
+
+    member_lists = [guild._members.values() for guild in guilds]
+    voice_states = [guild._voice_states.values() for guild in guilds]
+    channels = [guild._channels.values() for guild in guilds]
+    messages = bot.cached_messages
+
+    return [
+        _estimate("Servidores", len(guilds), guilds),
+        _estimate("Canais", sum(len(items) for items in channels), chain.from_iterable(channels)),
+        _estimate("Membros", sum(len(items) for items in member_lists), chain.from_iterable(member_lists)),
+        _estimate("Usuários", len(state._users), state._users.values()),
+        _estimate("Mensagens", len(messages), messages),
+        _estimate("Estados de voz", sum(len(items) for items in voice_states), chain.from_iterable(voice_states)),
+    ]
+
+
+class MemberCachePolicy:
+    """Mantém listas completas de membros só dos servidores usados recentemente
+
+    Cada interação ou mensagem marca o servidor como usado. Quando mais de
+    `max_guilds` servidores estão na fila LRU, a lista de membros do menos
+    recente é descartada (exceto o próprio bot) e o evento
+    `member_cache_evict` é disparado para que índices derivados se
+    descartem também. Comandos que precisam da lista completa chamam
+    `ensure_members`, que refaz o chunk do servidor sob demanda.
+    Servidores fora da fila só acumulam membros por eventos de entrada e
+    são limpos periodicamente. Com `max_guilds` 0 não há limite e nada é
+    descartado.
+    """
+
+    def __init__(
+        self,
+        bot: disnake.Client,
+        max_guilds: int = BotConfig.MEMBER_CACHE_MAX_GUILDS,
+        chunk_timeout: float = BotConfig.MEMBER_CHUNK_TIMEOUT,
+        sweep_interval: float = BotConfig.MEMBER_CACHE_SWEEP_INTERVAL
+    ):
+        self.bot = bot
+        self.max_guilds = max_guilds
+        self.chunk_timeout = chunk_timeout
+        self.evictions = 0
+        self._recent: "OrderedDict[int, None]" = OrderedDict()
+        self._chunking: Dict[int, asyncio.Task] = {}
+
+        self.sweep_task.change_interval(seconds=sweep_interval)
+
+    @property
+    def tracked(self) -> int:
+        """Servidores com lista de membros mantida pela política"""
+        return len(self._recent)
+
+    def install(self):
+        """Registra os listeners que marcam servidores como usados e inicia a limpeza"""
+        if self.max_guilds <= 0:
+            return
+        self.bot.add_listener(self._on_interaction, "on_interaction")
+        self.bot.add_listener(self._on_message, "on_message")
+        self.bot.add_listener(self._on_guild_remove, "on_guild_remove")
+        self.sweep_task.start()
+
+    def stop(self):
+        self.sweep_task.cancel()
+
+    async def _on_interaction(self, inter: disnake.Interaction):
+        if inter.guild is not None:
+            self.touch(inter.guild)
+
+    async def _on_message(self, message: disnake.Message):
+        if message.guild is not None:
+            self.touch(message.guild)
+
+    async def _on_guild_remove(self, guild: disnake.Guild):
+        self._recent.pop(guild.id, None)
+
+    def touch(self, guild: disnake.Guild):
+        """Marca o servidor como usado agora, descartando o menos recente se preciso"""
+        if self.max_guilds <= 0:
+            return
+        if guild.id in self._recent:
+            self._recent.move_to_end(guild.id)
+            return
+
+        self._recent[guild.id] = None
+        while len(self._recent) > self.max_guilds:
+            guild_id, _ = self._recent.popitem(last=False)
+            self._evict(guild_id)
+
+    @tasks.loop(seconds=600)
+    async def sweep_task(self):
+        """Descarta os membros acumulados em servidores fora da fila LRU"""
+        for guild in self.bot.guilds:
+            if guild.id not in self._recent and len(guild._members) > 1:
+                self._evict(guild.id)
+
+    @sweep_task.before_loop
+    async def before_sweep_task(self):
+        await self.bot.wait_until_ready()
+
+    def _evict(self, guild_id: int):
+        guild = self.bot.get_guild(guild_id)
+        if guild is None or guild_id in self._chunking:
+            return
+
+        me = guild.me
+        guild._members.clear()
+        if me is not None:
+            guild._add_member(me)
+        self.evictions += 1
+        self.bot.dispatch("member_cache_evict", guild)
+
+    async def ensure_members(self, guild: disnake.Guild):
+        """Garante a lista completa de membros do servidor antes de usá-la
+
+        Se o chunk não terminar em `chunk_timeout` segundos ele continua em
+        segundo plano e o comando segue com o cache parcial, para não perder
+        o prazo de resposta da interação.
+        """
+        self.touch(guild)
+        if guild.chunked or not self.bot.intents.members:
+            return
+
+        task = self._chunking.get(guild.id)
+        if task is None:
+            task = self._chunking[guild.id] = asyncio.create_task(guild.chunk(cache=True))
+            task.add_done_callback(lambda done: self._chunk_done(guild.id, done))
+
+        try:
+            await asyncio.wait_for(asyncio.shield(task), self.chunk_timeout)
+        except asyncio.TimeoutError:
+            logger.debug("Chunk de %s ainda em andamento; usando cache parcial", guild.id)
+
+    def _chunk_done(self, guild_id: int, task: asyncio.Task):
+        self._chunking.pop(guild_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Falha ao carregar membros de %s: %s", guild_id, task.exception())
@@ -0,0 +1,214 @@
+"""
+Modo cluster: vários processos, cada um com uma faixa de shards
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from array import array
+from typing import Dict, List, Sequence
+
+import disnake
+
+from config import BotConfig
+
+logger = logging.getLogger(__name__)
+
+# Contadores publicados por cada cluster; a posição é o índice no bloco do cluster
+STAT_FIELDS = ("guilds", "members")
+_FIELD_INDEX: Dict[str, int] = {name: index for index, name in enumerate(STAT_FIELDS)}
+
+
+class ClusterStats:
+    """Contadores globais em memória compartilhada
+
+    Cada cluster escreve apenas no seu próprio bloco do array, então não há
+    disputa de escrita e nenhuma trava é necessária; a leitura soma os
+    blocos de todos os clusters. Fora do modo cluster o array é local.
+    """
+
+    def __init__(self, values: Sequence[int], cluster_id: int = 0, cluster_count: int = 1):
+        self._values = values
+        self.cluster_id = cluster_id
+        self.cluster_count = cluster_count
+        self._offset = cluster_id * len(STAT_FIELDS)
+
+    @classmethod
+    def local(cls) -> "ClusterStats":
+        return cls(array("q", [0] * len(STAT_FIELDS)))
+
+    @staticmethod
+    def allocate(context, cluster_count: int):
+        """Cria o bloco compartilhado entregue a todos os processos"""
+        return context.RawArray("q", cluster_count * len(STAT_FIELDS))
+
+    def reset(self):
+        """Zera o bloco deste cluster (o array sobrevive ao reinício do processo)"""
+        for index in range(len(STAT_FIELDS)):
+            self._values[self._offset + index] = 0
+
+    def add(self, name: str, delta: int):
+        self._values[self._offset + _FIELD_INDEX[name]] += delta
+
+    def value(self, name: str) -> int:
+        """Valor publicado por este cluster"""
+        return self._values[self._offset + _FIELD_INDEX[name]]
+
+    def total(self, name: str) -> int:
+        index = _FIELD_INDEX[name]
+        width = len(STAT_FIELDS)
+        return sum(self._values[cluster * width + index] for cluster in range(self.cluster_count))
+
+
+def cluster_path(path: str, cluster_id: int) -> str:
+    """Caminho exclusivo de um cluster (o cluster 0 mantém o caminho original)"""
+    if cluster_id == 0:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}-cluster{cluster_id}{extension}"
+
+
+def shard_ranges(shard_count: int, cluster_count: int) -> List[List[int]]:
+    """Divide os shards em faixas contíguas, uma por cluster"""
+    cluster_count = max(1, min(cluster_count, shard_count))
+    per_cluster, extra = divmod(shard_count, cluster_count)
+    ranges = []
+    start = 0
+    for cluster_id in range(cluster_count):
+        size = per_cluster + (1 if cluster_id < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+async def fetch_recommended_shards(token: str) -> int:
+    """Consulta o número de shards recomendado pelo Discord"""
+    http = disnake.http.HTTPClient(loop=asyncio.get_running_loop())
+    try:
+        await http.static_login(token)
+        shards, _, _ = await http.get_bot_gateway()
+        return shards
+    finally:
+        await http.close()
+
+
+def _run_worker(cluster_id: int, shard_ids: List[int], shard_count: int, shared_stats, cluster_count: int):
+    """Ponto de entrada de cada processo do cluster"""
+    from main import BotBase
+    from services.log_pipeline import setup_logging
+
+    # O launcher já escreve em LOG_FILE; cada cluster tem o seu arquivo
+    root, extension = os.path.splitext(BotConfig.LOG_FILE)
+    setup_logging(log_file=f"{root}-cluster{cluster_id}{extension}")
+
+    stats = ClusterStats(shared_stats, cluster_id, cluster_count)
+    # Um processo reiniciado recomeça a contagem do zero; os totais do anterior ficaram no bloco
+    stats.reset()
+    bot = BotBase(shard_ids=shard_ids, shard_count=shard_count, cluster_stats=stats)
+    logger.info("Cluster %s iniciando com os shards %s", cluster_id, shard_ids)
+    bot.run(BotConfig.TOKEN)
+
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+class ClusterLauncher:
+    """Inicia um processo por faixa de shards e os reinicia se caírem
+
+    Um processo que sai com código 0 encerrou de propósito e não volta;
+    qualquer outro código é tratado como falha e o processo é reiniciado
+    com espera exponencial, zerada quando ele fica de pé por tempo suficiente.
+    """
+
+    def __init__(
+        self,
+        cluster_count: int = BotConfig.CLUSTER_COUNT,
+        shard_count: int = BotConfig.SHARD_COUNT,
+        restart_backoff_max: float = BotConfig.CLUSTER_RESTART_BACKOFF_MAX
+    ):
+        self.cluster_count = cluster_count or os.cpu_count() or 1
+        self.shard_count = shard_count
+        self.restart_backoff_max = restart_backoff_max
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: Dict[int, multiprocessing.process.BaseProcess] = {}
+        self._started_at: Dict[int, float] = {}
+        self._failures: Dict[int, int] = {}
+        self._restart_at: Dict[int, float] = {}
+        self._ranges: List[List[int]] = []
+        self._shared_stats = None
+
+    def _spawn(self, cluster_id: int):
+        process = self._context.Process(
+            target=_run_worker,
+            args=(cluster_id, self._ranges[cluster_id], self.shard_count, self._shared_stats, len(self._ranges)),
+            name=f"cluster-{cluster_id}",
+            daemon=False
+        )
+        process.start()
+        self._processes[cluster_id] = process
+        self._started_at[cluster_id] = time.monotonic()
+        logger.info("Cluster %s iniciado (PID %s, shards %s)", cluster_id, process.pid, self._ranges[cluster_id])
+
+    def _supervise(self):
+        now = time.monotonic()
+        for cluster_id, process in list(self._processes.items()):
+            if process.is_alive():
+                continue
+
+            restart_at = self._restart_at.get(cluster_id)
+            if restart_at is None:
+                if process.exitcode == 0:
+                    logger.info("Cluster %s encerrado normalmente", cluster_id)
+                    del self._processes[cluster_id]
+                    continue
+
+                uptime = now - self._started_at[cluster_id]
+                if uptime > self.restart_backoff_max:
+                    self._failures[cluster_id] = 0
+                failures = self._failures[cluster_id] = self._failures.get(cluster_id, 0) + 1
+                delay = min(2 ** (failures - 1), self.restart_backoff_max)
+                logger.warning(
+                    "Cluster %s caiu (código %s) após %.0fs; reiniciando em %.0fs",
+                    cluster_id, process.exitcode, uptime, delay
+                )
+                self._restart_at[cluster_id] = now + delay
+            elif now >= restart_at:
+                del self._restart_at[cluster_id]
+                self._spawn(cluster_id)
+
+    def _shutdown(self, timeout: float = 30.0):
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in self._processes.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+
+    def run(self):
+        """Calcula os shards, inicia os clusters e supervisiona até ser interrompido"""
+        if not self.shard_count:
+            self.shard_count = asyncio.run(fetch_recommended_shards(BotConfig.TOKEN))
+
+        self._ranges = shard_ranges(self.shard_count, self.cluster_count)
+        self._shared_stats = ClusterStats.allocate(self._context, len(self._ranges))
+        logger.info("Iniciando %s clusters para %s shards", len(self._ranges), self.shard_count)
+
+        for cluster_id in range(len(self._ranges)):
+            self._spawn(cluster_id)
+
+        # SIGTERM no launcher encerra os clusters com ele, em vez de deixá-los órfãos
+        signal.signal(signal.SIGTERM, _raise_interrupt)
+        try:
+            while self._processes:
+                self._supervise()
+                time.sleep(1)
+        except KeyboardInterrupt:
+            logger.info("Encerrando clusters...")
+        finally:
+            self._shutdown()
@@ -0,0 +1,181 @@
+"""
+Sincronização incremental dos comandos de aplicação
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import disnake
+
+from config import BotConfig
+
+logger = logging.getLogger(__name__)
+
+
+class CommandSyncResult(NamedTuple):
+    """Resumo de uma sincronização"""
+
+    created: List[str]
+    edited: List[str]
+    deleted: List[str]
+    total: int
+    full: bool
+    elapsed: float
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.full or self.created or self.edited or self.deleted)
+
+    def summary(self) -> str:
+        if not self.changed:
+            return f"nenhuma mudança em {self.total} comandos, sincronização ignorada ({self.elapsed * 1000:.1f} ms)"
+        if self.full:
+            return f"sincronização completa de {self.total} comandos ({self.elapsed * 1000:.1f} ms)"
+
+        parts = []
+        for label, names in (("criados", self.created), ("editados", self.edited), ("removidos", self.deleted)):
+            if names:
+                parts.append(f"{label}: {', '.join(names)}")
+        parts.append(f"{self.total - len(self.created) - len(self.edited)} inalterados")
+        return f"{'; '.join(parts)} ({self.elapsed * 1000:.1f} ms)"
+
+
+def _command_key(body: disnake.ApplicationCommand) -> str:
+    # Comandos de barra, de usuário e de mensagem podem ter o mesmo nome
+    return f"{body.type.value}:{body.name}"
+
+
+def _canonical(payload: Any) -> Any:
+    # channel_types vem de um set no disnake e muda de ordem entre processos
+    if isinstance(payload, dict):
+        return {
+            key: sorted(value) if key == "channel_types" and value else _canonical(value)
+            for key, value in payload.items()
+        }
+    if isinstance(payload, list):
+        return [_canonical(item) for item in payload]
+    return payload
+
+
+def schema_hash(payload: Any) -> str:
+    """Hash estável de um payload de comando (independe da ordem das chaves)"""
+    encoded = json.dumps(_canonical(payload), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class CommandSync:
+    """Envia ao Discord apenas os comandos globais que mudaram desde o último boot
+
+    O hash do schema de cada comando e o ID devolvido pelo Discord ficam em
+    um arquivo local. Sem mudanças, nenhuma requisição é feita; com mudanças,
+    cada comando é criado, editado ou removido individualmente. Sem estado
+    salvo (ou se ele não bate com a aplicação), o conjunto inteiro é
+    sobrescrito de uma vez. Comandos restritos a servidores (guild_ids)
+    não são gerenciados aqui.
+    """
+
+    def __init__(self, bot: disnake.Client, path: str = BotConfig.COMMAND_STATE_PATH):
+        self.bot = bot
+        self.path = path
+        self.result: Optional[CommandSyncResult] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Agenda a sincronização para a primeira conexão"""
+        if self._task is None:
+            self._task = self.bot.loop.create_task(self._run())
+
+    async def _run(self):
+        await self.bot.wait_until_first_connect()
+        try:
+            self.result = await self.sync()
+        except disnake.HTTPException as e:
+            logger.error("Falha ao sincronizar comandos: %s", e)
+            return
+        logger.info("🔄 Comandos: %s", self.result.summary())
+
+    def _local_commands(self) -> Dict[str, disnake.ApplicationCommand]:
+        return {
+            _command_key(command.body): command.body
+            for command in self.bot.application_commands
+            if not command.guild_ids
+        }
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state: Dict[str, Any]):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(state, file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    async def sync(self) -> CommandSyncResult:
+        """Compara os hashes locais com o estado salvo e aplica as diferenças"""
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+
+        local = self._local_commands()
+        hashes = {key: schema_hash(body.to_dict()) for key, body in local.items()}
+
+        state = await loop.run_in_executor(None, self._load_state)
+        saved: Dict[str, Dict[str, Any]] = state.get("commands", {})
+
+        if state.get("application_id") != self.bot.application_id:
+            # Sem estado ou de outra aplicação: os IDs salvos não valem
+            ids = await self._overwrite(local)
+            full = True
+            created, edited, deleted = [], [], []
+        else:
+            full = False
+            created = [key for key in local if key not in saved]
+            edited = [key for key in local if key in saved and saved[key]["hash"] != hashes[key]]
+            deleted = [key for key in saved if key not in local]
+            ids = {key: entry["id"] for key, entry in saved.items() if key in local}
+
+            try:
+                for key in created:
+                    command = await self.bot.create_global_command(local[key])
+                    ids[key] = command.id
+                for key in edited:
+                    await self.bot.edit_global_command(saved[key]["id"], local[key])
+                for key in deleted:
+                    await self.bot.delete_global_command(saved[key]["id"])
+            except disnake.NotFound:
+                # Alguém mexeu nos comandos por fora; volta para um estado conhecido
+                logger.warning("Estado de comandos desatualizado; sobrescrevendo todos")
+                ids = await self._overwrite(local)
+                full = True
+                created, edited, deleted = [], [], []
+
+        if full or created or edited or deleted:
+            new_state = {
+                "application_id": self.bot.application_id,
+                "commands": {key: {"hash": hashes[key], "id": ids[key]} for key in local}
+            }
+            await loop.run_in_executor(None, self._save_state, new_state)
+
+        return CommandSyncResult(
+            created=[key.split(":", 1)[1] for key in created],
+            edited=[key.split(":", 1)[1] for key in edited],
+            deleted=[key.split(":", 1)[1] for key in deleted],
+            total=len(local),
+            full=full,
+            elapsed=time.perf_counter() - started
+        )
+
+    async def _overwrite(self, local: Dict[str, disnake.ApplicationCommand]) -> Dict[str, int]:
+        commands = await self.bot.bulk_overwrite_global_commands(list(local.values()))
+        return {f"{command.type.value}:{command.name}": command.id for command in commands}
@@ -0,0 +1,186 @@
+"""
+Fila de entrega de DMs com workers concorrentes e fallback no canal
+"""
+
+import asyncio
+import enum
+import json
+import logging
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import disnake
+
+from config import BotConfig
+
+logger = logging.getLogger(__name__)
+
+# Código da API para "Cannot send messages to this user"
+DM_CLOSED_ERROR = 50007
+
+DedupeKey = Tuple[int, str]
+
+
+def _embed_key(embed: disnake.Embed) -> str:
+    """Chave de deduplicação padrão: o conteúdo do embed, sem o horário"""
+    data = embed.to_dict()
+    data.pop("timestamp", None)
+    return json.dumps(data, sort_keys=True)
+
+
+class DMStatus(enum.Enum):
+    """Resultado da entrega de uma DM"""
+
+    SENT = "sent"
+    FALLBACK = "fallback"
+    FAILED = "failed"
+
+
+class _DMJob(NamedTuple):
+    user_id: int
+    embed: disnake.Embed
+    fallback_channel_id: Optional[int]
+    # A ação que motivou a DM (kick/ban) pode ter tirado o servidor em
+    # comum; uma recusa aí não indica DMs fechadas
+    removal: bool
+    key: DedupeKey
+    future: asyncio.Future
+
+
+class DMOutbox:
+    """Entrega DMs em segundo plano, fora do caminho dos comandos
+
+    Cada DM entra em uma fila consumida por `workers` tarefas, então um
+    envio lento ou com falha nunca atrasa quem o pediu. Um aviso idêntico
+    para o mesmo usuário que ainda está na fila não é enfileirado de novo.
+    Usuários com DMs fechadas ficam em cache por `closed_ttl` segundos e
+    vão direto para o fallback: uma menção no canal informado, se houver.
+    """
+
+    def __init__(
+        self,
+        bot: disnake.Client,
+        workers: int = BotConfig.DM_WORKERS,
+        closed_ttl: float = BotConfig.DM_CLOSED_TTL,
+        drain_timeout: float = 10.0
+    ):
+        self.bot = bot
+        self.workers = workers
+        self.closed_ttl = closed_ttl
+        self.drain_timeout = drain_timeout
+        self.stats: Dict[DMStatus, int] = {status: 0 for status in DMStatus}
+        self._closed: Dict[int, float] = {}
+        self._pending: Dict[DedupeKey, asyncio.Future] = {}
+        self._queue: Optional["asyncio.Queue[_DMJob]"] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """Inicia os workers de entrega"""
+        if self._tasks:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Entrega o que ainda está na fila (até `drain_timeout`) e encerra os workers"""
+        if self._queue is not None and self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=self.drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("DMs não entregues no encerramento: %s", self._queue.qsize())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def dms_closed(self, user_id: int) -> bool:
+        """Indica se o usuário recusou DMs recentemente"""
+        closed_at = self._closed.get(user_id)
+        if closed_at is None:
+            return False
+        if time.monotonic() - closed_at >= self.closed_ttl:
+            del self._closed[user_id]
+            return False
+        return True
+
+    def _mark_closed(self, user_id: int):
+        now = time.monotonic()
+        if len(self._closed) >= 10000:
+            self._closed = {
+                user: closed_at for user, closed_at in self._closed.items() if now - closed_at < self.closed_ttl
+            }
+        self._closed[user_id] = now
+
+    def send(
+        self,
+        user_id: int,
+        embed: disnake.Embed,
+        fallback_channel_id: Optional[int] = None,
+        dedupe_key: Optional[str] = None,
+        removal: bool = False
+    ) -> asyncio.Future:
+        """Enfileira uma DM e retorna um future com o DMStatus da entrega
+
+        Não é preciso aguardar o future; ele existe para quem precisa saber
+        o resultado (ex: lembretes, que só saem do disco após a entrega, e
+        kick/ban, que esperam a DM por um tempo limitado antes de agir).
+        Com `removal`, uma recusa não marca o usuário como DMs fechadas.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+
+        key = (user_id, dedupe_key if dedupe_key is not None else _embed_key(embed))
+        future = self._pending.get(key)
+        if future is not None:
+            return future
+
+        future = asyncio.get_event_loop().create_future()
+        self._pending[key] = future
+        self._queue.put_nowait(_DMJob(user_id, embed, fallback_channel_id, removal, key, future))
+        return future
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                status = await self._deliver(job)
+            except Exception as e:
+                logger.error("Erro ao entregar DM para %s: %s", job.user_id, e)
+                status = DMStatus.FAILED
+            finally:
+                self._pending.pop(job.key, None)
+                self._queue.task_done()
+            self.stats[status] += 1
+            if not job.future.done():
+                job.future.set_result(status)
+
+    async def _deliver(self, job: _DMJob) -> DMStatus:
+        if not self.dms_closed(job.user_id):
+            try:
+                # create_dm reaproveita o canal em cache e não precisa do usuário em cache
+                channel = await self.bot.create_dm(disnake.Object(job.user_id))
+                await channel.send(embed=job.embed)
+                return DMStatus.SENT
+            except disnake.Forbidden as e:
+                if e.code == DM_CLOSED_ERROR and not job.removal:
+                    self._mark_closed(job.user_id)
+            except disnake.HTTPException as e:
+                logger.warning("Falha ao enviar DM para %s: %s", job.user_id, e)
+
+        return await self._fallback(job)
+
+    async def _fallback(self, job: _DMJob) -> DMStatus:
+        channel = self.bot.get_channel(job.fallback_channel_id) if job.fallback_channel_id else None
+        if channel is None:
+            return DMStatus.FAILED
+
+        try:
+            await channel.send(
+                f"<@{job.user_id}>",
+                embed=job.embed,
+                allowed_mentions=disnake.AllowedMentions(everyone=False, users=True, roles=False)
+            )
+            return DMStatus.FALLBACK
+        except disnake.HTTPException:
+            return DMStatus.FAILED
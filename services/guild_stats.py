@@ -0,0 +1,111 @@
+"""
+Índice incremental de estatísticas de membros por servidor
+"""
+
+from array import array
+from typing import Dict, Optional
+
+import disnake
+
+# Posição de cada status no contador; streaming e invisible não chegam via gateway
+STATUS_INDEX: Dict[disnake.Status, int] = {
+    disnake.Status.online: 0,
+    disnake.Status.idle: 1,
+    disnake.Status.dnd: 2,
+    disnake.Status.offline: 3
+}
+OFFLINE_INDEX = STATUS_INDEX[disnake.Status.offline]
+
+
+def _status_index(member: disnake.Member) -> int:
+    return STATUS_INDEX.get(member.status, OFFLINE_INDEX)
+
+
+class GuildStats:
+    """Contadores de membros de um servidor"""
+
+    __slots__ = ("bots", "pending", "statuses")
+
+    def __init__(self):
+        self.bots = 0
+        self.pending = 0
+        # Com sinal: um evento de membro que o índice nunca contou não estoura o contador
+        self.statuses = array("q", [0] * len(STATUS_INDEX))
+
+    @property
+    def online(self) -> int:
+        """Membros que não estão offline"""
+        return sum(self.statuses) - self.statuses[OFFLINE_INDEX]
+
+    def status_count(self, status: disnake.Status) -> int:
+        return self.statuses[STATUS_INDEX[status]]
+
+    def add(self, member: disnake.Member):
+        self.bots += member.bot
+        self.pending += member.pending
+        self.statuses[_status_index(member)] += 1
+
+    def remove(self, member: disnake.Member):
+        self.bots = max(0, self.bots - member.bot)
+        self.pending = max(0, self.pending - member.pending)
+        self.decrement(_status_index(member))
+
+    def decrement(self, index: int):
+        # O índice pode ser parcial (cache de membros limitado): nunca abaixo de zero
+        if self.statuses[index] > 0:
+            self.statuses[index] -= 1
+
+
+class GuildStatsIndex:
+    """Mantém as estatísticas de cada servidor atualizadas a partir dos eventos
+
+    Cada servidor é indexado com uma única passada pelos membros na primeira
+    consulta; depois disso os eventos de entrada, saída, presença e
+    atualização de membros ajustam os contadores em O(1).
+    O total vem de `guild.member_count`, que o próprio disnake mantém.
+    """
+
+    def __init__(self):
+        self._guilds: Dict[int, GuildStats] = {}
+
+    def get(self, guild: disnake.Guild) -> GuildStats:
+        """Retorna as estatísticas do servidor, indexando-o se necessário"""
+        stats = self._guilds.get(guild.id)
+        if stats is None:
+            stats = GuildStats()
+            for member in guild.members:
+                stats.add(member)
+            self._guilds[guild.id] = stats
+        return stats
+
+    def _indexed(self, guild: disnake.Guild) -> Optional[GuildStats]:
+        # Servidores ainda não consultados são indexados sob demanda em get()
+        return self._guilds.get(guild.id)
+
+    def forget(self, guild: disnake.Guild):
+        self._guilds.pop(guild.id, None)
+
+    def member_join(self, member: disnake.Member):
+        stats = self._indexed(member.guild)
+        if stats is not None:
+            stats.add(member)
+
+    def member_remove(self, member: disnake.Member):
+        stats = self._indexed(member.guild)
+        if stats is not None:
+            stats.remove(member)
+
+    def member_update(self, before: disnake.Member, after: disnake.Member):
+        """Atualiza os contadores quando status ou triagem do membro mudam"""
+        stats = self._indexed(after.guild)
+        if stats is None:
+            return
+
+        if before.pending != after.pending:
+            stats.pending = max(0, stats.pending + after.pending - before.pending)
+
+        old_index = _status_index(before)
+        new_index = _status_index(after)
+        if old_index != new_index:
+            stats.decrement(old_index)
+            stats.statuses[new_index] += 1
@@ -0,0 +1,246 @@
+"""
+Análise dos intents necessários e medição dos eventos do gateway
+"""
+
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Set, Tuple
+
+import disnake
+
+logger = logging.getLogger(__name__)
+
+# Intents sempre mantidos: sem `guilds` o cache de servidores e canais não funciona
+BASE_INTENTS: Tuple[str, ...] = ("guilds",)
+
+# Intent que entrega cada evento do disnake (nome do listener sem "on_")
+EVENT_INTENTS: Dict[str, str] = {
+    "member_join": "members",
+    "member_remove": "members",
+    "member_update": "members",
+    "raw_member_remove": "members",
+    "raw_member_update": "members",
+    "member_ban": "moderation",
+    "member_unban": "moderation",
+    "audit_log_entry_create": "moderation",
+    "presence_update": "presences",
+    "voice_state_update": "voice_states",
+    "message": "messages",
+    "message_edit": "messages",
+    "message_delete": "messages",
+    "bulk_message_delete": "messages",
+    "raw_message_edit": "messages",
+    "raw_message_delete": "messages",
+    "raw_bulk_message_delete": "messages",
+    "reaction_add": "reactions",
+    "reaction_remove": "reactions",
+    "reaction_clear": "reactions",
+    "reaction_clear_emoji": "reactions",
+    "raw_reaction_add": "reactions",
+    "raw_reaction_remove": "reactions",
+    "raw_reaction_clear": "reactions",
+    "raw_reaction_clear_emoji": "reactions",
+    "typing": "typing",
+    "raw_typing": "typing",
+    "guild_emojis_update": "emojis_and_stickers",
+    "guild_stickers_update": "emojis_and_stickers",
+    "invite_create": "invites",
+    "invite_delete": "invites",
+    "webhooks_update": "webhooks",
+    "guild_scheduled_event_create": "guild_scheduled_events",
+    "guild_scheduled_event_update": "guild_scheduled_events",
+    "guild_scheduled_event_delete": "guild_scheduled_events",
+    "guild_scheduled_event_subscribe": "guild_scheduled_events",
+    "guild_scheduled_event_unsubscribe": "guild_scheduled_events",
+    "automod_action_execution": "automod_execution",
+    "automod_rule_create": "automod_configuration",
+    "automod_rule_update": "automod_configuration",
+    "automod_rule_delete": "automod_configuration",
+}
+
+# Intent que controla cada evento bruto do gateway
+GATEWAY_EVENT_INTENTS: Dict[str, str] = {
+    "GUILD_MEMBER_ADD": "members",
+    "GUILD_MEMBER_REMOVE": "members",
+    "GUILD_MEMBER_UPDATE": "members",
+    "GUILD_BAN_ADD": "moderation",
+    "GUILD_BAN_REMOVE": "moderation",
+    "GUILD_AUDIT_LOG_ENTRY_CREATE": "moderation",
+    "PRESENCE_UPDATE": "presences",
+    "VOICE_STATE_UPDATE": "voice_states",
+    "MESSAGE_CREATE": "messages",
+    "MESSAGE_UPDATE": "messages",
+    "MESSAGE_DELETE": "messages",
+    "MESSAGE_DELETE_BULK": "messages",
+    "MESSAGE_REACTION_ADD": "reactions",
+    "MESSAGE_REACTION_REMOVE": "reactions",
+    "MESSAGE_REACTION_REMOVE_ALL": "reactions",
+    "MESSAGE_REACTION_REMOVE_EMOJI": "reactions",
+    "TYPING_START": "typing",
+    "GUILD_EMOJIS_UPDATE": "emojis_and_stickers",
+    "GUILD_STICKERS_UPDATE": "emojis_and_stickers",
+    "INVITE_CREATE": "invites",
+    "INVITE_DELETE": "invites",
+    "WEBHOOKS_UPDATE": "webhooks",
+    "INTEGRATION_CREATE": "integrations",
+    "INTEGRATION_UPDATE": "integrations",
+    "INTEGRATION_DELETE": "integrations",
+    "GUILD_INTEGRATIONS_UPDATE": "integrations",
+    "GUILD_SCHEDULED_EVENT_CREATE": "guild_scheduled_events",
+    "GUILD_SCHEDULED_EVENT_UPDATE": "guild_scheduled_events",
+    "GUILD_SCHEDULED_EVENT_DELETE": "guild_scheduled_events",
+    "GUILD_SCHEDULED_EVENT_USER_ADD": "guild_scheduled_events",
+    "GUILD_SCHEDULED_EVENT_USER_REMOVE": "guild_scheduled_events",
+    "AUTO_MODERATION_ACTION_EXECUTION": "automod_execution",
+    "AUTO_MODERATION_RULE_CREATE": "automod_configuration",
+    "AUTO_MODERATION_RULE_UPDATE": "automod_configuration",
+    "AUTO_MODERATION_RULE_DELETE": "automod_configuration",
+}
+
+
+def _intents(names: Iterable[str]) -> disnake.Intents:
+    intents = disnake.Intents.none()
+    for name in names:
+        setattr(intents, name, True)
+    return intents
+
+
+def _enabled(intents: disnake.Intents, name: str) -> bool:
+    # Intents agrupados (messages, reactions...) contam se qualquer parte estiver ativa
+    return bool(intents.value & _intents([name]).value)
+
+
+class IntentAnalysis(NamedTuple):
+    """Resultado da análise de intents"""
+
+    required: disnake.Intents
+    sources: Dict[str, List[str]]
+    unused: List[str]
+    missing: List[str]
+
+    def report(self) -> List[str]:
+        lines = ["🔎 Intents:"]
+        for name, events in sorted(self.sources.items()):
+            lines.append(f"  • {name:<22} {', '.join(sorted(events))}")
+        if self.unused:
+            lines.append(f"  Desnecessários: {', '.join(self.unused)}")
+        for name in self.missing:
+            events = ", ".join(sorted(self.sources[name]))
+            lines.append(f"  ⚠️ {name} está desativado; estes listeners nunca disparam: {events}")
+        return lines
+
+
+def _listener_names(bot: disnake.Client) -> Set[str]:
+    names = set(bot.extra_events)
+    # Métodos on_* do próprio bot também são chamados pelo dispatch
+    names.update(name for name in dir(type(bot)) if name.startswith("on_"))
+    return {name[3:] for name in names}
+
+
+def analyze_intents(bot: disnake.Client) -> IntentAnalysis:
+    """Deduz os intents necessários a partir dos listeners registrados
+
+    Além dos listeners, cada cog pode declarar em `required_intents` os
+    intents que usa fora de eventos (ex: `message_content` para ler o
+    conteúdo de mensagens buscadas pela API).
+    """
+    sources: Dict[str, List[str]] = {name: ["(base)"] for name in BASE_INTENTS}
+    for event in _listener_names(bot):
+        name = EVENT_INTENTS.get(event)
+        if name is not None:
+            sources.setdefault(name, []).append(event)
+    for cog_name, cog in bot.cogs.items():
+        for name in getattr(cog, "required_intents", ()):
+            sources.setdefault(name, []).append(cog_name)
+
+    configured = bot.intents
+    required = _intents(sources)
+    known = set(EVENT_INTENTS.values()) | set(GATEWAY_EVENT_INTENTS.values()) | {"message_content"}
+    unused = sorted(
+        name for name in known
+        if _enabled(configured, name) and not _enabled(required, name)
+    )
+    missing = sorted(name for name in sources if not _enabled(configured, name))
+    return IntentAnalysis(required, sources, unused, missing)
+
+
+def apply_optimized(bot: disnake.Client, analysis: IntentAnalysis) -> disnake.Intents:
+    """Restringe os intents do bot aos necessários (nunca ativa um que estava desligado)
+
+    Precisa rodar antes da conexão: o IDENTIFY lê os intents do estado.
+    """
+    state = bot._connection
+    optimized = disnake.Intents._from_value(state._intents.value & analysis.required.value)
+    state._intents = optimized
+    if not optimized.members:
+        # Sem o intent de membros o Discord recusa pedidos de chunk
+        state._chunk_guilds = False
+    return optimized
+
+
+class _EventStats:
+    __slots__ = ("count", "parse_time")
+
+    def __init__(self):
+        self.count = 0
+        self.parse_time = 0.0
+
+
+class GatewayEventMeter:
+    """Conta os eventos do gateway e o tempo gasto nos parsers do disnake
+
+    Cada parser do estado de conexão é envolvido por uma medição; os
+    números não incluem a descompressão e o JSON, feitos antes do parser.
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self._events: Dict[str, _EventStats] = {}
+
+    def install(self, bot: disnake.Client):
+        """Instrumenta os parsers (o gateway usa o mesmo dicionário)"""
+        parsers = bot._connection.parsers
+        for event, parser in parsers.items():
+            parsers[event] = self._instrument(event, parser)
+
+    def _instrument(self, event: str, parser: Callable[[dict], None]) -> Callable[[dict], None]:
+        stats = self._events[event] = _EventStats()
+
+        def measured(data):
+            started = time.perf_counter()
+            try:
+                return parser(data)
+            finally:
+                stats.parse_time += time.perf_counter() - started
+                stats.count += 1
+
+        return measured
+
+    def report(self, disabled: Iterable[str] = ()) -> List[str]:
+        """Linhas com taxa e custo dos eventos e a fatia controlada por `disabled`"""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        events = [(event, stats) for event, stats in self._events.items() if stats.count]
+        events.sort(key=lambda item: item[1].parse_time, reverse=True)
+
+        total_count = sum(stats.count for _, stats in events)
+        total_time = sum(stats.parse_time for _, stats in events)
+        lines = [
+            f"📡 Gateway: {total_count} eventos ({total_count / elapsed * 60:.0f}/min), "
+            f"{total_time * 1000:.1f} ms nos parsers em {elapsed:.0f}s"
+        ]
+        for event, stats in events[:10]:
+            lines.append(
+                f"  • {event:<30} {stats.count:>8} ({stats.count / elapsed * 60:7.1f}/min) "
+                f"{stats.parse_time * 1000:8.1f} ms"
+            )
+
+        disabled = set(disabled)
+        if disabled and total_count:
+            dropped = [stats for event, stats in events if GATEWAY_EVENT_INTENTS.get(event) in disabled]
+            dropped_count = sum(stats.count for stats in dropped)
+            dropped_time = sum(stats.parse_time for stats in dropped)
+            lines.append(
+                f"  Sem {', '.join(sorted(disabled))}: -{dropped_count / total_count:.0%} eventos, "
+                f"-{dropped_time / total_time if total_time else 0:.0%} de CPU nos parsers"
+            )
+        return lines
@@ -0,0 +1,113 @@
+"""
+Pipeline de logs assíncrono
+
+Os handlers do logger raiz só enfileiram registros; formatação e escrita em
+disco/console acontecem em uma thread dedicada (QueueListener), fora do
+event loop.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Optional
+
+from config import BotConfig
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que não formata o registro na thread de quem loga
+
+    O QueueHandler padrão monta a mensagem e o traceback em `prepare()`,
+    ainda no event loop. Aqui o registro vai intacto para a fila e só é
+    formatado pelos handlers da thread de escrita. Os argumentos do log são
+    lidos depois, então não devem ser objetos que mudam logo em seguida.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JSONLinesFormatter(logging.Formatter):
+    """Uma linha JSON compacta por registro"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+
+def _file_handler(path: str) -> logging.Handler:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if BotConfig.LOG_ROTATE_WHEN:
+        return logging.handlers.TimedRotatingFileHandler(
+            path,
+            when=BotConfig.LOG_ROTATE_WHEN,
+            backupCount=BotConfig.LOG_BACKUP_COUNT,
+            encoding="utf-8"
+        )
+    return logging.handlers.RotatingFileHandler(
+        path,
+        maxBytes=BotConfig.LOG_MAX_BYTES,
+        backupCount=BotConfig.LOG_BACKUP_COUNT,
+        encoding="utf-8"
+    )
+
+
+def setup_logging(level: str = BotConfig.LOG_LEVEL, log_file: str = BotConfig.LOG_FILE, json_lines: bool = BotConfig.LOG_JSON):
+    """Configura o logger raiz e inicia a thread de escrita (idempotente)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    file_handler = _file_handler(log_file)
+    file_handler.setFormatter(JSONLinesFormatter() if json_lines else logging.Formatter(TEXT_FORMAT))
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(
+        log_queue,
+        file_handler,
+        console_handler,
+        respect_handler_level=True
+    )
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    # O nível fica no logger raiz: registros desativados nem chegam a ser criados
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+    root.addHandler(DeferredQueueHandler(log_queue))
+
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Escreve o que restou na fila e para a thread de escrita"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    for handler in logging.getLogger().handlers[:]:
+        logging.getLogger().removeHandler(handler)
@@ -0,0 +1,272 @@
+"""
+Métricas por comando e exportação no formato texto do Prometheus
+"""
+
+import logging
+import time
+from array import array
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import disnake
+from disnake.ext import commands
+from disnake.webhook.async_ import async_context
+
+from config import BotConfig
+from services.startup import lazy_import
+
+# aiohttp.web só é necessário quando o endpoint é aberto
+web = lazy_import("aiohttp.web")
+
+logger = logging.getLogger(__name__)
+
+# Limites superiores (segundos) dos buckets de latência
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Rota usada tanto para defer quanto para a primeira resposta de uma interação
+_CALLBACK_PATHS = (
+    "/interactions/{interaction_id}/{interaction_token}/callback",
+    "/interactions/{webhook_id}/{webhook_token}/callback"
+)
+
+
+class Histogram:
+    """Histograma com buckets fixos"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # Um contador a mais para valores acima do último bucket (+Inf)
+        self.counts = array("Q", [0] * (len(buckets) + 1))
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class CommandTiming:
+    """Estado de uma execução de comando em andamento"""
+
+    __slots__ = ("command", "cog", "started", "depth", "responded")
+
+    def __init__(self, command: str, cog: str):
+        self.command = command
+        self.cog = cog
+        self.started = time.perf_counter()
+        self.depth = 1
+        self.responded = False
+
+
+# Comando em execução na task atual; tasks criadas a partir dele herdam o valor
+_current_command: ContextVar[Optional[CommandTiming]] = ContextVar("current_command", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+
+
+class CommandMetrics:
+    """Coleta latência, chamadas REST e erros de cada comando slash
+
+    Os hooks globais before/after_slash_command_invoke do bot marcam início e
+    fim de cada comando; as chamadas REST são contadas envolvendo
+    `bot.http.request` e o adaptador de webhooks usado pelas respostas de
+    interação. O comando atual é propagado por uma ContextVar.
+    """
+
+    def __init__(self):
+        self._active: Dict[int, CommandTiming] = {}
+        self._durations: Dict[Tuple[str, str], Histogram] = {}
+        self._responses: Dict[Tuple[str, str], Histogram] = {}
+        self._invocations: Dict[Tuple[str, str, str], int] = {}
+        self._errors: Dict[Tuple[str, str, str], int] = {}
+        self._rest_durations: Dict[Tuple[str, str], Histogram] = {}
+        self._rest_requests: Dict[Tuple[str, str, str], int] = {}
+
+    def install(self, bot: disnake.Client):
+        """Registra os hooks de comando e instrumenta as chamadas REST"""
+        bot.before_slash_command_invoke(self.before_invoke)
+        bot.after_slash_command_invoke(self.after_invoke)
+        bot.http.request = self._instrument(bot.http.request)
+        # As respostas de interação não passam por bot.http, e sim por este adaptador
+        adapter = async_context.get()
+        adapter.request = self._instrument(adapter.request)
+
+    async def before_invoke(self, inter: disnake.ApplicationCommandInteraction):
+        command = inter.application_command
+        timing = self._active.get(inter.id)
+        if timing is not None:
+            # Subcomandos disparam os hooks de novo; fica o nome mais específico
+            timing.depth += 1
+            timing.command = command.qualified_name
+            return
+
+        timing = CommandTiming(command.qualified_name, command.cog_name or "")
+        self._active[inter.id] = timing
+        _current_command.set(timing)
+
+    async def after_invoke(self, inter: disnake.ApplicationCommandInteraction):
+        timing = self._active.get(inter.id)
+        if timing is None:
+            return
+        timing.depth -= 1
+        if timing.depth > 0:
+            return
+
+        del self._active[inter.id]
+        key = (timing.command, timing.cog)
+        histogram = self._durations.get(key)
+        if histogram is None:
+            histogram = self._durations[key] = Histogram()
+        histogram.observe(time.perf_counter() - timing.started)
+
+        status_key = (timing.command, timing.cog, "error" if inter.command_failed else "ok")
+        self._invocations[status_key] = self._invocations.get(status_key, 0) + 1
+
+    def record_error(self, inter: disnake.ApplicationCommandInteraction, error: Exception):
+        """Conta um erro de comando, inclusive checks que barram a execução"""
+        command = inter.application_command
+        if isinstance(error, commands.CommandInvokeError):
+            error = error.original
+        key = (command.qualified_name, command.cog_name or "", type(error).__name__)
+        self._errors[key] = self._errors.get(key, 0) + 1
+
+    def _instrument(self, request):
+        async def instrumented(route, *args, **kwargs):
+            timing = _current_command.get()
+            started = time.perf_counter()
+            status = "ok"
+            try:
+                return await request(route, *args, **kwargs)
+            except disnake.HTTPException as e:
+                status = str(e.status)
+                raise
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                self._record_request(route, timing, time.perf_counter() - started, status)
+
+        return instrumented
+
+    def _record_request(self, route, timing: Optional[CommandTiming], elapsed: float, status: str):
+        route_name = f"{route.method} {route.path}"
+        command = timing.command if timing is not None else ""
+
+        key = (route_name, command)
+        histogram = self._rest_durations.get(key)
+        if histogram is None:
+            histogram = self._rest_durations[key] = Histogram()
+        histogram.observe(elapsed)
+
+        count_key = (route_name, command, status)
+        self._rest_requests[count_key] = self._rest_requests.get(count_key, 0) + 1
+
+        if timing is not None and not timing.responded and route.path in _CALLBACK_PATHS:
+            # Primeiro ack da interação (defer ou resposta), medido a partir do início do comando
+            timing.responded = True
+            response_key = (timing.command, timing.cog)
+            response = self._responses.get(response_key)
+            if response is None:
+                response = self._responses[response_key] = Histogram()
+            response.observe(time.perf_counter() - timing.started)
+
+    @staticmethod
+    def _render_histograms(lines: List[str], name: str, help_text: str,
+                           label_names: Sequence[str], histograms: Dict[tuple, Histogram]):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for key, histogram in histograms.items():
+            labels = _labels(label_names, key)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+    @staticmethod
+    def _render_counters(lines: List[str], name: str, help_text: str,
+                         label_names: Sequence[str], counters: Dict[tuple, int]):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for key, value in counters.items():
+            lines.append(f"{name}{{{_labels(label_names, key)}}} {value}")
+
+    def render(self) -> str:
+        """Exporta as métricas no formato texto do Prometheus"""
+        lines: List[str] = []
+        self._render_histograms(
+            lines, "bot_command_duration_seconds", "Tempo total de execução do comando.",
+            ("command", "cog"), self._durations
+        )
+        self._render_histograms(
+            lines, "bot_command_response_seconds", "Tempo até o primeiro ack da interação (defer ou resposta).",
+            ("command", "cog"), self._responses
+        )
+        self._render_counters(
+            lines, "bot_command_invocations_total", "Comandos executados, por resultado.",
+            ("command", "cog", "status"), self._invocations
+        )
+        self._render_counters(
+            lines, "bot_command_errors_total", "Erros de comando, por tipo (inclui checks e cooldowns).",
+            ("command", "cog", "error"), self._errors
+        )
+        self._render_histograms(
+            lines, "bot_rest_request_duration_seconds", "Duração das chamadas REST, por rota e comando.",
+            ("route", "command"), self._rest_durations
+        )
+        self._render_counters(
+            lines, "bot_rest_requests_total", "Chamadas REST, por rota, comando e status.",
+            ("route", "command", "status"), self._rest_requests
+        )
+        lines.append("")
+        return "\n".join(lines)
+
+
+class MetricsServer:
+    """Servidor HTTP local que expõe GET /metrics"""
+
+    def __init__(self, bot: disnake.Client, metrics: CommandMetrics,
+                 host: str = BotConfig.METRICS_HOST, port: int = BotConfig.METRICS_PORT):
+        self.bot = bot
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._runner: Optional["web.AppRunner"] = None
+
+    async def handle_metrics(self, request: "web.Request") -> "web.Response":
+        return web.Response(text=self.metrics.render(), content_type="text/plain", charset="utf-8")
+
+    def start(self):
+        """Agenda a abertura do servidor no event loop do bot"""
+        self.bot.loop.create_task(self._serve())
+
+    async def _serve(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle_metrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except OSError as e:
+            logger.error("Não foi possível abrir o endpoint de métricas em %s:%s: %s", self.host, self.port, e)
+            await runner.cleanup()
+            return
+        self._runner = runner
+        logger.info("Métricas disponíveis em http://%s:%s/metrics", self.host, self.port)
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,213 @@
+"""
+Registro de ações de moderação com gravação em lote e embed combinado no canal de logs
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import disnake
+from disnake.ext import tasks
+
+from config import BotConfig
+from services.storage import SQLiteStore
+from utils import EmbedUtils
+
+logger = logging.getLogger(__name__)
+
+# Rótulo de cada ação no canal de logs
+ACTION_LABELS: Dict[str, str] = {
+    "kick": "👢 Expulsão",
+    "ban": "🔨 Banimento",
+    "unban": "♻️ Desbanimento",
+    "timeout": "🔇 Timeout",
+    "untimeout": "🔊 Timeout removido",
+    "warn": "⚠️ Aviso",
+    "clear": "🧹 Limpeza",
+    "slowmode": "🐢 Slowmode",
+}
+
+# Menções de alvos listadas por linha antes de resumir em "+N"
+MAX_TARGETS_PER_LINE = 20
+# Margem abaixo do limite de 4096 caracteres da descrição
+MAX_DESCRIPTION_LENGTH = 3900
+
+
+class ModEvent(NamedTuple):
+    """Ação de moderação registrada"""
+
+    guild_id: int
+    action: str
+    moderator_id: int
+    target_id: Optional[int]
+    channel_id: Optional[int]
+    reason: str
+    details: str
+    created_at: float
+
+
+class ModLogStore(SQLiteStore):
+    """Armazena as ações de moderação em disco"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS mod_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER NOT NULL,
+            action TEXT NOT NULL,
+            moderator_id INTEGER NOT NULL,
+            target_id INTEGER,
+            channel_id INTEGER,
+            reason TEXT NOT NULL,
+            details TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_mod_events_guild ON mod_events (guild_id, created_at);
+    """
+
+    async def add_many(self, events: List[ModEvent]) -> None:
+        await self.executemany(
+            "INSERT INTO mod_events (guild_id, action, moderator_id, target_id, channel_id, reason, details, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            events
+        )
+
+
+def _group(events: List[ModEvent]) -> List[Tuple[ModEvent, List[int]]]:
+    """Agrupa eventos iguais exceto pelo alvo, na ordem em que ocorreram"""
+    groups: Dict[tuple, Tuple[ModEvent, List[int]]] = {}
+    for event in events:
+        key = (event.action, event.moderator_id, event.channel_id, event.reason, event.details)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = (event, [])
+        if event.target_id is not None:
+            group[1].append(event.target_id)
+    return list(groups.values())
+
+
+def build_log_embed(events: List[ModEvent]) -> disnake.Embed:
+    """Embed único com todas as ações de um intervalo de gravação
+
+    Ações repetidas (ex: um ban em massa) viram uma linha só com a lista
+    de alvos; o que não couber é resumido, já que tudo fica no store.
+    """
+    lines = []
+    for event, targets in _group(events):
+        label = ACTION_LABELS.get(event.action, event.action)
+        count = f" ×{len(targets)}" if len(targets) > 1 else ""
+        line = f"**{label}**{count} por <@{event.moderator_id}> <t:{int(event.created_at)}:T>"
+        if targets:
+            mentions = " ".join(f"<@{target}>" for target in targets[:MAX_TARGETS_PER_LINE])
+            if len(targets) > MAX_TARGETS_PER_LINE:
+                mentions += f" +{len(targets) - MAX_TARGETS_PER_LINE}"
+            line += f"\n{mentions}"
+        if event.channel_id is not None:
+            line += f"\nCanal: <#{event.channel_id}>"
+        if event.details:
+            line += f"\n{event.details}"
+        if event.reason:
+            line += f"\nMotivo: {event.reason}"
+        lines.append(line)
+
+    description = ""
+    for index, line in enumerate(lines):
+        candidate = f"{description}\n\n{line}" if description else line
+        if len(candidate) > MAX_DESCRIPTION_LENGTH:
+            description += f"\n\n… e mais {len(lines) - index} registros"
+            break
+        description = candidate
+
+    return EmbedUtils.create_embed(
+        title=f"🛡️ Moderação ({len(events)} {'ação' if len(events) == 1 else 'ações'})",
+        description=description,
+        color=BotConfig.WARNING_COLOR
+    )
+
+
+class ModerationLog:
+    """Recebe as ações de moderação e as publica em lote
+
+    `record` só guarda o evento em memória. A cada `flush_interval`
+    segundos os eventos são gravados no store em uma única transação e
+    cada servidor recebe uma mensagem com um embed combinado no canal
+    `channel_name`, em vez de uma mensagem por ação: durante um raid são
+    poucas chamadas REST, não centenas.
+    """
+
+    def __init__(
+        self,
+        bot: disnake.Client,
+        store: ModLogStore,
+        channel_name: str = BotConfig.LOG_CHANNEL,
+        flush_interval: float = BotConfig.MODLOG_FLUSH_INTERVAL
+    ):
+        self.bot = bot
+        self.store = store
+        self.channel_name = channel_name
+        self._pending: List[ModEvent] = []
+        self._unposted: Dict[int, List[ModEvent]] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+        self.flush_task.change_interval(seconds=flush_interval)
+
+    def start(self):
+        """Inicia a gravação periódica"""
+        if not self.flush_task.is_running():
+            self.flush_task.start()
+
+    async def stop(self):
+        """Grava e publica os eventos pendentes e fecha o store"""
+        self.flush_task.cancel()
+        await self.flush()
+        await self.store.close()
+
+    def record(
+        self,
+        guild_id: int,
+        action: str,
+        moderator_id: int,
+        target_id: Optional[int] = None,
+        reason: str = "",
+        channel_id: Optional[int] = None,
+        details: str = ""
+    ):
+        """Registra uma ação de moderação (sem I/O)"""
+        event = ModEvent(guild_id, action, moderator_id, target_id, channel_id, reason, details, time.time())
+        self._pending.append(event)
+        self._unposted.setdefault(guild_id, []).append(event)
+
+    def _log_channel(self, guild_id: int) -> Optional[disnake.TextChannel]:
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return None
+        return disnake.utils.get(guild.text_channels, name=self.channel_name)
+
+    async def flush(self):
+        """Grava os eventos pendentes e publica um embed por canal de logs"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._pending:
+                pending, self._pending = self._pending, []
+                try:
+                    await self.store.add_many(pending)
+                except Exception as e:
+                    logger.error("Falha ao gravar ações de moderação: %s", e)
+                    # Devolver à fila na ordem original
+                    self._pending = pending + self._pending
+
+            unposted, self._unposted = self._unposted, {}
+            for guild_id, events in unposted.items():
+                channel = self._log_channel(guild_id)
+                if channel is None:
+                    continue
+                try:
+                    await channel.send(embed=build_log_embed(events))
+                except disnake.HTTPException as e:
+                    logger.warning("Falha ao publicar log de moderação em %s: %s", guild_id, e)
+
+    @tasks.loop(seconds=5)
+    async def flush_task(self):
+        await self.flush()
@@ -0,0 +1,324 @@
+"""
+Estado e renderização de enquetes
+"""
+
+import asyncio
+import json
+import logging
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import disnake
+from disnake.ext import tasks
+
+from config import BotConfig
+from services.storage import SQLiteStore
+from utils import EmbedUtils
+
+logger = logging.getLogger(__name__)
+
+
+class PollState:
+    """Estado compacto de uma enquete
+
+    Guarda o voto atual de cada usuário e um contador por opção, então
+    votar ou trocar de voto é O(1) e o total nunca precisa ser recontado.
+    """
+
+    __slots__ = ("question", "options", "author_name", "counts", "voters", "total")
+
+    def __init__(self, question: str, options: Iterable[str], author_name: Optional[str] = None):
+        self.question = question
+        self.options = tuple(options)
+        self.author_name = author_name
+        self.counts = array("I", [0] * len(self.options))
+        self.voters: Dict[int, int] = {}
+        self.total = 0
+
+    @classmethod
+    def from_votes(cls, question: str, options: Iterable[str], author_name: Optional[str],
+                   votes: Iterable[Tuple[int, int]]) -> "PollState":
+        """Reconstrói o estado a partir dos pares (user_id, opção) salvos"""
+        state = cls(question, options, author_name)
+        voters = state.voters
+        counts = state.counts
+        for user_id, option in votes:
+            voters[user_id] = option
+            counts[option] += 1
+        state.total = len(voters)
+        return state
+
+    def vote(self, user_id: int, option: int) -> bool:
+        """Registra o voto do usuário; retorna False se nada mudou"""
+        previous = self.voters.get(user_id)
+        if previous == option:
+            return False
+
+        if previous is None:
+            self.total += 1
+        else:
+            self.counts[previous] -= 1
+
+        self.voters[user_id] = option
+        self.counts[option] += 1
+        return True
+
+    def build_embed(self) -> disnake.Embed:
+        """Cria o embed com a contagem atual"""
+        embed = EmbedUtils.create_embed(
+            title="📊 Enquete",
+            description=f"**{self.question}**\n\nClique em uma opção para votar!"
+        )
+
+        total_votes = self.total
+        bar_length = 10
+
+        for i, option in enumerate(self.options):
+            vote_count = self.counts[i]
+            percentage = (vote_count / total_votes * 100) if total_votes > 0 else 0
+
+            # Criar barra de progresso
+            filled_length = int(bar_length * percentage / 100)
+            bar = "█" * filled_length + "░" * (bar_length - filled_length)
+
+            embed.add_field(
+                name=f"{i+1}. {option}",
+                value=f"`{bar}` {vote_count} votos ({percentage:.1f}%)",
+                inline=False
+            )
+
+        if self.author_name:
+            embed.set_footer(text=f"Enquete criada por {self.author_name} • Total de votos: {total_votes}")
+        else:
+            embed.set_footer(text=f"Total de votos: {total_votes}")
+
+        return embed
+
+
+class PollRenderer:
+    """Agrupa as edições do embed de resultados de cada enquete
+
+    A primeira atualização depois de um período ocioso é enviada na hora;
+    as seguintes dentro da janela são combinadas em uma única edição com
+    a contagem mais recente.
+    """
+
+    def __init__(self, interval: float = BotConfig.POLL_RENDER_INTERVAL):
+        self.interval = interval
+        self._pending: Dict[int, asyncio.Task] = {}
+        self._last_flush: Dict[int, float] = {}
+
+    def request(self, message: disnake.Message, state: PollState):
+        """Agenda a atualização do embed (no máximo uma por janela)"""
+        if message.id in self._pending:
+            return
+
+        last = self._last_flush.get(message.id, 0.0)
+        delay = max(0.0, last + self.interval - time.monotonic())
+        self._pending[message.id] = asyncio.ensure_future(self._flush_later(message, state, delay))
+
+    async def _flush_later(self, message: disnake.Message, state: PollState, delay: float):
+        try:
+            if delay > 0:
+                await asyncio.sleep(delay)
+        finally:
+            # Votos que chegarem durante a edição agendam uma nova atualização
+            self._pending.pop(message.id, None)
+
+        now = time.monotonic()
+        self._last_flush[message.id] = now
+        self._prune(now)
+
+        try:
+            await message.edit(embed=state.build_embed())
+        except disnake.HTTPException as e:
+            logger.warning("Falha ao atualizar enquete %s: %s", message.id, e)
+
+    def _prune(self, now: float):
+        """Descarta marcações antigas que não limitam mais nenhuma edição"""
+        if len(self._last_flush) < 1024:
+            return
+        expired = [key for key, last in self._last_flush.items() if now - last >= self.interval]
+        for key in expired:
+            del self._last_flush[key]
+
+    async def close(self):
+        """Cancela as atualizações pendentes"""
+        for task in list(self._pending.values()):
+            task.cancel()
+        self._pending.clear()
+
+
+def poll_custom_id(poll_id: int, option: int) -> str:
+    """Monta o custom_id estável de um botão de enquete"""
+    return f"poll:{poll_id}:{option}"
+
+
+def parse_poll_custom_id(custom_id: str) -> Optional[Tuple[int, int]]:
+    """Extrai (poll_id, opção) de um custom_id; None se não for de enquete"""
+    if not custom_id.startswith("poll:"):
+        return None
+    try:
+        _, poll_id, option = custom_id.split(":")
+        return int(poll_id), int(option)
+    except ValueError:
+        return None
+
+
+class PollStore(SQLiteStore):
+    """Armazena enquetes e votos em disco"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS polls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER,
+            channel_id INTEGER,
+            question TEXT NOT NULL,
+            options TEXT NOT NULL,
+            author_name TEXT,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS poll_votes (
+            poll_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            option INTEGER NOT NULL,
+            PRIMARY KEY (poll_id, user_id)
+        ) WITHOUT ROWID;
+    """
+
+    async def create(self, guild_id: Optional[int], channel_id: Optional[int], question: str,
+                     options: List[str], author_name: Optional[str]) -> int:
+        """Salva uma nova enquete e retorna seu ID"""
+        return await self.execute(
+            "INSERT INTO polls (guild_id, channel_id, question, options, author_name, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (guild_id, channel_id, question, json.dumps(options), author_name, time.time())
+        )
+
+    async def load(self, poll_id: int) -> Optional[PollState]:
+        """Carrega uma enquete com todos os votos"""
+        row = await self.fetchone(
+            "SELECT question, options, author_name FROM polls WHERE id = ?",
+            (poll_id,)
+        )
+        if row is None:
+            return None
+
+        question, options, author_name = row
+        votes = await self.fetchall(
+            "SELECT user_id, option FROM poll_votes WHERE poll_id = ?",
+            (poll_id,)
+        )
+        return PollState.from_votes(question, json.loads(options), author_name, votes)
+
+    async def save_votes(self, votes: Iterable[Tuple[int, int, int]]) -> None:
+        """Grava (poll_id, user_id, opção) em uma única transação"""
+        await self.executemany(
+            "INSERT OR REPLACE INTO poll_votes (poll_id, user_id, option) VALUES (?, ?, ?)",
+            votes
+        )
+
+
+class PollManager:
+    """Roteia votos para o estado das enquetes persistentes
+
+    Mantém em memória apenas as enquetes usadas recentemente; os votos são
+    gravados em lote pela task de flush.
+    """
+
+    def __init__(
+        self,
+        store: PollStore,
+        cache_size: int = BotConfig.POLL_CACHE_SIZE,
+        flush_interval: float = BotConfig.POLL_FLUSH_INTERVAL
+    ):
+        self.store = store
+        self.cache_size = cache_size
+        self.renderer = PollRenderer()
+        self._states: "OrderedDict[int, PollState]" = OrderedDict()
+        self._pending_votes: Dict[Tuple[int, int], int] = {}
+        self._loading: Dict[int, asyncio.Future] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+        self.flush_task.change_interval(seconds=flush_interval)
+
+    def start(self):
+        """Inicia a gravação periódica dos votos"""
+        if not self.flush_task.is_running():
+            self.flush_task.start()
+
+    async def stop(self):
+        """Grava os votos pendentes e fecha o store"""
+        self.flush_task.cancel()
+        await self.renderer.close()
+        await self.flush()
+        await self.store.close()
+
+    async def create(self, guild_id: Optional[int], channel_id: Optional[int], question: str,
+                     options: List[str], author_name: Optional[str]) -> Tuple[int, PollState]:
+        """Cria e registra uma nova enquete"""
+        poll_id = await self.store.create(guild_id, channel_id, question, options, author_name)
+        state = PollState(question, options, author_name)
+        self._remember(poll_id, state)
+        return poll_id, state
+
+    async def get(self, poll_id: int) -> Optional[PollState]:
+        """Retorna o estado da enquete, carregando do disco se necessário"""
+        state = self._states.get(poll_id)
+        if state is not None:
+            self._states.move_to_end(poll_id)
+            return state
+
+        # Cliques simultâneos na mesma enquete compartilham a mesma leitura
+        future = self._loading.get(poll_id)
+        if future is None:
+            future = asyncio.ensure_future(self._load(poll_id))
+            self._loading[poll_id] = future
+            future.add_done_callback(lambda _: self._loading.pop(poll_id, None))
+        return await asyncio.shield(future)
+
+    async def _load(self, poll_id: int) -> Optional[PollState]:
+        # Garantir que o disco reflita os votos ainda não gravados
+        await self.flush()
+        state = await self.store.load(poll_id)
+        if state is not None:
+            self._remember(poll_id, state)
+        return state
+
+    def vote(self, poll_id: int, state: PollState, user_id: int, option: int) -> bool:
+        """Registra o voto em memória e agenda a gravação"""
+        if not state.vote(user_id, option):
+            return False
+        self._pending_votes[(poll_id, user_id)] = option
+        return True
+
+    def _remember(self, poll_id: int, state: PollState):
+        self._states[poll_id] = state
+        self._states.move_to_end(poll_id)
+        while len(self._states) > self.cache_size:
+            self._states.popitem(last=False)
+
+    async def flush(self):
+        """Grava todos os votos pendentes"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if not self._pending_votes:
+                return
+            pending, self._pending_votes = self._pending_votes, {}
+            try:
+                await self.store.save_votes(
+                    (poll_id, user_id, option) for (poll_id, user_id), option in pending.items()
+                )
+            except Exception as e:
+                logger.error("Falha ao gravar votos de enquetes: %s", e)
+                # Devolver os votos sem sobrescrever os que chegaram depois
+                pending.update(self._pending_votes)
+                self._pending_votes = pending
+
+    @tasks.loop(seconds=5)
+    async def flush_task(self):
+        await self.flush()
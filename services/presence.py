@@ -0,0 +1,155 @@
+"""
+Rotação de presença com detecção de mudanças e envio escalonado por shard
+"""
+
+import asyncio
+import logging
+import random
+import string
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import disnake
+from disnake.ext import tasks
+
+from config import BotConfig
+
+logger = logging.getLogger(__name__)
+
+# (tipo, texto) de uma atividade já renderizada; é o que se compara entre envios
+PresenceKey = Tuple[disnake.ActivityType, str]
+
+
+def _has_placeholders(text: str) -> bool:
+    return any(field for _, field, _, _ in string.Formatter().parse(text))
+
+
+class PresenceManager:
+    """Alterna a atividade do bot sem enviar atualizações repetidas
+
+    As atividades vêm de STATUS_ACTIVITIES, em sequência ou sorteadas; uma
+    entrada com "hours": (início, fim) só vale nesse intervalo de horas
+    (hora local, fim exclusivo, pode cruzar a meia-noite). O texto aceita
+    {guilds}, {members}, {shards} e {commands}, lidos dos contadores em
+    cache. Cada shard só recebe a atualização se a atividade renderizada
+    mudou desde o último envio para ele, e os envios são espaçados por
+    `shard_delay` segundos para não disparar todos os shards de uma vez.
+    """
+
+    def __init__(
+        self,
+        bot: disnake.Client,
+        activities: List[Dict[str, Any]] = BotConfig.STATUS_ACTIVITIES,
+        interval: float = BotConfig.STATUS_INTERVAL,
+        rotation: str = BotConfig.STATUS_ROTATION,
+        shard_delay: float = BotConfig.PRESENCE_SHARD_DELAY
+    ):
+        self.bot = bot
+        self.activities = activities
+        self.rotation = rotation
+        self.shard_delay = shard_delay
+        self.sent = 0
+        self.skipped = 0
+        self._index = -1
+        self._current: Optional[Dict[str, Any]] = None
+        self._last: Dict[int, PresenceKey] = {}
+
+        self.rotate_task.change_interval(seconds=interval)
+
+    @staticmethod
+    def initial_activity(activities: List[Dict[str, Any]] = BotConfig.STATUS_ACTIVITIES) -> Optional[disnake.Activity]:
+        """Atividade enviada no IDENTIFY (sem custo de atualização extra)
+
+        Usa a primeira entrada sem variáveis, já que os contadores ainda
+        estão zerados quando o bot conecta.
+        """
+        for entry in activities:
+            if not _has_placeholders(entry["name"]):
+                return disnake.Activity(type=entry["type"], name=entry["name"])
+        return None
+
+    def install(self):
+        """Registra o listener de reconexão e inicia a rotação"""
+        self.bot.add_listener(self._on_shard_connect, "on_shard_connect")
+        self.rotate_task.start()
+
+    def stop(self):
+        self.rotate_task.cancel()
+
+    async def _on_shard_connect(self, shard_id: int):
+        # Um novo IDENTIFY volta à atividade inicial; RESUME mantém a atual
+        activity = self.bot._connection._activity
+        if activity is None:
+            self._last.pop(shard_id, None)
+        else:
+            self._last[shard_id] = (disnake.ActivityType(activity["type"]), activity["name"])
+
+    def _candidates(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        hour = (now or datetime.now()).hour
+        candidates = []
+        for entry in self.activities:
+            hours = entry.get("hours")
+            if hours is not None:
+                start, end = hours
+                active = start <= hour < end if start <= end else hour >= start or hour < end
+                if not active:
+                    continue
+            candidates.append(entry)
+        return candidates or list(self.activities)
+
+    def _next_entry(self) -> Dict[str, Any]:
+        candidates = self._candidates()
+        if self.rotation == "random":
+            # Evita sortear a mesma entrada quando há alternativa
+            choices = [entry for entry in candidates if entry is not self._current] or candidates
+            return random.choice(choices)
+
+        self._index = (self._index + 1) % len(candidates)
+        return candidates[self._index]
+
+    def _variables(self) -> Dict[str, int]:
+        stats = self.bot.cluster_stats
+        return {
+            "guilds": stats.total("guilds"),
+            "members": stats.total("members"),
+            "shards": self.bot.shard_count or 1,
+            "commands": len(self.bot.slash_commands)
+        }
+
+    def render(self, entry: Dict[str, Any]) -> PresenceKey:
+        name = entry["name"]
+        if _has_placeholders(name):
+            name = name.format_map(self._variables())
+        return entry["type"], name
+
+    async def update(self, entry: Optional[Dict[str, Any]] = None):
+        """Envia a atividade (a próxima da rotação, se omitida) aos shards onde ela mudou"""
+        entry = entry or self._next_entry()
+        self._current = entry
+        key = self.render(entry)
+        activity = disnake.Activity(type=key[0], name=key[1])
+
+        pending = [shard_id for shard_id in sorted(self.bot.shards) if self._last.get(shard_id) != key]
+        self.skipped += len(self.bot.shards) - len(pending)
+        for position, shard_id in enumerate(pending):
+            if position and self.shard_delay:
+                await asyncio.sleep(self.shard_delay)
+            shard = self.bot.get_shard(shard_id)
+            if shard is None or shard.is_closed():
+                continue
+            try:
+                await self.bot.change_presence(activity=activity, shard_id=shard_id)
+            except (disnake.ConnectionClosed, ConnectionError) as e:
+                logger.warning("Falha ao atualizar presença do shard %s: %s", shard_id, e)
+                continue
+            self._last[shard_id] = key
+            self.sent += 1
+
+    @tasks.loop(seconds=300)
+    async def rotate_task(self):
+        """Avança a rotação de atividades"""
+        await self.update()
+
+    @rotate_task.before_loop
+    async def before_rotate_task(self):
+        await self.bot.wait_until_ready()
@@ -0,0 +1,247 @@
+"""
+Limpeza de mensagens em grande volume
+"""
+
+import logging
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Iterator, List, Optional, Pattern
+
+import disnake
+
+from config import BotConfig
+from services.batch_actions import TokenBucket
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+
+# O Discord só aceita bulk delete de mensagens com menos de 14 dias;
+# a margem evita rejeições de mensagens que cruzam o limite durante a limpeza
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)
+BULK_DELETE_SIZE = 100
+
+MessagePredicate = Callable[[disnake.Message], bool]
+
+_REPEAT_OPS = {
+    getattr(sre_constants, name) for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_constants, name)
+}
+_GROUPREF_OPS = {sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS}
+
+
+def _subpatterns(value: Any) -> Iterator[sre_parse.SubPattern]:
+    if isinstance(value, sre_parse.SubPattern):
+        yield value
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            yield from _subpatterns(item)
+
+
+def _disjoint_branches(branches: List[sre_parse.SubPattern]) -> bool:
+    """Indica se cada alternativa começa com um caractere literal diferente"""
+    first = set()
+    for branch in branches:
+        if not len(branch) or branch[0][0] is not sre_constants.LITERAL:
+            return False
+        char = chr(branch[0][1]).lower()
+        if char in first:
+            return False
+        first.add(char)
+    return True
+
+
+def _check_pattern(pattern: sre_parse.SubPattern, inside_repeat: bool = False) -> int:
+    """Recusa construções com backtracking explosivo; retorna o total de quantificadores
+
+    O regex roda no event loop sobre até PURGE_SCAN_LIMIT mensagens, e o
+    módulo re não pode ser interrompido: um quantificador dentro de outro
+    (ex: `(a+)+`), alternativas sobrepostas repetidas (ex: `(a|aa)*`) ou
+    uma referência a grupo podem travar o gateway.
+    """
+    repeats = 0
+    for op, value in pattern:
+        if op in _REPEAT_OPS:
+            _, maximum, item = value
+            quantifier = maximum > 1
+            if quantifier and inside_repeat:
+                raise re.error("quantificadores aninhados não são permitidos")
+            repeats += quantifier + _check_pattern(item, inside_repeat or quantifier)
+        elif op in _GROUPREF_OPS:
+            raise re.error("referências a grupos não são permitidas")
+        elif op is sre_constants.BRANCH and inside_repeat and not _disjoint_branches(value[1]):
+            # (a|aa)* testa todas as combinações de alternativas
+            raise re.error("alternativas dentro de quantificador devem começar com caracteres diferentes")
+        else:
+            for sub in _subpatterns(value):
+                repeats += _check_pattern(sub, inside_repeat)
+    return repeats
+
+
+class PurgeFilter:
+    """Critérios de seleção de mensagens, combinados com E"""
+
+    __slots__ = ("user_id", "pattern", "attachments", "bots", "after")
+
+    def __init__(
+        self,
+        user_id: Optional[int] = None,
+        pattern: Optional[Pattern] = None,
+        attachments: bool = False,
+        bots: bool = False,
+        after: Optional[datetime] = None
+    ):
+        self.user_id = user_id
+        self.pattern = pattern
+        self.attachments = attachments
+        self.bots = bots
+        self.after = after
+
+    @classmethod
+    def compile_pattern(cls, text: str) -> Pattern:
+        """Compila o regex do filtro de conteúdo (lança re.error se inválido ou arriscado)"""
+        if len(text) > BotConfig.PURGE_PATTERN_MAX_LENGTH:
+            raise re.error(f"máximo de {BotConfig.PURGE_PATTERN_MAX_LENGTH} caracteres")
+        repeats = _check_pattern(sre_parse.parse(text, re.IGNORECASE))
+        if repeats > BotConfig.PURGE_PATTERN_MAX_REPEATS:
+            raise re.error(f"máximo de {BotConfig.PURGE_PATTERN_MAX_REPEATS} quantificadores")
+        return re.compile(text, re.IGNORECASE)
+
+    def predicates(self) -> List[MessagePredicate]:
+        """Predicados dos filtros ativos, do mais barato para o mais caro"""
+        predicates: List[MessagePredicate] = []
+        if self.user_id is not None:
+            user_id = self.user_id
+            predicates.append(lambda message: message.author.id == user_id)
+        if self.bots:
+            predicates.append(lambda message: message.author.bot)
+        if self.attachments:
+            predicates.append(lambda message: bool(message.attachments))
+        if self.pattern is not None:
+            search = self.pattern.search
+            predicates.append(lambda message: search(message.content) is not None)
+        return predicates
+
+    def apply(self, page: List[disnake.Message]) -> List[disnake.Message]:
+        """Aplica os predicados à página inteira, um filtro por vez"""
+        for predicate in self.predicates():
+            page = list(filter(predicate, page))
+            if not page:
+                break
+        return page
+
+
+class PurgeProgress:
+    """Andamento de uma limpeza"""
+
+    __slots__ = ("limit", "scanned", "deleted", "failed", "started_at", "finished")
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.scanned = 0
+        self.deleted = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
+        self.finished = False
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+
+class PurgeEngine:
+    """Percorre o histórico página a página e apaga as mensagens selecionadas
+
+    Mensagens com menos de 14 dias são apagadas em lotes de até 100 com
+    bulk delete; as mais antigas só podem ser apagadas uma a uma, então
+    passam por um bucket com ritmo próprio. Como o histórico vem da mais
+    nova para a mais antiga, a partir da primeira mensagem antiga todas as
+    seguintes também são.
+    """
+
+    def __init__(
+        self,
+        scan_limit: int = BotConfig.PURGE_SCAN_LIMIT,
+        old_delete_rate: float = BotConfig.PURGE_OLD_DELETE_RATE,
+        progress_interval: float = BotConfig.PURGE_PROGRESS_INTERVAL
+    ):
+        self.scan_limit = scan_limit
+        self.old_delete_rate = old_delete_rate
+        self.progress_interval = progress_interval
+
+    async def run(
+        self,
+        channel: disnake.abc.Messageable,
+        limit: int,
+        purge_filter: PurgeFilter,
+        before: Optional[datetime] = None,
+        on_progress: Optional[Callable[[PurgeProgress], Awaitable[None]]] = None
+    ) -> PurgeProgress:
+        """Apaga até `limit` mensagens que passam no filtro, anteriores a `before`"""
+        progress = PurgeProgress(limit)
+        bulk_cutoff = disnake.utils.utcnow() - BULK_DELETE_MAX_AGE
+        old_bucket = TokenBucket(self.old_delete_rate, 1)
+        last_report = time.monotonic()
+
+        history = channel.history(limit=self.scan_limit, before=before)
+        async for page in history.chunk(BULK_DELETE_SIZE):
+            progress.scanned += len(page)
+
+            reached_window_end = False
+            if purge_filter.after is not None and page[-1].created_at < purge_filter.after:
+                page = [message for message in page if message.created_at >= purge_filter.after]
+                reached_window_end = True
+
+            selected = purge_filter.apply(page)[:limit - progress.deleted]
+            recent = [message for message in selected if message.created_at > bulk_cutoff]
+            old = selected[len(recent):]
+
+            if recent:
+                await self._bulk_delete(channel, recent, progress)
+            for message in old:
+                await old_bucket.acquire()
+                await self._single_delete(message, progress)
+
+            if progress.deleted >= limit or reached_window_end:
+                break
+
+            if on_progress is not None and time.monotonic() - last_report >= self.progress_interval:
+                last_report = time.monotonic()
+                await self._report(on_progress, progress)
+
+        progress.finished = True
+        if on_progress is not None:
+            await self._report(on_progress, progress)
+        return progress
+
+    async def _bulk_delete(self, channel, messages: List[disnake.Message], progress: PurgeProgress):
+        try:
+            await channel.delete_messages(messages)
+            progress.deleted += len(messages)
+        except disnake.Forbidden:
+            raise
+        except disnake.HTTPException as e:
+            logger.warning("Falha no bulk delete em %s: %s", channel.id, e)
+            progress.failed += len(messages)
+
+    async def _single_delete(self, message: disnake.Message, progress: PurgeProgress):
+        try:
+            await message.delete()
+            progress.deleted += 1
+        except disnake.NotFound:
+            pass
+        except disnake.Forbidden:
+            raise
+        except disnake.HTTPException:
+            progress.failed += 1
+
+    async def _report(self, on_progress: Callable[[PurgeProgress], Awaitable[None]], progress: PurgeProgress):
+        try:
+            await on_progress(progress)
+        except disnake.HTTPException as e:
+            logger.warning("Falha ao atualizar progresso da limpeza: %s", e)
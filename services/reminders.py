@@ -0,0 +1,240 @@
+"""
+Agendador de lembretes persistente
+"""
+
+import asyncio
+import heapq
+import logging
+import sys
+import time
+from typing import List, NamedTuple, Optional, Set, Tuple
+
+import disnake
+
+from config import BotConfig
+from services.dm_outbox import DMStatus
+from services.storage import SQLiteStore
+from utils import EmbedUtils
+
+logger = logging.getLogger(__name__)
+
+
+class Reminder(NamedTuple):
+    """Lembrete pendente"""
+
+    id: int
+    user_id: int
+    channel_id: Optional[int]
+    content: str
+    created_at: float
+    due_at: float
+
+
+class ReminderStore(SQLiteStore):
+    """Armazena os lembretes pendentes em disco"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS reminders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            channel_id INTEGER,
+            content TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            due_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_reminders_due ON reminders (due_at, id);
+    """
+
+    async def add(self, user_id: int, channel_id: Optional[int], content: str,
+                  created_at: float, due_at: float) -> int:
+        """Salva um lembrete e retorna seu ID"""
+        return await self.execute(
+            "INSERT INTO reminders (user_id, channel_id, content, created_at, due_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (user_id, channel_id, content, created_at, due_at)
+        )
+
+    async def fetch_window(self, after: Tuple[float, int], until: float, limit: int) -> List[Reminder]:
+        """Retorna os lembretes depois do cursor (due_at, id) que vencem até `until`"""
+        due_at, reminder_id = after
+        rows = await self.fetchall(
+            "SELECT id, user_id, channel_id, content, created_at, due_at FROM reminders "
+            "WHERE (due_at > ? OR (due_at = ? AND id > ?)) AND due_at <= ? "
+            "ORDER BY due_at, id LIMIT ?",
+            (due_at, due_at, reminder_id, until, limit)
+        )
+        return [Reminder(*row) for row in rows]
+
+    async def delete_many(self, reminder_ids: List[int]) -> None:
+        """Remove os lembretes entregues em uma única transação"""
+        await self.executemany(
+            "DELETE FROM reminders WHERE id = ?",
+            [(reminder_id,) for reminder_id in reminder_ids]
+        )
+
+
+class ReminderScheduler:
+    """Despacha lembretes a partir de um único heap em memória
+
+    Apenas os lembretes que vencem dentro do horizonte configurado ficam
+    em memória; o restante permanece no disco até chegar a sua vez.
+    """
+
+    def __init__(
+        self,
+        bot,
+        store: ReminderStore,
+        horizon: float = BotConfig.REMINDER_HORIZON,
+        batch_size: int = BotConfig.REMINDER_BATCH_SIZE,
+        preload_limit: int = BotConfig.REMINDER_PRELOAD_LIMIT
+    ):
+        self.bot = bot
+        self.store = store
+        self.horizon = horizon
+        self.batch_size = batch_size
+        self.preload_limit = preload_limit
+
+        self._heap: List[Tuple[float, int, Reminder]] = []
+        # IDs no heap ou em entrega; `schedule` e `_refill` podem ver o mesmo lembrete
+        self._queued: Set[int] = set()
+        # Tudo que for <= ao cursor (due_at, id) já está no heap ou foi entregue
+        self._cursor: Tuple[float, int] = (0.0, 0)
+        self._backlog = False
+        self._next_refill = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Inicia a task de despacho"""
+        if self._task is None:
+            self._task = self.bot.loop.create_task(self._run())
+
+    async def stop(self):
+        """Para a task de despacho e fecha o store"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.store.close()
+
+    @property
+    def pending_in_memory(self) -> int:
+        """Quantidade de lembretes carregados no heap"""
+        return len(self._heap)
+
+    async def schedule(self, user_id: int, channel_id: Optional[int], content: str, delay: float) -> Reminder:
+        """Persiste um lembrete para ser entregue daqui a `delay` segundos"""
+        created_at = time.time()
+        due_at = created_at + delay
+        reminder_id = await self.store.add(user_id, channel_id, content, created_at, due_at)
+        reminder = Reminder(reminder_id, user_id, channel_id, content, created_at, due_at)
+
+        # Só entra no heap se estiver dentro da janela já carregada
+        if (due_at, reminder_id) <= self._cursor and self._push(reminder):
+            if self._wakeup is not None and self._heap[0][1] == reminder_id:
+                self._wakeup.set()
+
+        return reminder
+
+    def _push(self, reminder: Reminder) -> bool:
+        """Coloca o lembrete no heap, exceto se ele já estiver lá"""
+        if reminder.id in self._queued:
+            return False
+        self._queued.add(reminder.id)
+        heapq.heappush(self._heap, (reminder.due_at, reminder.id, reminder))
+        return True
+
+    async def _refill(self, now: float):
+        """Carrega do disco os lembretes que vencem dentro do horizonte"""
+        until = now + self.horizon
+        reminders = await self.store.fetch_window(self._cursor, until, self.preload_limit)
+
+        for reminder in reminders:
+            self._push(reminder)
+
+        if len(reminders) >= self.preload_limit:
+            # Ainda há lembretes na janela; continuar de onde parou
+            last = reminders[-1]
+            self._cursor = (last.due_at, last.id)
+            self._backlog = True
+        else:
+            self._cursor = (until, sys.maxsize)
+            self._backlog = False
+
+        self._next_refill = now + self.horizon / 2
+
+    def _needs_refill(self, now: float) -> bool:
+        if now >= self._next_refill:
+            return True
+        return self._backlog and len(self._heap) < self.batch_size
+
+    async def _run(self):
+        """Loop principal do despachante"""
+        self._wakeup = asyncio.Event()
+        await self.bot.wait_until_ready()
+
+        while True:
+            try:
+                now = time.time()
+                if self._needs_refill(now):
+                    await self._refill(now)
+
+                batch = []
+                while self._heap and self._heap[0][0] <= now and len(batch) < self.batch_size:
+                    batch.append(heapq.heappop(self._heap)[2])
+
+                if batch:
+                    await self._deliver_batch(batch)
+                    continue
+
+                next_at = self._next_refill
+                if self._heap:
+                    next_at = min(next_at, self._heap[0][0])
+
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, next_at - time.time()))
+                except asyncio.TimeoutError:
+                    pass
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Erro no despachante de lembretes: %s", e)
+                await asyncio.sleep(5)
+
+    async def _deliver_batch(self, batch: List[Reminder]):
+        """Entrega um lote de lembretes em paralelo e remove todos do disco de uma vez"""
+        await asyncio.gather(*(self._deliver(reminder) for reminder in batch), return_exceptions=True)
+        try:
+            await self.store.delete_many([reminder.id for reminder in batch])
+        finally:
+            self._queued.difference_update(reminder.id for reminder in batch)
+
+    def build_embed(self, reminder: Reminder) -> disnake.Embed:
+        """Cria o embed enviado ao usuário"""
+        embed = EmbedUtils.create_embed(
+            title="🔔 Lembrete",
+            description=reminder.content,
+            color=BotConfig.WARNING_COLOR
+        )
+        embed.add_field(
+            name="Criado em",
+            value=f"<t:{int(reminder.created_at)}:F>",
+            inline=False
+        )
+        return embed
+
+    async def _deliver(self, reminder: Reminder):
+        """Envia o lembrete por DM, com fallback para o canal de origem"""
+        status = await self.bot.dm_outbox.send(
+            reminder.user_id,
+            self.build_embed(reminder),
+            fallback_channel_id=reminder.channel_id,
+            dedupe_key=f"reminder:{reminder.id}"
+        )
+        if status is DMStatus.FAILED:
+            logger.warning("Não foi possível entregar o lembrete %s", reminder.id)
@@ -0,0 +1,278 @@
+"""
+Encurtador de URLs local com servidor de redirecionamento
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import string
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import disnake
+
+from config import BotConfig
+from services.startup import lazy_import
+from services.storage import SQLiteStore
+
+# aiohttp.web só é necessário quando o servidor é aberto
+web = lazy_import("aiohttp.web")
+
+logger = logging.getLogger(__name__)
+
+BASE62_ALPHABET = string.digits + string.ascii_letters
+_BASE62_INDEX: Dict[str, int] = {char: index for index, char in enumerate(BASE62_ALPHABET)}
+# Os códigos são uma permutação de 40 bits dos IDs: até ~1,1 trilhão de
+# URLs, em no máximo 7 caracteres
+ID_BITS = 40
+MAX_ID = 2 ** ID_BITS - 1
+MAX_CODE_LENGTH = 7
+_HALF_BITS = ID_BITS // 2
+_HALF_MASK = (1 << _HALF_BITS) - 1
+_FEISTEL_ROUNDS = 4
+
+
+def base62_encode(number: int) -> str:
+    if number == 0:
+        return BASE62_ALPHABET[0]
+    chars = []
+    while number:
+        number, remainder = divmod(number, 62)
+        chars.append(BASE62_ALPHABET[remainder])
+    return "".join(reversed(chars))
+
+
+def base62_decode(code: str) -> Optional[int]:
+    """Converte o código em ID; None se tiver caracteres inválidos"""
+    if not code or len(code) > MAX_CODE_LENGTH:
+        return None
+    number = 0
+    for char in code:
+        value = _BASE62_INDEX.get(char)
+        if value is None:
+            return None
+        number = number * 62 + value
+    return number if number <= MAX_ID else None
+
+
+class CodePermutation:
+    """Permutação com chave (rede de Feistel) entre IDs e números de código
+
+    IDs sequenciais viram códigos sem ordem aparente, então não dá para
+    percorrer as URLs guardadas incrementando o código; sem a chave, um
+    código chutado raramente existe. É uma bijeção em [0, 2^40), então não
+    há colisões e a volta não precisa de consulta.
+    """
+
+    def __init__(self, key: bytes):
+        self.key = key
+
+    def _round(self, index: int, half: int) -> int:
+        digest = hashlib.blake2b(
+            half.to_bytes(4, "big"), digest_size=4, key=self.key, person=bytes([index]) * 16
+        ).digest()
+        return int.from_bytes(digest, "big") & _HALF_MASK
+
+    def encode(self, url_id: int) -> str:
+        left, right = url_id >> _HALF_BITS, url_id & _HALF_MASK
+        for index in range(_FEISTEL_ROUNDS):
+            left, right = right, left ^ self._round(index, right)
+        return base62_encode((left << _HALF_BITS) | right)
+
+    def decode(self, code: str) -> Optional[int]:
+        number = base62_decode(code)
+        if number is None:
+            return None
+        left, right = number >> _HALF_BITS, number & _HALF_MASK
+        for index in reversed(range(_FEISTEL_ROUNDS)):
+            left, right = right ^ self._round(index, left), left
+        return (left << _HALF_BITS) | right
+
+
+def url_hash(url: str) -> bytes:
+    return hashlib.sha256(url.encode("utf-8")).digest()
+
+
+def validate_url(url: str, max_length: int = BotConfig.SHORTURL_MAX_LENGTH) -> Optional[str]:
+    """Retorna a mensagem de erro, ou None se a URL for aceitável"""
+    if len(url) > max_length:
+        return f"A URL deve ter no máximo {max_length} caracteres."
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return "A URL deve começar com http:// ou https:// e ter um domínio."
+    return None
+
+
+class ShortURLStore(SQLiteStore):
+    """Armazena as URLs encurtadas; o hash da URL é único para deduplicar"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS short_urls (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL,
+            url_hash BLOB NOT NULL UNIQUE,
+            created_by INTEGER,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS short_url_meta (
+            name TEXT PRIMARY KEY,
+            value BLOB NOT NULL
+        );
+    """
+
+    async def secret(self) -> bytes:
+        """Chave da permutação de códigos, gerada na primeira execução"""
+        def _secret():
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR IGNORE INTO short_url_meta (name, value) VALUES ('code_key', ?)",
+                (os.urandom(32),)
+            )
+            conn.commit()
+            return conn.execute("SELECT value FROM short_url_meta WHERE name = 'code_key'").fetchone()[0]
+
+        return await self._run(_secret)
+
+    async def get_or_create(self, url: str, digest: bytes, created_by: Optional[int]) -> int:
+        """Retorna o ID da URL, criando-a se ainda não existir"""
+        def _get_or_create():
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR IGNORE INTO short_urls (url, url_hash, created_by, created_at) VALUES (?, ?, ?, ?)",
+                (url, digest, created_by, time.time())
+            )
+            conn.commit()
+            return conn.execute("SELECT id FROM short_urls WHERE url_hash = ?", (digest,)).fetchone()[0]
+
+        return await self._run(_get_or_create)
+
+    async def get(self, url_id: int) -> Optional[str]:
+        row = await self.fetchone("SELECT url FROM short_urls WHERE id = ?", (url_id,))
+        return row[0] if row else None
+
+
+class URLShortener:
+    """Gera e resolve códigos base62 a partir do ID da URL (via CodePermutation)
+
+    As resoluções recentes ficam em um LRU em memória, então redirecionar
+    códigos populares não lê o disco; leituras simultâneas do mesmo código
+    ausente compartilham uma única consulta.
+    """
+
+    def __init__(self, store: ShortURLStore, base_url: str = BotConfig.SHORTURL_BASE_URL,
+                 cache_size: int = BotConfig.SHORTURL_CACHE_SIZE):
+        self.store = store
+        self.base_url = base_url.rstrip("/")
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[int, str]" = OrderedDict()
+        self._hashes: "OrderedDict[bytes, int]" = OrderedDict()
+        self._loading: Dict[int, asyncio.Future] = {}
+        self._permutation: Optional[CodePermutation] = None
+        self._permutation_loading: Optional[asyncio.Future] = None
+
+    async def _codes(self) -> CodePermutation:
+        if self._permutation is not None:
+            return self._permutation
+        if self._permutation_loading is None:
+            self._permutation_loading = asyncio.ensure_future(self.store.secret())
+        key = await asyncio.shield(self._permutation_loading)
+        self._permutation = CodePermutation(key)
+        return self._permutation
+
+    def _remember(self, url_id: int, url: str, digest: Optional[bytes] = None):
+        self._cache[url_id] = url
+        self._cache.move_to_end(url_id)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        if digest is not None:
+            self._hashes[digest] = url_id
+            self._hashes.move_to_end(digest)
+            if len(self._hashes) > self.cache_size:
+                self._hashes.popitem(last=False)
+
+    def short_url(self, code: str) -> str:
+        return f"{self.base_url}/{code}"
+
+    async def shorten(self, url: str, created_by: Optional[int] = None) -> str:
+        """Retorna o código da URL; a mesma URL sempre recebe o mesmo código"""
+        digest = url_hash(url)
+        url_id = self._hashes.get(digest)
+        if url_id is None:
+            url_id = await self.store.get_or_create(url, digest, created_by)
+            if url_id > MAX_ID:
+                raise ValueError("Limite de IDs do encurtador atingido")
+        self._remember(url_id, url, digest)
+        return (await self._codes()).encode(url_id)
+
+    async def resolve(self, code: str) -> Optional[str]:
+        """URL de destino do código, ou None se ele não existir"""
+        url_id = (await self._codes()).decode(code)
+        if url_id is None:
+            return None
+
+        url = self._cache.get(url_id)
+        if url is not None:
+            self._cache.move_to_end(url_id)
+            self.hits += 1
+            return url
+
+        self.misses += 1
+        future = self._loading.get(url_id)
+        if future is None:
+            future = asyncio.ensure_future(self.store.get(url_id))
+            self._loading[url_id] = future
+            future.add_done_callback(lambda _: self._loading.pop(url_id, None))
+        url = await asyncio.shield(future)
+        if url is not None:
+            self._remember(url_id, url)
+        return url
+
+    async def close(self):
+        await self.store.close()
+
+
+class ShortURLServer:
+    """Servidor HTTP que redireciona GET /<código> para a URL original"""
+
+    def __init__(self, bot: disnake.Client, shortener: URLShortener,
+                 host: str = BotConfig.SHORTURL_HOST, port: int = BotConfig.SHORTURL_PORT):
+        self.bot = bot
+        self.shortener = shortener
+        self.host = host
+        self.port = port
+        self._runner: Optional["web.AppRunner"] = None
+
+    async def handle_redirect(self, request: "web.Request") -> "web.Response":
+        url = await self.shortener.resolve(request.match_info["code"])
+        if url is None:
+            return web.Response(status=404, text="Link não encontrado")
+        # O destino de um código nunca muda, então o redirecionamento pode ser permanente
+        return web.Response(status=301, headers={"Location": url, "Cache-Control": "public, max-age=86400"})
+
+    def start(self):
+        """Agenda a abertura do servidor no event loop do bot"""
+        self.bot.loop.create_task(self._serve())
+
+    async def _serve(self):
+        app = web.Application()
+        app.router.add_get("/{code}", self.handle_redirect)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except OSError as e:
+            logger.error("Não foi possível abrir o encurtador em %s:%s: %s", self.host, self.port, e)
+            await runner.cleanup()
+            return
+        self._runner = runner
+        logger.info("Encurtador de URLs em http://%s:%s", self.host, self.port)
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,162 @@
+"""
+Perfil de inicialização e importações sob demanda
+"""
+
+import importlib
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import sys
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set
+
+from config import BotConfig
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Importa um módulo adiando a execução até o primeiro acesso a um atributo
+
+    Com LAZY_IMPORTS desativado (ou se o módulo já foi importado) equivale a
+    importlib.import_module.
+    """
+    if name in sys.modules or not BotConfig.LAZY_IMPORTS:
+        return importlib.import_module(name)
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _outermost(modules: Set[str]) -> List[str]:
+    """Reduz módulos novos ao pacote mais externo que também é novo"""
+    roots = set()
+    for module in modules:
+        parts = module.split(".")
+        for index in range(1, len(parts) + 1):
+            prefix = ".".join(parts[:index])
+            if prefix in modules:
+                roots.add(prefix)
+                break
+    return sorted(roots)
+
+
+class ExtensionTiming(NamedTuple):
+    """Tempos de carregamento de uma extensão"""
+
+    name: str
+    import_time: float
+    setup_time: float
+    new_modules: List[str]
+    error: Optional[str] = None
+
+    @property
+    def total(self) -> float:
+        return self.import_time + self.setup_time
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Loader que mede o tempo de execução do corpo do módulo"""
+
+    def __init__(self, loader: importlib.abc.Loader):
+        self.loader = loader
+        self.exec_time = 0.0
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Tracebacks e linecache usam o loader original para ler o código-fonte
+        module.__loader__ = module.__spec__.loader = self.loader
+        started = time.perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.exec_time = time.perf_counter() - started
+
+
+class _TimedFinder(importlib.abc.MetaPathFinder):
+    """Finder de uso único que envolve o loader de um módulo específico"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.loader: Optional[_TimedLoader] = None
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname != self.name:
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is not None and spec.loader is not None:
+            self.loader = spec.loader = _TimedLoader(spec.loader)
+        return spec
+
+
+class StartupProfiler:
+    """Registra quanto tempo cada fase e cada extensão levam na inicialização
+
+    O tempo de importação de uma extensão é a execução do corpo do módulo
+    (incluindo as dependências que ele importa pela primeira vez); o de
+    setup é o restante de load_extension, ou seja, a função setup() com a
+    criação do cog e o registro dos comandos.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.extensions: List[ExtensionTiming] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def mark(self, name: str):
+        """Registra o tempo decorrido desde o início do perfil"""
+        self.phases[name] = time.perf_counter() - self.started
+
+    def load_extension(self, bot, name: str) -> ExtensionTiming:
+        """Carrega uma extensão medindo importação, setup e módulos novos"""
+        modules_before = set(sys.modules)
+        finder = _TimedFinder(name)
+        sys.meta_path.insert(0, finder)
+        error = None
+        started = time.perf_counter()
+        try:
+            bot.load_extension(name)
+        except Exception as e:
+            error = str(e)
+        finally:
+            elapsed = time.perf_counter() - started
+            sys.meta_path.remove(finder)
+
+        import_time = finder.loader.exec_time if finder.loader is not None else 0.0
+        new_modules = _outermost(set(sys.modules) - modules_before - {name})
+        timing = ExtensionTiming(name, import_time, max(elapsed - import_time, 0.0), new_modules, error)
+        self.extensions.append(timing)
+        return timing
+
+    def report(self) -> List[str]:
+        """Linhas do relatório de inicialização"""
+        lines = ["⏱️ Perfil de inicialização:"]
+        for timing in sorted(self.extensions, key=lambda item: item.total, reverse=True):
+            status = "❌" if timing.error else "✅"
+            line = (
+                f"  {status} {timing.name:<24} {timing.total * 1000:7.1f} ms "
+                f"(import {timing.import_time * 1000:.1f} ms, setup {timing.setup_time * 1000:.1f} ms)"
+            )
+            if timing.new_modules:
+                line += f" +{', '.join(timing.new_modules)}"
+            lines.append(line)
+        for name, elapsed in self.phases.items():
+            lines.append(f"  • {name:<26} {elapsed * 1000:7.1f} ms")
+        return lines
@@ -0,0 +1,89 @@
+"""
+Base para armazenamento local em SQLite
+"""
+
+import asyncio
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, List, Optional, Sequence
+
+
+class SQLiteStore:
+    """Store SQLite acessado por uma única thread dedicada
+
+    Todas as operações rodam fora do event loop, em um executor de uma
+    thread só, então a conexão nunca é compartilhada entre threads.
+    """
+
+    SCHEMA: str = ""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix=f"sqlite-{os.path.basename(path)}"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Abre a conexão na primeira utilização (roda na thread do executor)"""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if self.SCHEMA:
+                conn.executescript(self.SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, func, *args) -> Any:
+        """Executa uma função síncrona na thread do store"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def execute(self, sql: str, params: Sequence = ()) -> int:
+        """Executa um comando e retorna o lastrowid"""
+        def _execute():
+            conn = self._connection()
+            cursor = conn.execute(sql, params)
+            conn.commit()
+            return cursor.lastrowid
+
+        return await self._run(_execute)
+
+    async def executemany(self, sql: str, rows: Iterable[Sequence]) -> None:
+        """Executa o mesmo comando para várias linhas em uma única transação"""
+        rows = list(rows)
+        if not rows:
+            return
+
+        def _executemany():
+            conn = self._connection()
+            conn.executemany(sql, rows)
+            conn.commit()
+
+        await self._run(_executemany)
+
+    async def fetchall(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        """Retorna todas as linhas de uma consulta"""
+        return await self._run(lambda: self._connection().execute(sql, params).fetchall())
+
+    async def fetchone(self, sql: str, params: Sequence = ()) -> Optional[tuple]:
+        """Retorna a primeira linha de uma consulta"""
+        return await self._run(lambda: self._connection().execute(sql, params).fetchone())
+
+    async def close(self) -> None:
+        """Fecha a conexão e encerra a thread do store"""
+        def _close():
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+        await self._run(_close)
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,104 @@
+"""
+Amostragem de métricas do sistema em segundo plano
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Optional
+
+import disnake
+from disnake.ext import tasks
+
+from config import BotConfig
+from services.startup import lazy_import
+
+psutil = lazy_import("psutil")
+platform = lazy_import("platform")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SystemSnapshot:
+    """Leitura imutável de CPU, RAM e disco"""
+
+    cpu_percent: float
+    cpu_count: int
+    memory_total: int
+    memory_used: int
+    memory_percent: float
+    disk_used: int
+    disk_percent: float
+    process_rss: int
+    sampled_at: float
+
+
+class SystemMonitor:
+    """Mantém um snapshot das métricas do sistema atualizado fora do event loop"""
+
+    def __init__(self, interval: float = BotConfig.SYSTEM_SAMPLE_INTERVAL, disk_path: str = "/"):
+        self.disk_path = disk_path
+        self._snapshot: Optional[SystemSnapshot] = None
+        self._cpu_primed = False
+
+        self.sample_task.change_interval(seconds=interval)
+
+    @cached_property
+    def platform_info(self) -> Dict[str, str]:
+        """Informações estáticas: não mudam durante a execução"""
+        return {
+            "OS": platform.system(),
+            "Version": platform.release(),
+            "Architecture": platform.machine(),
+            "Python": platform.python_version(),
+            "Disnake": disnake.__version__
+        }
+
+    @property
+    def snapshot(self) -> SystemSnapshot:
+        """Retorna o último snapshot (amostra na hora se ainda não houver um)"""
+        if self._snapshot is None:
+            self._snapshot = self._sample()
+        return self._snapshot
+
+    def start(self):
+        """Inicia a amostragem periódica"""
+        if not self.sample_task.is_running():
+            self.sample_task.start()
+
+    def stop(self):
+        """Para a amostragem periódica"""
+        self.sample_task.cancel()
+
+    def _sample(self) -> SystemSnapshot:
+        """Lê as métricas do psutil (chamadas bloqueantes, rodar em executor)"""
+        if not self._cpu_primed:
+            # A primeira chamada de cpu_percent(None) apenas inicializa o contador interno
+            psutil.cpu_percent(interval=None)
+            self._cpu_primed = True
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+
+        return SystemSnapshot(
+            cpu_percent=psutil.cpu_percent(interval=None),
+            cpu_count=psutil.cpu_count(),
+            memory_total=memory.total,
+            memory_used=memory.used,
+            memory_percent=memory.percent,
+            disk_used=disk.used,
+            disk_percent=disk.percent,
+            process_rss=psutil.Process().memory_info().rss,
+            sampled_at=time.time()
+        )
+
+    @tasks.loop(seconds=5)
+    async def sample_task(self):
+        """Atualiza o snapshot em uma thread do executor padrão"""
+        loop = asyncio.get_running_loop()
+        try:
+            self._snapshot = await loop.run_in_executor(None, self._sample)
+        except Exception as e:
+            logger.warning("Falha ao amostrar métricas do sistema: %s", e)
@@ -0,0 +1,225 @@
+"""
+Registro persistente de avisos com regras de escalonamento
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from disnake.ext import tasks
+
+from config import BotConfig
+from services.storage import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+WarningKey = Tuple[int, int]
+
+
+class WarningRecord(NamedTuple):
+    """Aviso registrado"""
+
+    id: int
+    guild_id: int
+    user_id: int
+    moderator_id: int
+    reason: str
+    created_at: float
+
+
+class WarningResult(NamedTuple):
+    """Resultado de um novo aviso"""
+
+    count_in_window: int
+    rule: Optional[Dict[str, Any]]
+
+
+class WarningPage(NamedTuple):
+    """Página da listagem de avisos (paginação por cursor de ID)"""
+
+    records: List[WarningRecord]
+    total: int
+    next_before: Optional[int]
+
+
+class WarningStore(SQLiteStore):
+    """Armazena os avisos em disco, indexados por servidor e usuário"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS warnings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            moderator_id INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_warnings_member ON warnings (guild_id, user_id, id);
+    """
+
+    async def add_many(self, rows: List[Tuple[int, int, int, str, float]]) -> None:
+        """Grava (guild_id, user_id, moderator_id, motivo, data) em uma única transação"""
+        await self.executemany(
+            "INSERT INTO warnings (guild_id, user_id, moderator_id, reason, created_at) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+
+    async def timestamps_since(self, guild_id: int, user_id: int, since: float) -> List[float]:
+        rows = await self.fetchall(
+            "SELECT created_at FROM warnings WHERE guild_id = ? AND user_id = ? AND created_at >= ? ORDER BY id",
+            (guild_id, user_id, since)
+        )
+        return [row[0] for row in rows]
+
+    async def count(self, guild_id: int, user_id: int) -> int:
+        row = await self.fetchone(
+            "SELECT COUNT(*) FROM warnings WHERE guild_id = ? AND user_id = ?",
+            (guild_id, user_id)
+        )
+        return row[0]
+
+    async def page(self, guild_id: int, user_id: int, before: Optional[int], limit: int) -> List[WarningRecord]:
+        """Avisos mais recentes que vêm antes do ID `before` (sem OFFSET)"""
+        rows = await self.fetchall(
+            "SELECT id, guild_id, user_id, moderator_id, reason, created_at FROM warnings "
+            "WHERE guild_id = ? AND user_id = ? AND id < ? ORDER BY id DESC LIMIT ?",
+            (guild_id, user_id, before if before is not None else 2 ** 63 - 1, limit)
+        )
+        return [WarningRecord(*row) for row in rows]
+
+
+def warnings_custom_id(user_id: int, before: int) -> str:
+    """Monta o custom_id do botão de próxima página de /warnings"""
+    return f"warnings:{user_id}:{before}"
+
+
+def parse_warnings_custom_id(custom_id: str) -> Optional[Tuple[int, int]]:
+    """Extrai (user_id, cursor) de um custom_id; None se não for de /warnings"""
+    if not custom_id.startswith("warnings:"):
+        return None
+    try:
+        _, user_id, before = custom_id.split(":")
+        return int(user_id), int(before)
+    except ValueError:
+        return None
+
+
+class WarningLedger:
+    """Registra avisos em memória e os grava em lote
+
+    O aviso entra na fila de gravação e na janela de avisos recentes do
+    membro, usada pelas regras de escalonamento; só a primeira consulta de
+    um membro desde o início do processo lê o disco. A listagem grava a
+    fila antes de ler, então sempre inclui os avisos recém-dados.
+    """
+
+    def __init__(
+        self,
+        store: WarningStore,
+        rules: List[Dict[str, Any]] = BotConfig.WARN_ESCALATION,
+        flush_interval: float = BotConfig.WARN_FLUSH_INTERVAL,
+        cache_size: int = 10000
+    ):
+        self.store = store
+        # Regras mais severas primeiro: vale a primeira atingida
+        self.rules = sorted(rules, key=lambda rule: rule["count"], reverse=True)
+        self.window = max((rule["window"] for rule in rules), default=0)
+        self.cache_size = cache_size
+        self._recent: "OrderedDict[WarningKey, Deque[float]]" = OrderedDict()
+        self._loading: Dict[WarningKey, asyncio.Future] = {}
+        self._pending: List[Tuple[int, int, int, str, float]] = []
+        self._lock: Optional[asyncio.Lock] = None
+
+        self.flush_task.change_interval(seconds=flush_interval)
+
+    def start(self):
+        """Inicia a gravação periódica dos avisos"""
+        if not self.flush_task.is_running():
+            self.flush_task.start()
+
+    async def stop(self):
+        """Grava os avisos pendentes e fecha o store"""
+        self.flush_task.cancel()
+        await self.flush()
+        await self.store.close()
+
+    async def _recent_for(self, key: WarningKey) -> Deque[float]:
+        recent = self._recent.get(key)
+        if recent is not None:
+            self._recent.move_to_end(key)
+            return recent
+
+        future = self._loading.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._load_recent(key))
+            self._loading[key] = future
+            future.add_done_callback(lambda _: self._loading.pop(key, None))
+        return await asyncio.shield(future)
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _load_recent(self, key: WarningKey) -> Deque[float]:
+        since = time.time() - self.window
+        # A trava só espera uma gravação já em andamento; o que está na fila
+        # ainda não foi para o disco e é somado à leitura
+        async with self._get_lock():
+            timestamps = await self.store.timestamps_since(*key, since)
+            timestamps.extend(
+                created_at for guild_id, user_id, _, _, created_at in self._pending
+                if (guild_id, user_id) == key and created_at >= since
+            )
+        recent = deque(sorted(timestamps))
+        self._recent[key] = recent
+        while len(self._recent) > self.cache_size:
+            self._recent.popitem(last=False)
+        return recent
+
+    async def add(self, guild_id: int, user_id: int, moderator_id: int, reason: str) -> WarningResult:
+        """Registra um aviso e retorna a regra de escalonamento atingida, se houver"""
+        key = (guild_id, user_id)
+        recent = await self._recent_for(key)
+        now = time.time()
+        recent.append(now)
+        while recent and recent[0] < now - self.window:
+            recent.popleft()
+
+        self._pending.append((guild_id, user_id, moderator_id, reason, now))
+
+        # Só o aviso que atinge o limite de uma regra escalona; os seguintes
+        # não reaplicam o mesmo timeout
+        for rule in self.rules:
+            count = sum(1 for created_at in recent if created_at >= now - rule["window"])
+            if count == rule["count"]:
+                return WarningResult(len(recent), rule)
+        return WarningResult(len(recent), None)
+
+    async def page(self, guild_id: int, user_id: int, before: Optional[int] = None,
+                   limit: int = BotConfig.WARN_PAGE_SIZE) -> WarningPage:
+        """Uma página de avisos, do mais recente para o mais antigo"""
+        await self.flush()
+        records = await self.store.page(guild_id, user_id, before, limit + 1)
+        total = await self.store.count(guild_id, user_id)
+        next_before = records[limit - 1].id if len(records) > limit else None
+        return WarningPage(records[:limit], total, next_before)
+
+    async def flush(self):
+        """Grava todos os avisos pendentes"""
+        async with self._get_lock():
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            try:
+                await self.store.add_many(pending)
+            except Exception as e:
+                logger.error("Falha ao gravar avisos: %s", e)
+                # Devolver à fila na ordem original
+                self._pending = pending + self._pending
+
+    @tasks.loop(seconds=2)
+    async def flush_task(self):
+        await self.flush()
@@ -3,21 +3,69 @@ Utilitários para o bot Discord
 """
 import disnake
 import asyncio
-import logging
-from typing import Optional, Union, List
-from datetime import datetime
+import re
+from functools import lru_cache
+from typing import Any, Optional, Sequence, Tuple, Union, List
 from config import BotConfig
 
-# Configurar logging
-logging.basicConfig(
-    level=getattr(logging, BotConfig.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot.log'),
-        logging.StreamHandler()
-    ]
+# Tokenizador de durações: "1d2h30m", "1h 30m", "90s", "2 dias"...
+_DURATION_TOKEN = re.compile(r"\s*(\d+)\s*([a-zà-ú]+)\s*,?", re.IGNORECASE)
+
+# Durações ISO-8601 sem anos/meses (ambíguos): "PT1H30M", "P1DT2H", "P2W"
+_ISO_DURATION = re.compile(
+    r"^P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$",
+    re.IGNORECASE
 )
 
+_DURATION_UNITS = {
+    "s": 1, "sec": 1, "seg": 1, "segundo": 1, "segundos": 1,
+    "m": 60, "min": 60, "mins": 60, "minuto": 60, "minutos": 60,
+    "h": 3600, "hr": 3600, "hrs": 3600, "hora": 3600, "horas": 3600,
+    "d": 86400, "dia": 86400, "dias": 86400,
+    "w": 604800, "sem": 604800, "semana": 604800, "semanas": 604800
+}
+
+_ISO_MULTIPLIERS = (604800, 86400, 3600, 60, 1)
+
+
+@lru_cache(maxsize=1024)
+def _parse_duration(text: str, default_unit: Optional[int]) -> Optional[int]:
+    """Implementação com cache de BotUtils.parse_duration"""
+    text = text.strip()
+    if not text:
+        return None
+
+    # isdecimal, não isdigit: "²" é dígito mas int() o rejeita
+    if text.isdecimal():
+        return int(text) * default_unit if default_unit else None
+
+    if text[0] in "Pp":
+        match = _ISO_DURATION.match(text)
+        if not match or text.upper() in ("P", "PT") or text.upper().endswith("T"):
+            return None
+        return sum(
+            int(value) * multiplier
+            for value, multiplier in zip(match.groups(), _ISO_MULTIPLIERS)
+            if value
+        )
+
+    # Uma única passada pelos tokens "<número><unidade>"
+    total = 0
+    position = 0
+    length = len(text)
+    while position < length:
+        match = _DURATION_TOKEN.match(text, position)
+        if not match:
+            return None
+        multiplier = _DURATION_UNITS.get(match.group(2).lower())
+        if multiplier is None:
+            return None
+        total += int(match.group(1)) * multiplier
+        position = match.end()
+
+    return total
+
+
 class EmbedUtils:
     """Utilitários para criar embeds padronizados"""
     
@@ -40,7 +88,7 @@ class EmbedUtils:
         )
         
         if timestamp:
-            embed.timestamp = datetime.utcnow()
+            embed.timestamp = disnake.utils.utcnow()
         
         if author:
             embed.set_author(
@@ -59,6 +107,37 @@ class EmbedUtils:
         
         return embed
     
+    @staticmethod
+    def create_template(
+        title: str = None,
+        description: str = None,
+        color: int = BotConfig.EMBED_COLOR,
+        fields: Sequence[Tuple[str, str, bool]] = (),
+        footer: str = None,
+        thumbnail: str = None,
+        image: str = None,
+        timestamp: bool = True
+    ) -> "EmbedTemplate":
+        """Monta uma vez um embed estático para ser reutilizado
+        
+        `fields` é uma sequência de (nome, valor, inline). A descrição pode
+        conter campos de `str.format` preenchidos em `EmbedTemplate.render`.
+        """
+        embed = EmbedUtils.create_embed(
+            title=title,
+            description=description,
+            color=color,
+            footer=footer,
+            thumbnail=thumbnail,
+            image=image,
+            timestamp=False
+        )
+        
+        for name, value, inline in fields:
+            embed.add_field(name=name, value=value, inline=inline)
+        
+        return EmbedTemplate(embed, timestamp=timestamp)
+    
     @staticmethod
     def success_embed(title: str = "Sucesso", description: str = None) -> disnake.Embed:
         """Cria um embed de sucesso"""
@@ -86,6 +165,41 @@ class EmbedUtils:
             color=BotConfig.WARNING_COLOR
         )
 
+class EmbedTemplate:
+    """Embed pré-montado que gera cópias baratas a cada resposta"""
+    
+    __slots__ = ("embed", "timestamp")
+    
+    def __init__(self, embed: disnake.Embed, timestamp: bool = True):
+        self.embed = embed
+        self.timestamp = timestamp
+    
+    def render(self, *, description: str = None, footer: str = None, **format_args: Any) -> disnake.Embed:
+        """Retorna uma cópia com apenas os campos dinâmicos preenchidos"""
+        base = self.embed
+        
+        # Cópia rasa slot a slot: Embed.copy() faz to_dict() + from_dict().
+        # Só as coleções mutáveis (campos e arquivos) precisam ser duplicadas.
+        embed = object.__new__(type(base))
+        for attr in disnake.Embed.__slots__:
+            setattr(embed, attr, getattr(base, attr))
+        if base._fields is not None:
+            embed._fields = base._fields.copy()
+        embed._files = base._files.copy()
+        
+        if description is not None:
+            embed.description = description
+        elif format_args:
+            embed.description = base.description.format(**format_args)
+        
+        if footer is not None:
+            embed.set_footer(text=footer)
+        
+        if self.timestamp:
+            embed.timestamp = disnake.utils.utcnow()
+        
+        return embed
+
 class BotUtils:
     """Utilitários gerais para o bot"""
     
@@ -109,6 +223,25 @@ class BotUtils:
         
         return " ".join(parts) if parts else "0s"
     
+    @staticmethod
+    def format_bytes(size: int) -> str:
+        """Formata um tamanho em bytes (ex: 1.5 MB)"""
+        for unit in ("B", "KB", "MB", "GB"):
+            if size < 1024 or unit == "GB":
+                return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+            size /= 1024
+    
+    @staticmethod
+    def parse_duration(text: str, default_unit: Optional[int] = None) -> Optional[int]:
+        """Converte uma duração em segundos
+        
+        Aceita formas compostas ("1d2h30m", "1h 30m", "2 dias") e ISO-8601
+        ("PT1H30M", "P1DT2H"). Um número puro é multiplicado por
+        `default_unit` (em segundos) ou é inválido se ele não for informado.
+        Retorna None quando o texto não é uma duração válida.
+        """
+        return _parse_duration(text, default_unit)
+    
     @staticmethod
     def get_member_permissions(member: disnake.Member) -> List[str]:
         """Retorna uma lista de permissões do membro"""